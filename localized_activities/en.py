@@ -1,159 +0,0 @@
-title_to_query = {
-    "Black Friday shopping": [
-        "black friday deals",
-        "best black friday offers",
-        "black friday discounts online",
-    ],
-    "Discover open job roles": [
-        "jobs at microsoft",
-        "microsoft career opportunities",
-        "open positions at microsoft",
-    ],
-    "Expand your vocabulary": [
-        "define baroque",
-        "define ephemeral",
-        "define ubiquitous",
-    ],
-    "Feeling symptoms?": [
-        "covid symptoms",
-        "flu symptoms checker",
-        "common cold symptoms",
-    ],
-    "Find deals on Bing": [
-        "65 inch tv deals",
-        "laptop deals this week",
-        "best electronics deals online",
-    ],
-    "Find places to stay": [
-        "hotels rome italy",
-        "hotels in barcelona spain",
-        "best hotels in london",
-    ],
-    "Find somewhere new to explore": [
-        "directions to new york",
-        "things to do in tokyo",
-        "places to visit in europe",
-    ],
-    "Gaming time": [
-        "vampire survivors video game",
-        "best indie games 2025",
-        "top rated pc games",
-    ],
-    "Get your shopping done faster": [
-        "new iphone",
-        "best smartphones 2025",
-        "samsung galaxy latest model",
-    ],
-    "Houses near you": [
-        "apartments manhattan",
-        "houses for sale near me",
-        "rental apartments downtown",
-    ],
-    "How's the economy?": [
-        "sp 500",
-        "stock market today",
-        "dow jones index today",
-    ],
-    "Learn to cook a new recipe": [
-        "how cook pierogi",
-        "easy pasta recipe",
-        "homemade pizza recipe",
-    ],
-    "Learn a new recipe": [
-        "how cook pierogi",
-        "simple chicken curry recipe",
-        "best lasagna recipe",
-    ],
-    "Learn song lyrics": [
-        "hook blues traveler lyrics",
-        "bohemian rhapsody lyrics",
-        "hotel california lyrics",
-    ],
-    "Lights, camera, action!": [
-        "lord of the rings fellowship of the ring",
-        "best movies of all time",
-        "top rated films this year",
-    ],
-    "Let's watch that movie again!": [
-        "aliens movie",
-        "the shawshank redemption movie",
-        "inception movie review",
-    ],
-    "Plan a quick getaway": [
-        "flights nyc to paris",
-        "cheap flights to london",
-        "weekend getaway destinations",
-    ],
-    "Prepare for the weather": [
-        "weather tomorrow",
-        "weather forecast this week",
-        "10 day weather forecast",
-    ],
-    "Quickly convert your money": [
-        "convert 374 usd to yen",
-        "convert 100 eur to usd",
-        "currency converter gbp to usd",
-    ],
-    "Search the lyrics of a song": [
-        "black sabbath supernaut lyrics",
-        "stairway to heaven lyrics",
-        "imagine john lennon lyrics",
-    ],
-    "Stay on top of the elections": [
-        "election news latest",
-        "upcoming elections 2025",
-        "election results today",
-    ],
-    "Too tired to cook tonight?": [
-        "Pizza Hut near me",
-        "restaurants open near me",
-        "food delivery near me",
-    ],
-    "Too tired to cook?": [
-        "Pizza Hut near me",
-        "best takeout near me",
-        "fast food restaurants nearby",
-    ],
-    "Translate anything": [
-        "translate pencil sharpener to spanish",
-        "translate good morning to french",
-        "translate thank you to japanese",
-    ],
-    "What time is it?": [
-        "china time",
-        "current time in tokyo",
-        "time zone converter",
-    ],
-    "What's for Thanksgiving dinner?": [
-        "pumpkin pie recipe",
-        "thanksgiving turkey recipe",
-        "sweet potato casserole recipe",
-    ],
-    "What's new?": [
-        "latest news",
-        "top news stories today",
-        "breaking news headlines",
-    ],
-    "Who won?": [
-        "braves score",
-        "nba scores today",
-        "latest sports results",
-    ],
-    "You can track your package": [
-        "usps tracking",
-        "fedex package tracking",
-        "ups tracking number",
-    ],
-    "Quickly convert money": [
-        "usd to euro",
-        "gbp to usd exchange rate",
-        "yen to dollar conversion",
-    ],
-}
-ignore = {
-    "Bing app search",
-    "Chrome extension search",
-    "Get 50 entries plus 1000 points!",
-    "Get 100 points with search bar",
-    "Safeguard your family's info",
-}
@@ -1,160 +0,0 @@
-# todo Finish translating
-title_to_query = {
-    "Black Friday shopping": [
-        "ofertas de black friday",
-        "mejores descuentos black friday",
-        "promociones black friday online",
-    ],
-    "Discover open job roles": [
-        "trabajos en microsoft",
-        "ofertas de empleo en microsoft",
-        "oportunidades laborales microsoft",
-    ],
-    "Expand your vocabulary": [
-        "definir barroco",
-        "definir efímero",
-        "definir ubicuo",
-    ],
-    "Feeling symptoms?": [
-        "síntomas de covid",
-        "síntomas de la gripe",
-        "síntomas del resfriado común",
-    ],
-    "Find deals on Bing": [
-        "ofertas de televisores de 65 pulgadas",
-        "ofertas de portátiles esta semana",
-        "mejores ofertas electrónica online",
-    ],
-    "Find places to stay": [
-        "hoteles en roma italia",
-        "hoteles en barcelona españa",
-        "mejores hoteles en madrid",
-    ],
-    "Find somewhere new to explore": [
-        "direcciones a nueva york",
-        "cosas que hacer en tokio",
-        "lugares para visitar en europa",
-    ],
-    "Gaming time": [
-        "videojuego vampire survivors",
-        "mejores juegos indie 2025",
-        "mejores juegos de pc",
-    ],
-    "Get your shopping done faster": [
-        "nuevo iphone",
-        "mejores smartphones 2025",
-        "último modelo samsung galaxy",
-    ],
-    "Houses near you": [
-        "apartamentos en manhattan",
-        "casas en venta cerca de mí",
-        "pisos de alquiler centro",
-    ],
-    "How's the economy?": [
-        "sp 500",
-        "mercado de valores hoy",
-        "índice ibex 35 hoy",
-    ],
-    "Learn to cook a new recipe": [
-        "cómo cocinar pierogi",
-        "receta fácil de paella",
-        "receta de tortilla española",
-    ],
-    "Learn a new recipe": [
-        "cómo cocinar pierogi",
-        "receta sencilla de pollo al curry",
-        "mejor receta de lasaña",
-    ],
-    "Learn song lyrics": [
-        "letras de hook blues traveler",
-        "letra de bohemian rhapsody",
-        "letra de hotel california",
-    ],
-    "Lights, camera, action!": [
-        "el señor de los anillos la comunidad del anillo",
-        "mejores películas de todos los tiempos",
-        "películas más taquilleras del año",
-    ],
-    "Let's watch that movie again!": [
-        "película aliens",
-        "película cadena perpetua",
-        "película origen crítica",
-    ],
-    "Plan a quick getaway": [
-        "vuelos de nyc a parís",
-        "vuelos baratos a londres",
-        "destinos escapada fin de semana",
-    ],
-    "Prepare for the weather": [
-        "el clima de mañana",
-        "pronóstico del tiempo esta semana",
-        "previsión meteorológica 10 días",
-    ],
-    "Quickly convert your money": [
-        "convertir 374 usd a yen",
-        "convertir 100 eur a usd",
-        "conversor de divisas gbp a usd",
-    ],
-    "Search the lyrics of a song": [
-        "letras de black sabbath supernaut",
-        "letra de stairway to heaven",
-        "letra de imagine john lennon",
-    ],
-    "Stay on top of the elections": [
-        "últimas noticias de elecciones",
-        "próximas elecciones 2025",
-        "resultados electorales hoy",
-    ],
-    "Too tired to cook tonight?": [
-        "Pizza Hut cerca de mí",
-        "restaurantes abiertos cerca de mí",
-        "comida a domicilio cerca de mí",
-    ],
-    "Too tired to cook?": [
-        "Pizza Hut cerca de mí",
-        "mejor comida para llevar cerca",
-        "restaurantes comida rápida cerca",
-    ],
-    "Translate anything": [
-        "traducir sacapuntas al español",
-        "traducir buenos días al francés",
-        "traducir gracias al japonés",
-    ],
-    "What time is it?": [
-        "hora en china",
-        "hora actual en tokio",
-        "conversor de zonas horarias",
-    ],
-    "What's for Thanksgiving dinner?": [
-        "receta de pastel de calabaza",
-        "receta de pavo para acción de gracias",
-        "receta de boniato al horno",
-    ],
-    "What's new?": [
-        "últimas noticias",
-        "noticias principales hoy",
-        "titulares de última hora",
-    ],
-    "Who won?": [
-        "resultado de los bravos",
-        "resultados nba hoy",
-        "últimos resultados deportivos",
-    ],
-    "You can track your package": [
-        "seguimiento de usps",
-        "rastreo de paquetes fedex",
-        "seguimiento número ups",
-    ],
-    "Quickly convert money": [
-        "usd a euro",
-        "gbp a usd tipo de cambio",
-        "yen a dólar conversión",
-    ],
-}
-ignore = {
-    "Bing app search",
-    "Chrome extension search",
-    "Get 50 entries plus 1000 points!",
-    "Get 100 points with search bar",
-    "Safeguard your family's info",
-}
@@ -1,160 +0,0 @@
-# todo Finish translating
-title_to_query = {
-    "Black Friday shopping": [
-        "offres du black friday",
-        "meilleures réductions black friday",
-        "promotions black friday en ligne",
-    ],
-    "Discover open job roles": [
-        "emplois chez microsoft",
-        "offres d'emploi microsoft",
-        "opportunités de carrière microsoft",
-    ],
-    "Expand your vocabulary": [
-        "définir baroque",
-        "définir éphémère",
-        "définir ubiquité",
-    ],
-    "Feeling symptoms?": [
-        "symptômes du covid",
-        "symptômes de la grippe",
-        "symptômes du rhume",
-    ],
-    "Find deals on Bing": [
-        "offres de téléviseurs 65 pouces",
-        "offres ordinateurs portables cette semaine",
-        "meilleures offres électronique en ligne",
-    ],
-    "Find places to stay": [
-        "hôtels à rome italie",
-        "hôtels à barcelone espagne",
-        "meilleurs hôtels à paris",
-    ],
-    "Find somewhere new to explore": [
-        "itinéraires vers new york",
-        "choses à faire à tokyo",
-        "endroits à visiter en europe",
-    ],
-    "Gaming time": [
-        "jeu vidéo vampire survivors",
-        "meilleurs jeux indés 2025",
-        "meilleurs jeux pc du moment",
-    ],
-    "Get your shopping done faster": [
-        "nouvel iphone",
-        "meilleurs smartphones 2025",
-        "dernier modèle samsung galaxy",
-    ],
-    "Houses near you": [
-        "appartements à manhattan",
-        "maisons à vendre près de moi",
-        "appartements à louer centre-ville",
-    ],
-    "How's the economy?": [
-        "sp 500",
-        "bourse aujourd'hui",
-        "indice cac 40 aujourd'hui",
-    ],
-    "Learn to cook a new recipe": [
-        "comment cuisiner des pierogi",
-        "recette facile de quiche lorraine",
-        "recette de ratatouille maison",
-    ],
-    "Learn a new recipe": [
-        "comment cuisiner des pierogi",
-        "recette simple poulet au curry",
-        "meilleure recette de lasagnes",
-    ],
-    "Learn song lyrics": [
-        "paroles de hook blues traveler",
-        "paroles de bohemian rhapsody",
-        "paroles de hotel california",
-    ],
-    "Lights, camera, action!": [
-        "le seigneur des anneaux la communauté de l'anneau",
-        "meilleurs films de tous les temps",
-        "films les mieux notés cette année",
-    ],
-    "Let's watch that movie again!": [
-        "film aliens",
-        "film les évadés",
-        "film inception critique",
-    ],
-    "Plan a quick getaway": [
-        "vols de nyc à paris",
-        "vols pas chers pour londres",
-        "destinations week-end escapade",
-    ],
-    "Prepare for the weather": [
-        "météo de demain",
-        "prévisions météo cette semaine",
-        "prévisions météo 10 jours",
-    ],
-    "Quickly convert your money": [
-        "convertir 374 usd en yen",
-        "convertir 100 eur en usd",
-        "convertisseur de devises gbp en usd",
-    ],
-    "Search the lyrics of a song": [
-        "paroles de black sabbath supernaut",
-        "paroles de stairway to heaven",
-        "paroles de imagine john lennon",
-    ],
-    "Stay on top of the elections": [
-        "dernières nouvelles des élections",
-        "prochaines élections 2025",
-        "résultats électoraux aujourd'hui",
-    ],
-    "Too tired to cook tonight?": [
-        "Pizza Hut près de chez moi",
-        "restaurants ouverts près de moi",
-        "livraison repas près de moi",
-    ],
-    "Too tired to cook?": [
-        "Pizza Hut près de chez moi",
-        "meilleur plat à emporter près de moi",
-        "restaurants fast food à proximité",
-    ],
-    "Translate anything": [
-        "traduire taille-crayon en espagnol",
-        "traduire bonjour en japonais",
-        "traduire merci en allemand",
-    ],
-    "What time is it?": [
-        "heure en chine",
-        "heure actuelle à tokyo",
-        "convertisseur de fuseaux horaires",
-    ],
-    "What's for Thanksgiving dinner?": [
-        "recette de tarte à la citrouille",
-        "recette de dinde de thanksgiving",
-        "recette gratin de patates douces",
-    ],
-    "What's new?": [
-        "dernières nouvelles",
-        "actualités principales aujourd'hui",
-        "titres de dernière heure",
-    ],
-    "Who won?": [
-        "score des braves",
-        "résultats nba aujourd'hui",
-        "derniers résultats sportifs",
-    ],
-    "You can track your package": [
-        "suivi usps",
-        "suivi colis fedex",
-        "numéro de suivi ups",
-    ],
-    "Quickly convert money": [
-        "usd en euro",
-        "gbp en usd taux de change",
-        "yen en dollar conversion",
-    ],
-}
-ignore = {
-    "Bing app search",
-    "Chrome extension search",
-    "Get 50 entries plus 1000 points!",
-    "Get 100 points with search bar",
-    "Safeguard your family's info",
-}
@@ -1,159 +0,0 @@
-title_to_query = {
-    "Black Friday shopping": [
-        "offerte black friday",
-        "migliori sconti black friday",
-        "promozioni black friday online",
-    ],
-    "Discover open job roles": [
-        "offerte lavoro microsoft",
-        "posizioni aperte microsoft",
-        "opportunità di carriera microsoft",
-    ],
-    "Expand your vocabulary": [
-        "definisci barocco",
-        "definisci effimero",
-        "definisci ubiquo",
-    ],
-    "Feeling symptoms?": [
-        "sintomi morbillo",
-        "sintomi influenza",
-        "sintomi raffreddore comune",
-    ],
-    "Find deals on Bing": [
-        "offerte tv 65 pollici",
-        "offerte portatili questa settimana",
-        "migliori offerte elettronica online",
-    ],
-    "Find places to stay": [
-        "hotel roma italia",
-        "hotel a barcellona spagna",
-        "migliori hotel a milano",
-    ],
-    "Find somewhere new to explore": [
-        "indicazioni per Ginevra",
-        "cose da fare a tokyo",
-        "posti da visitare in europa",
-    ],
-    "Gaming time": [
-        "gioco vampire survivors",
-        "migliori giochi indie 2025",
-        "migliori giochi pc del momento",
-    ],
-    "Get your shopping done faster": [
-        "nuovo samsung galaxy",
-        "migliori smartphone 2025",
-        "ultimo modello iphone",
-    ],
-    "Houses near you": [
-        "appartamenti Firenze",
-        "case in vendita vicino a me",
-        "affitto appartamenti centro",
-    ],
-    "How's the economy?": [
-        "mib 30",
-        "borsa oggi",
-        "indice ftse mib oggi",
-    ],
-    "Learn to cook a new recipe": [
-        "ricetta giallo zafferano",
-        "ricetta facile carbonara",
-        "ricetta tiramisù fatto in casa",
-    ],
-    "Learn a new recipe": [
-        "ricetta pierogi",
-        "ricetta semplice pollo al curry",
-        "migliore ricetta lasagne",
-    ],
-    "Learn song lyrics": [
-        "testo Marco mengoni due vite",
-        "testo bohemian rhapsody",
-        "testo hotel california",
-    ],
-    "Lights, camera, action!": [
-        "il signore degli anelli la compagnia dell'anello",
-        "migliori film di sempre",
-        "film più visti quest'anno",
-    ],
-    "Let's watch that movie again!": [
-        "film il gladiatore",
-        "film le ali della libertà",
-        "film inception recensione",
-    ],
-    "Plan a quick getaway": [
-        "voli da milano a catania",
-        "voli economici per londra",
-        "destinazioni weekend fuga",
-    ],
-    "Prepare for the weather": [
-        "meteo domani",
-        "previsioni meteo questa settimana",
-        "previsioni meteo 10 giorni",
-    ],
-    "Quickly convert your money": [
-        "converti 374 euro in usd",
-        "converti 100 euro in sterline",
-        "convertitore valute gbp in usd",
-    ],
-    "Search the lyrics of a song": [
-        "testo Laura Pausini la solitudine",
-        "testo stairway to heaven",
-        "testo imagine john lennon",
-    ],
-    "Stay on top of the elections": [
-        "ultime notizie elezioni",
-        "prossime elezioni 2025",
-        "risultati elettorali oggi",
-    ],
-    "Too tired to cook tonight?": [
-        "Burger King vicino a me",
-        "ristoranti aperti vicino a me",
-        "consegna cibo a domicilio vicino a me",
-    ],
-    "Too tired to cook?": [
-        "McDonald vicino a me",
-        "miglior cibo da asporto vicino",
-        "ristoranti fast food vicino",
-    ],
-    "Translate anything": [
-        "traduci temperamatite in spagnolo",
-        "traduci buongiorno in giapponese",
-        "traduci grazie in tedesco",
-    ],
-    "What time is it?": [
-        "ora in cina",
-        "ora attuale a tokyo",
-        "convertitore fusi orari",
-    ],
-    "What's for Thanksgiving dinner?": [
-        "ricetta torta di mele",
-        "ricetta tacchino al forno",
-        "ricetta patate dolci gratinate",
-    ],
-    "What's new?": [
-        "ultime notizie",
-        "notizie principali oggi",
-        "titoli di ultima ora",
-    ],
-    "Who won?": [
-        "risultati inter Milan",
-        "risultati serie a oggi",
-        "ultimi risultati sportivi",
-    ],
-    "You can track your package": [
-        "tracciamento gas",
-        "tracciamento pacco fedex",
-        "numero tracciamento ups",
-    ],
-    "Quickly convert money": [
-        "euro in yen",
-        "sterlina in euro tasso di cambio",
-        "dollaro in euro conversione",
-    ],
-}
-ignore = {
-    "Bing app search",
-    "Chrome extension search",
-    "Get 50 entries plus 1000 points!",
-    "Get 100 points with search bar",
-    "Safeguard your family's info",
-}
@@ -1,11 +1,13 @@
-import csv
-import json
+import contextlib
+import functools
 import logging
 import logging.config
 import sys
-from datetime import datetime
+import time
+from concurrent.futures import Future
 from enum import Enum, auto
 from logging import handlers
+from typing import Callable, Self
 
 from src import (
     BonusPoints,
@@ -16,76 +18,98 @@ from src import (
     ReadToEarn,
 )
 from src.activities import Activities
-from src.browser import RemainingSearches
+from src.dailyPlan import DailyPlan, planDay
+from src.dashboard import Dashboard, UserStatus, allPaths
 from src.loggingColoredFormatter import ColoredFormatter
-from src.utils import CONFIG, APPRISE, getProjectRoot, formatNumber
+from src.retryPolicy import retryBudget, retryMetricsReport
+from src.runCheckpoint import RunCheckpoint
+from src.runReport import PhaseReport
+from src.scheduler import MOBILE_PHASES, scheduleWithin
+from src.sessionMaintenance import checkSession
+from src.taskTimings import BROWSER_START
+from src.userAgentGenerator import GenerateUserAgent
+from src.watchdog import PhaseTimeout
+from src.utils import (
+    CONFIG,
+    IDLE_TASKS,
+    MEMORY_SAMPLER,
+    POINTS_HISTORY,
+    REPORTER,
+    RUN_REPORT,
+    TASK_TIMINGS,
+    WATCHDOG,
+    Utils,
+    formatNumber,
+    getActivityTitles,
+    getProjectRoot,
+    getRunCheckpoint,
+)
 
 def main():
     setupLogging()
 
-    # Load previous day's points data
-    previous_points_data = load_previous_points_data()
+    POINTS_HISTORY.importPreviousPointsData(
+        getProjectRoot() / "logs" / "previous_points_data.json"
+    )
 
     foundError = False
-
-    for currentAccount in CONFIG.accounts:
+    timeBudget = CONFIG.get("time-budget")
+    runDeadline = time.monotonic() + timeBudget * 60 if timeBudget else None
+
+    for index, currentAccount in enumerate(CONFIG.accounts):
+        # The accounts share the time left evenly
+        budget = (
+            (runDeadline - time.monotonic()) / (len(CONFIG.accounts) - index)
+            if runDeadline
+            else None
+        )
+        queueIdleMaintenance(CONFIG.accounts[index + 1 :])
         try:
-            earned_points = executeBot(currentAccount)
+            accountPoints, goalPoints = executeBot(currentAccount, budget)
         except Exception as e1:
             logging.error("", exc_info=True)
             foundError = True
+            RUN_REPORT.account(currentAccount.email).error = f"{type(e1).__name__}: {e1}"
             if CONFIG.get("apprise.notify.uncaught-exception"):
-                APPRISE.notify(
+                REPORTER.notify(
                     f"{type(e1).__name__}: {e1}",
                     f"⚠️ Error executing {currentAccount.email}, please check the log",
                 )
             continue
 
-        previous_points = previous_points_data.get(currentAccount.email, 0)
-
-        # Calculate the difference in points from the prior day
-        points_difference = earned_points - previous_points
+        REPORTER.submit(recordPoints, currentAccount.email, accountPoints, goalPoints)
 
-        # Append the daily points and points difference to CSV and Excel
-        log_daily_points_to_csv(earned_points, points_difference)
+    for retries in retryMetricsReport():
+        logging.info(f"[RETRIES] {retries}")
+    RUN_REPORT.save()
 
-        # Update the previous day's points data
-        previous_points_data[currentAccount.email] = earned_points
-
-        logging.info(
-            f"[POINTS] Data for '{currentAccount.email}' appended to the file."
-        )
-
-    # Save the current day's points data for the next day in the "logs" folder
-    save_previous_points_data(previous_points_data)
-    logging.info("[POINTS] Data saved for the next day.")
+    REPORTER.flush()
 
     if foundError:
         sys.exit(1)
 
 
-def log_daily_points_to_csv(earned_points, points_difference):
-    logs_directory = getProjectRoot() / "logs"
-    csv_filename = logs_directory / "points_data.csv"
-
-    # Create a new row with the date, daily points, and points difference
-    date = datetime.now().strftime("%Y-%m-%d")
-    new_row = {
-        "Date": date,
-        "Earned Points": earned_points,
-        "Points Difference": points_difference,
-    }
-
-    fieldnames = ["Date", "Earned Points", "Points Difference"]
-    is_new_file = not csv_filename.exists()
-
-    with open(csv_filename, mode="a", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
+def queueIdleMaintenance(nextAccounts: list) -> None:
+    """
+    Queues the work to do during the cooldowns of an account: refreshing the versions
+    of the user agents, and compacting the session of the next account.
+    """
+    IDLE_TASKS.submit("user-agent-versions", GenerateUserAgent.refreshVersions)
+    if nextAccounts and CONFIG.sessions.get("auto-compact"):
+        IDLE_TASKS.submit(
+            "check-session",
+            checkSession,
+            getProjectRoot() / "sessions" / nextAccounts[0].email,
+            CONFIG.sessions.get("max-size") * 1024 * 1024,
+        )
 
-        if is_new_file:
-            writer.writeheader()
 
-        writer.writerow(new_row)
+def recordPoints(email: str, accountPoints: int, goalPoints: int) -> None:
+    pointsDifference = POINTS_HISTORY.record(email, accountPoints, goalPoints or None)
+    logging.info(
+        f"[POINTS] {formatNumber(pointsDifference)} points since the last run"
+        f" for '{email}', saved to the points history"
+    )
 
 
 def setupLogging():
@@ -138,59 +162,332 @@ class AppriseSummary(Enum):
     """
 
 
-def executeBot(currentAccount):
-    logging.info(f"********************{currentAccount.email}********************")
-
-    startingPoints: int | None = None
-    accountPoints: int
-    remainingSearches: RemainingSearches
-    goalTitle: str
-    goalPoints: int
+class BrowserSession:
+    """
+    Logged-in browser of an account, started on first use, and started again if the
+    watchdog killed it or it was recycled, so the remaining phases can still run.
+    """
 
-    if CONFIG.search.type in ("desktop", "both", None):
-        with Browser(mobile=False, account=currentAccount) as desktopBrowser:
-            utils = desktopBrowser.utils
-            Login(desktopBrowser).login()
-            startingPoints = utils.getAccountPoints()
-            logging.info(
-                f"[POINTS] You have {formatNumber(startingPoints)} points on your account"
+    def __init__(self, account, mobile: bool):
+        self.account = account
+        self.mobile = mobile
+        self._browser: Browser | None = None
+        self.backgroundEarning: Future | None = None
+        """
+        the background earning work of the browsers before the current one, which goes
+        on without them, see `Browser.backgroundEarning`
+        """
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *excInfo) -> None:
+        if self._browser is not None:
+            self._browser.__exit__(*excInfo)
+
+    def recycle(self) -> None:
+        """
+        Closes the browser to free its memory, the next phase starts a new one.
+        """
+        if self._browser is not None:
+            self._browser.__exit__(None, None, None)
+            self._dropBrowser()
+
+    def _dropBrowser(self) -> None:
+        self.backgroundEarning = self._browser.backgroundEarning
+        self._browser = None
+
+    @property
+    def browser(self) -> Browser:
+        if self._browser is not None and self._browser.killed:
+            logging.info("[WATCHDOG] Starting a new browser to replace the killed one")
+            self._dropBrowser()
+        if self._browser is None:
+            # An idle task could be compacting the session
+            IDLE_TASKS.wait()
+            start = time.monotonic()
+            browser = Browser(mobile=self.mobile, account=self.account)
+            browser.backgroundEarning = self.backgroundEarning
+            # In visible mode, the login can wait for the user to handle 2FA prompts
+            watchLogin = (
+                contextlib.nullcontext()
+                if CONFIG.browser.visible
+                else WATCHDOG.phase("login", browser)
             )
-            BonusPoints(desktopBrowser).claimBonusPoints()
-            Activities(desktopBrowser).completeActivities()
-            PunchCards(desktopBrowser).completePunchCards()
-            # VersusGame(desktopBrowser).completeVersusGame()
+            try:
+                with watchLogin:
+                    Login(browser).login()
+            except BaseException:
+                browser.__exit__(*sys.exc_info())
+                raise
+            TASK_TIMINGS.record(BROWSER_START, time.monotonic() - start)
+            self._browser = browser
+        return self._browser
+
+
+def runPhase(
+    checkpoint: RunCheckpoint,
+    plan: DailyPlan,
+    phase: str,
+    session: BrowserSession,
+    action: Callable[[Browser], bool | None | Future],
+) -> Callable[[], None] | None:
+    """
+    Runs a phase unless an earlier run already did it today or the plan has nothing to
+    do in it, and records it as done unless it returned False. It's deferred to a later
+    run once the plan's deadline passed. Its retries are capped by
+    `retries.phase-budget`, and its browser is killed if it passes its watchdog
+    deadline, to go on with the next phase. The browser is recycled afterward if the
+    memory passed `memory.ceiling`.
+
+    Returns:
+        Callable[[], None] | None: if the action returned a future, the phase goes on
+        without the browser, and this waits for it and records it.
+    """
+    accountReport = RUN_REPORT.account(session.account.email)
+    if checkpoint.isDone(phase):
+        logging.info(f"[CHECKPOINT] Skipping {phase}, already done today")
+        accountReport.phases.append(PhaseReport(phase, "skipped"))
+        return
+    if not plan.hasWork(phase):
+        if any(task.phase == phase for task in plan.deferred):
+            logging.info(f"[SCHEDULE] Skipping {phase}, deferred to a later run")
+            accountReport.phases.append(PhaseReport(phase, "deferred"))
+        else:
+            logging.info(f"[PLAN] Skipping {phase}, nothing to do")
+            accountReport.phases.append(PhaseReport(phase, "nothing to do"))
+        return
+    if plan.deadline is not None and time.monotonic() > plan.deadline:
+        logging.info(f"[SCHEDULE] Deferring {phase}, the time budget is used")
+        plan.defer(phase)
+        accountReport.phases.append(PhaseReport(phase, "deferred"))
+        return
+    browser = session.browser
+    report = PhaseReport(phase, "failed")
+    accountReport.phases.append(report)
+    start = time.monotonic()
+    try:
+        with retryBudget(CONFIG.get("retries.phase-budget")), WATCHDOG.phase(
+            phase, browser
+        ), MEMORY_SAMPLER.sample(browser.processIds) as report.memory:
+            completed = action(browser)
+    except PhaseTimeout as e:
+        logging.error(f"[WATCHDOG] {e}, going on with the next phase")
+        report.status = "timed out"
+        return
+    finally:
+        report.seconds = time.monotonic() - start
+    join = None
+    if isinstance(completed, Future):
+        report.status = "running"
+        join = functools.partial(joinPhase, checkpoint, plan, report, completed)
+    else:
+        finishPhase(checkpoint, plan, report, completed)
+
+    ceiling = CONFIG.memory.ceiling
+    memory = report.memory.end
+    if ceiling and memory and memory.total > ceiling * 1024 * 1024 and not browser.killed:
+        logging.info(
+            f"[MEMORY] {round(memory.total / 1024 / 1024)} MB used, over the"
+            f" {ceiling} MB ceiling, restarting the browser"
+        )
+        accountReport.recycles += 1
+        session.recycle()
+    return join
 
-            with Searches(desktopBrowser) as searches:
-                searches.bingSearches()
 
-            goalPoints = utils.getGoalPoints()
-            goalTitle = utils.getGoalTitle()
+def finishPhase(
+    checkpoint: RunCheckpoint, plan: DailyPlan, report: PhaseReport, completed: bool | None
+) -> None:
+    if completed is not False:
+        checkpoint.markDone(report.name)
+    report.status = "incomplete" if completed is False else "done"
+    # Only the time spent with the browser, what runs in the background overlaps it
+    if plan.units(report.name):
+        TASK_TIMINGS.record(report.name, report.seconds / plan.units(report.name))
+
+
+def joinPhase(
+    checkpoint: RunCheckpoint, plan: DailyPlan, report: PhaseReport, future: Future
+) -> None:
+    try:
+        completed = future.result()
+    except Exception:
+        logging.error(f"[{report.name.upper()}] Failed in the background", exc_info=True)
+        report.status = "failed"
+        return
+    finishPhase(checkpoint, plan, report, completed)
+
+
+def runPhases(
+    checkpoint: RunCheckpoint,
+    plan: DailyPlan,
+    session: BrowserSession,
+    actions: dict[str, Callable[[Browser], bool | None | Future]],
+) -> None:
+    """
+    Runs the phases in the planned order, then waits for the ones going on in the
+    background.
+    """
+    joins = []
+    try:
+        for phase in plan.runOrder(actions):
+            join = runPhase(checkpoint, plan, phase, session, actions[phase])
+            if join is not None:
+                joins.append(join)
+    finally:
+        for join in joins:
+            join()
+
+
+def bingSearches(browser: Browser, maxSearches: int | None = None) -> bool:
+    with Searches(browser) as searches:
+        return searches.bingSearches(maxSearches)
 
-            remainingSearches = desktopBrowser.getRemainingSearches(
-                desktopAndMobile=True
-            )
-            accountPoints = utils.getAccountPoints()
 
+def startReadToEarn(browser: Browser) -> Future[None] | bool:
+    """
+    Reads the articles in the background once logged in the mobile app, while the
+    browser goes on with the mobile searches.
+    """
+    try:
+        return ReadToEarn(browser).startReadToEarn()
+    except Exception:
+        logging.exception("[READ TO EARN] Failed to complete Read to Earn")
+        return False
+
+
+def plannedPhases() -> list[str]:
+    phases = []
+    if CONFIG.search.type in ("desktop", "both", None):
+        phases += ["bonus-points", "activities", "punch-cards", "desktop-searches"]
     if CONFIG.search.type in ("mobile", "both", None):
-        with Browser(mobile=True, account=currentAccount) as mobileBrowser:
-            utils = mobileBrowser.utils
-            Login(mobileBrowser).login()
-            if startingPoints is None:
-                startingPoints = utils.getAccountPoints()
-            try:
-                ReadToEarn(mobileBrowser).completeReadToEarn()
-            except Exception:
-                logging.exception("[READ TO EARN] Failed to complete Read to Earn")
-            with Searches(mobileBrowser) as searches:
-                searches.bingSearches()
+        phases += ["read-to-earn", "mobile-searches"]
+    return phases
+
 
-            goalPoints = utils.getGoalPoints()
-            goalTitle = utils.getGoalTitle()
+def planRun(
+    checkpoint: RunCheckpoint,
+    utils: Utils,
+    deadline: float | None = None,
+    mobileStart: float = 0,
+) -> tuple[Dashboard, DailyPlan]:
+    """
+    Takes the dashboard snapshot the run is planned from, after checking the progress
+    of an earlier run of the day against it. With a deadline, the plan keeps the work
+    that earns the most points before it.
 
-            remainingSearches = mobileBrowser.getRemainingSearches(
-                desktopAndMobile=True
+    Args:
+        mobileStart: the time to start the mobile browser, if it isn't started yet.
+    """
+    dashboard = utils.getDashboardData(*allPaths())
+    if checkpoint.resumed:
+        redo = checkpoint.reconcile(dashboard)
+        logging.info(
+            "[CHECKPOINT] Resuming today's run, done:"
+            f" {', '.join(sorted(checkpoint.phases)) or 'nothing'}"
+            + (f", to do again: {', '.join(redo)}" if redo else "")
+        )
+    plan = planDay(dashboard, checkpoint, plannedPhases(), getActivityTitles())
+    if deadline is not None:
+        budget = deadline - time.monotonic()
+        plan = scheduleWithin(plan, budget, TASK_TIMINGS, mobileStart)
+        plan.deadline = deadline
+        logging.info(
+            f"[SCHEDULE] {formatNumber(plan.estimatedSeconds / 60)} minutes estimated"
+            f" of the {formatNumber(budget / 60)} minutes left"
+        )
+        for task in plan.deferred:
+            logging.info(f"[SCHEDULE] Deferring {task.phase}: {task.describe()}")
+    for line in plan.describe():
+        logging.info(f"[PLAN] {line}")
+    logging.info(f"[PLAN] {formatNumber(plan.expectedPoints)} points expected")
+    return dashboard, plan
+
+
+def executeBot(currentAccount, budget: float | None = None):
+    """
+    Args:
+        budget: the seconds the account can take, the work left after is deferred.
+    """
+    logging.info(f"********************{currentAccount.email}********************")
+
+    startingPoints: int | None = None
+    plan: DailyPlan | None = None
+    userStatus: UserStatus
+    checkpoint = getRunCheckpoint(currentAccount.email)
+    deadline = time.monotonic() + budget if budget is not None else None
+    runMobile = CONFIG.search.type in ("mobile", "both", None)
+
+    def searches(phase: str) -> Callable[[Browser], bool]:
+        # Without a budget, the searches go on until the counters are full
+        return lambda browser: bingSearches(
+            browser, plan.units(phase) if plan.deadline is not None else None
+        )
+
+    if CONFIG.search.type in ("desktop", "both", None):
+        with BrowserSession(currentAccount, mobile=False) as desktop:
+            dashboard, plan = planRun(
+                checkpoint,
+                desktop.browser.utils,
+                deadline,
+                TASK_TIMINGS.estimate(BROWSER_START) if runMobile else 0,
+            )
+            startingPoints = dashboard.userStatus.availablePoints
+            logging.info(
+                f"[POINTS] You have {formatNumber(startingPoints)} points on your account"
             )
-            accountPoints = utils.getAccountPoints()
+            desktopPhases = {
+                "bonus-points": lambda browser: BonusPoints(browser).claimBonusPoints(),
+                "activities": lambda browser: Activities(
+                    browser, checkpoint
+                ).completeActivities(plan.items("activities")),
+                "punch-cards": lambda browser: PunchCards(
+                    browser, checkpoint
+                ).completePunchCards(plan.items("punch-cards")),
+                # VersusGame(desktopBrowser).completeVersusGame()
+                "desktop-searches": searches("desktop-searches"),
+            }
+            runPhases(checkpoint, plan, desktop, desktopPhases)
+
+            userStatus = desktop.browser.utils.getUserStatus()
+
+    if runMobile and plan is not None and not any(map(plan.hasWork, MOBILE_PHASES)):
+        logging.info("[PLAN] Skipping the mobile browser, nothing to do")
+        runMobile = False
+    elif runMobile and plan is not None and plan.deadline is not None and (
+        time.monotonic() > plan.deadline
+    ):
+        logging.info("[SCHEDULE] Skipping the mobile browser, the time budget is used")
+        for phase in MOBILE_PHASES:
+            plan.defer(phase)
+        runMobile = False
+    if runMobile:
+        with BrowserSession(currentAccount, mobile=True) as mobile:
+            if plan is None:
+                dashboard, plan = planRun(checkpoint, mobile.browser.utils, deadline)
+                startingPoints = dashboard.userStatus.availablePoints
+            mobilePhases = {
+                "read-to-earn": startReadToEarn,
+                "mobile-searches": searches("mobile-searches"),
+            }
+            runPhases(checkpoint, plan, mobile, mobilePhases)
+
+            userStatus = mobile.browser.utils.getUserStatus()
+
+    if plan.deferred:
+        RUN_REPORT.account(currentAccount.email).deferred = [
+            f"{task.phase}: {task.describe()}" for task in plan.deferred
+        ]
+        logging.info(
+            f"[SCHEDULE] Deferred to a later run: {len(plan.deferred)} task(s),"
+            f" {formatNumber(sum(task.points for task in plan.deferred))} points"
+        )
+
+    accountPoints = userStatus.availablePoints
+    goalPoints = userStatus.goalPoints
+    goalTitle = userStatus.goalTitle
+    remainingSearches = userStatus.remainingSearches()
 
     logging.info(
         f"[POINTS] You have earned {formatNumber(accountPoints - startingPoints)} points this run !"
@@ -209,7 +506,7 @@ def executeBot(currentAccount):
                 f" ({goalTitle})"
             )
 
-        APPRISE.notify(
+        REPORTER.notify(
             "\n".join(
                 [
                     f"👤 Account: {currentAccount.email}",
@@ -222,46 +519,14 @@ def executeBot(currentAccount):
         )
     elif appriseSummary == AppriseSummary.ON_ERROR:
         if remainingSearches.getTotal() > 0:
-            APPRISE.notify(
+            REPORTER.notify(
                 f"account email: {currentAccount.email}, {remainingSearches}",
                 "Error: remaining searches",
             )
     elif appriseSummary == AppriseSummary.NEVER:
         pass
 
-    return accountPoints
-
-
-def export_points_to_csv(points_data):
-    logs_directory = getProjectRoot() / "logs"
-    csv_filename = logs_directory / "points_data.csv"
-    with open(csv_filename, mode="a", newline="", encoding="utf-8") as file:
-        fieldnames = ["Account", "Earned Points", "Points Difference"]
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-        # Check if the file is empty, and if so, write the header row
-        if file.tell() == 0:
-            writer.writeheader()
-
-        for data in points_data:
-            writer.writerow(data)
-
-
-# Define a function to load the previous day's points data from a file in the "logs" folder
-def load_previous_points_data():
-    try:
-        with open(
-                getProjectRoot() / "logs" / "previous_points_data.json", encoding='utf-8') as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return {}
-
-
-# Define a function to save the current day's points data for the next day in the "logs" folder
-def save_previous_points_data(data):
-    logs_directory = getProjectRoot() / "logs"
-    with open(logs_directory / "previous_points_data.json", "w", encoding="utf-8") as file:
-        json.dump(data, file, indent=4)
+    return accountPoints, goalPoints
 
 
 if __name__ == "__main__":
@@ -270,8 +535,9 @@ if __name__ == "__main__":
     except Exception as e:
         logging.exception("")
         if CONFIG.get("apprise.notify.uncaught-exception"):
-            APPRISE.notify(
+            REPORTER.notify(
                 f"{type(e).__name__}: {e}",
                 "⚠️ Error occurred, please check the log",
             )
+            REPORTER.flush()
         sys.exit(1)
@@ -10,15 +10,20 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 
+from src.activityTitles import normalizeTitle
 from src.browser import Browser
 from src.constants import REWARDS_URL
+from src.dashboard import Promotion, activityProgress
+from src.eligibility import cleanupActivityTitle, skipReason
+from src.runCheckpoint import RunCheckpoint
+from src.runReport import ActivityReport
 from src.utils import (
     CONFIG,
-    APPRISE,
+    REPORTER,
+    RUN_REPORT,
     getAnswerCode,
     cooldown,
-    ACTIVITY_TITLES_TO_QUERIES,
-    IGNORED_ACTIVITIES,
+    getActivityTitles,
 )
 
 
@@ -27,9 +32,10 @@ class Activities:
     Class to handle activities in MS Rewards.
     """
 
-    def __init__(self, browser: Browser):
+    def __init__(self, browser: Browser, checkpoint: RunCheckpoint | None = None):
         self.browser = browser
         self.webdriver = browser.webdriver
+        self.checkpoint = checkpoint
         self.unmapped_activities: list[str] = []
 
     def completeSearch(self):
@@ -70,29 +76,24 @@ class Activities:
             if numberOfOptions == 8:
                 answers = []
                 for i in range(numberOfOptions):
-                    isCorrectOption = self.webdriver.find_element(
+                    isCorrectOption = self.browser.utils.cachedElement(
                         By.ID, f"rqAnswerOption{i}"
                     ).get_attribute("iscorrectoption")
                     if isCorrectOption and isCorrectOption.lower() == "true":
                         answers.append(f"rqAnswerOption{i}")
                 for answer in answers:
-                    element = self.webdriver.find_element(By.ID, answer)
+                    element = self.browser.utils.cachedElement(By.ID, answer)
                     self.browser.utils.click(element)
             elif numberOfOptions in [2, 3, 4]:
                 correctOption = self.webdriver.execute_script(
                     "return _w.rewardsQuizRenderInfo.correctAnswer"
                 )
                 for i in range(numberOfOptions):
-                    if (
-                        self.webdriver.find_element(
-                            By.ID, f"rqAnswerOption{i}"
-                        ).get_attribute("data-option")
-                        == correctOption
-                    ):
-                        correctAnswer = self.browser.utils.waitUntilClickable(
-                            By.ID, f"rqAnswerOption{i}"
-                        )
-                        self.browser.utils.click(correctAnswer)
+                    option = self.browser.utils.cachedElement(
+                        By.ID, f"rqAnswerOption{i}"
+                    )
+                    if option.get_attribute("data-option") == correctOption:
+                        self.browser.utils.click(option)
                         break
 
     def completeABC(self):
@@ -137,39 +138,42 @@ class Activities:
     def getAnswerAndCode(self, answerId: str) -> tuple[WebElement, str]:
         # Helper function to get answer element and its code
         answerEncodeKey = self.webdriver.execute_script("return _G.IG")
-        answer = self.webdriver.find_element(By.ID, answerId)
+        answer = self.browser.utils.cachedElement(By.ID, answerId)
         answerTitle = answer.get_attribute("data-option")
         return (
             answer,
             getAnswerCode(answerEncodeKey, answerTitle),
         )
 
-    def completeActivity(self, activity: dict) -> None:
-        activityTitle = cleanupActivityTitle(activity["title"])
+    def completeActivity(self, activity: Promotion) -> bool:
+        """
+        Returns:
+            bool: False if the activity failed, True otherwise.
+        """
+        activityTitle = cleanupActivityTitle(activity.title)
+        normalizedTitle = normalizeTitle(activityTitle)
+        titleMatch = getActivityTitles().match(activityTitle)
         logging.debug(f"activityTitle={activityTitle}")
-        logging.debug(f"activity attributes: {list(activity.get('attributes', {}).keys())}")
-
-        if activity["complete"] or activity["pointProgressMax"] == 0:
-            logging.debug("Already done, returning")
-            return
-        if activityTitle in IGNORED_ACTIVITIES:
-            logging.debug(f"Ignoring {activityTitle}")
-            return
-        if "puzzle" in activityTitle.lower() or "Windows search" == activityTitle:
+        logging.debug(f"titleMatch={titleMatch}")
+
+        reason = skipReason(activity, getActivityTitles())
+        if reason == "not supported":
             logging.info(f"[ACTIVITY] Skipping '{activityTitle}' because it's not supported")
-            return
+            return True
+        if reason:
+            logging.debug(f"Skipping '{activityTitle}', {reason}")
+            return True
+        if self.checkpoint and self.checkpoint.isActivityDone(activity):
+            logging.debug("Already done in an earlier run today, returning")
+            return True
 
-        if activityTitle not in ACTIVITY_TITLES_TO_QUERIES:
+        if titleMatch.queries is None:
             if activityTitle not in self.unmapped_activities:
                 self.unmapped_activities.append(activityTitle)
 
-        if activity["attributes"].get("is_unlocked", "True") != "True":
-            logging.debug("Activity locked, returning")
-            return
-
         try:
             activityElement = self.browser.utils.waitUntilClickable(
-                By.XPATH, f'//*[contains(text(), "{activity["title"]}")]', timeToWait=20
+                By.XPATH, f'//*[contains(text(), "{activity.title}")]', timeToWait=20
             )
             self.browser.utils.click(activityElement)
             self.browser.utils.switchToNewTab()
@@ -179,25 +183,24 @@ class Activities:
                 )
                 self.browser.utils.click(searchbar)
                 searchbar.clear()
-            if activityTitle in ACTIVITY_TITLES_TO_QUERIES:
-                queries = ACTIVITY_TITLES_TO_QUERIES[activityTitle]
-                query = random.choice(queries)
+            if titleMatch.queries:
+                query = random.choice(titleMatch.queries)
                 searchbar.send_keys(query)
                 searchbar.submit()
                 WebDriverWait(self.webdriver, 10).until(
                     EC.presence_of_element_located((By.ID, "b_results"))
                 )
                 logging.info(f"[ACTIVITY] Search submitted for '{activityTitle}' with query '{query}'")
-            elif "poll" in activityTitle:
+            elif "poll" in normalizedTitle:
                 self.completeSurvey()
-            elif activity["promotionType"] == "urlreward":
+            elif activity.promotionType == "urlreward":
                 self.completeSearch()
-            elif activity["promotionType"] == "quiz":
-                if activity["pointProgressMax"] == 10:
+            elif activity.promotionType == "quiz":
+                if activity.pointProgressMax == 10:
                     self.completeABC()
-                elif activity["pointProgressMax"] in [30, 40]:
+                elif activity.pointProgressMax in [30, 40]:
                     self.completeQuiz()
-                elif activity["pointProgressMax"] == 50:
+                elif activity.pointProgressMax == 50:
                     self.completeThisOrThat()
             else:
                 searchbar.send_keys(activityTitle)
@@ -210,45 +213,73 @@ class Activities:
         except Exception:
             logging.error(f"[ACTIVITY] Error doing '{activityTitle}'", exc_info=True)
             logging.debug(f"activity={activity}")
-            return
+            return False
         finally:
             self.browser.utils.resetTabs()
+        if self.checkpoint:
+            self.checkpoint.markActivityDone(activity)
         cooldown()
+        return True
 
-    def completeActivities(self):
+    def completeActivities(self, activities: list[Promotion] | None = None) -> bool:
+        """
+        Args:
+            activities: the activities to do, from a snapshot of the dashboard, all the
+            activities of the dashboard by default.
+
+        Returns:
+            bool: False if an activity failed, True otherwise.
+        """
         logging.info("[ACTIVITIES] " + "Trying to complete all activities...")
-        activities = self.browser.utils.getActivities()
+        if activities is None:
+            activities = self.browser.utils.getActivities()
+        elif activities:
+            # A restarted browser or an earlier phase may have left it on another page
+            self.browser.utils.goToRewards()
+        completed = True
         for activity in activities:
-            self.completeActivity(activity)
+            completed &= self.completeActivity(activity)
         if self.unmapped_activities:
             logging.info(
                 f"[ACTIVITIES] Activities with no mapped query (title used as fallback): "
                 f"{', '.join(repr(t) for t in self.unmapped_activities)}"
             )
+        nearMisses = getActivityTitles().nearMissesReport()
+        if nearMisses:
+            logging.info(
+                f"[ACTIVITIES] Activity titles close to a mapped title: {'; '.join(nearMisses)}"
+            )
         logging.info("[ACTIVITIES] " + "Done")
 
+        progress = activityProgress(activities, self.browser.utils.getActivities())
+        RUN_REPORT.account(self.browser.email).activities += [
+            ActivityReport(
+                activity.before.id,
+                cleanupActivityTitle(activity.before.title),
+                activity.pointsGained,
+                activity.after is not None
+                and activity.after.earnedPoints >= activity.after.pointProgressMax,
+            )
+            for activity in progress
+        ]
+        logging.info(
+            f"[ACTIVITIES] {sum(activity.pointsGained for activity in progress)}"
+            " points gained from the activities"
+        )
+
         # todo Send one email for all accounts?
         if CONFIG.get("apprise.notify.incomplete-activity"):  # todo Use fancy new way
             incompleteActivities: list[str] = []
-            activitiesBefore = activities
-            activitiesAfter = [activity for activity in self.browser.utils.getActivities() if activity in activitiesBefore]
-
-            for activity in activitiesAfter:
-                activityTitle = cleanupActivityTitle(activity["title"])
-                if (
-                    activityTitle not in IGNORED_ACTIVITIES
-                    and activity["pointProgress"] < activity["pointProgressMax"]
-                    and activity["attributes"].get("is_unlocked", "True") == "True"
-                    # todo Add check whether activity was in original set, in case added in between
+            for activity in progress:
+                activityTitle = cleanupActivityTitle(activity.before.title)
+                if activity.incomplete and not getActivityTitles().isIgnored(
+                    activityTitle
                 ):
                     incompleteActivities.append(activityTitle)
             if incompleteActivities:
                 logging.info(f"incompleteActivities: {incompleteActivities}")
-                APPRISE.notify(
+                REPORTER.notify(
                     '"' + '", "'.join(incompleteActivities) + '"\n' + REWARDS_URL,
                     f"We found some incomplete activities for {self.browser.email}",
                 )
-
-
-def cleanupActivityTitle(activityTitle: str) -> str:
-    return activityTitle.replace("\u200b", "").replace("\xa0", " ")
+        return completed
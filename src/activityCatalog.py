@@ -0,0 +1,123 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from . import activityTitles
+from .activityTitles import normalizeTitle
+
+NORMALIZER_SOURCE = Path(activityTitles.__file__).read_bytes()
+"""
+hashed with the catalogs, so that the cached titles are normalized again when
+`normalizeTitle` changes
+"""
+
+
+class CatalogError(ValueError):
+    """
+    Raised when a localized activities catalog doesn't match the expected schema.
+    """
+
+
+class LocalizedActivities(NamedTuple):
+    """
+    Localized activities catalog, loaded from `localized_activities/<language>.json`.
+    """
+
+    title_to_query: dict[str, list[str]]
+    """
+    the queries to search for each activity title
+    """
+    ignore: list[str]
+    """
+    the titles of the activities to ignore
+    """
+    normalized_titles: dict[str, str]
+    """
+    the normalized version of each title, see `normalizeTitle`
+    """
+
+
+def validateCatalog(catalog: Any, source: Path) -> None:
+    """
+    Checks that a catalog has exactly the `title_to_query` and `ignore` keys, with
+    non-empty lists of non-empty queries and a list of unique ignored titles.
+
+    Raises:
+        CatalogError: if the catalog isn't valid.
+    """
+
+    def fail(message: str):
+        raise CatalogError(f"Invalid localized activities '{source}': {message}")
+
+    if not isinstance(catalog, dict):
+        fail("expected an object")
+    keys = set(catalog)
+    if keys != {"title_to_query", "ignore"}:
+        fail(f"expected the 'title_to_query' and 'ignore' keys, got {sorted(keys)}")
+
+    titleToQuery = catalog["title_to_query"]
+    if not isinstance(titleToQuery, dict):
+        fail("'title_to_query' should be an object")
+    for title, queries in titleToQuery.items():
+        if (
+            not isinstance(queries, list)
+            or not queries
+            or not all(isinstance(query, str) and query.strip() for query in queries)
+        ):
+            fail(f"'title_to_query.{title}' should be a non-empty list of queries")
+
+    ignore = catalog["ignore"]
+    if not isinstance(ignore, list) or not all(
+        isinstance(title, str) and title.strip() for title in ignore
+    ):
+        fail("'ignore' should be a list of titles")
+    if len(set(ignore)) != len(ignore):
+        fail("'ignore' has duplicated titles")
+
+
+def loadCatalog(path: Path) -> LocalizedActivities:
+    """
+    Loads a catalog, using the compiled version cached in `__pycache__` if the catalog
+    and the title normalizer didn't change since it was compiled.
+
+    Raises:
+        FileNotFoundError: if there is no catalog at the given path.
+        CatalogError: if the catalog isn't valid.
+    """
+    content = path.read_bytes()
+    digest = hashlib.sha256(NORMALIZER_SOURCE + content).hexdigest()[:16]
+    cacheDirectory = path.parent / "__pycache__"
+    cachePath = cacheDirectory / f"{path.stem}.{digest}.json"
+
+    try:
+        with open(cachePath, encoding="utf-8") as cacheFile:
+            return LocalizedActivities(**json.load(cacheFile))
+    except (OSError, ValueError, TypeError):
+        pass
+
+    catalog = json.loads(content)
+    validateCatalog(catalog, path)
+    localizedActivities = LocalizedActivities(
+        title_to_query=catalog["title_to_query"],
+        ignore=catalog["ignore"],
+        normalized_titles={
+            title: normalizeTitle(title)
+            for title in (*catalog["title_to_query"], *catalog["ignore"])
+        },
+    )
+
+    try:
+        cacheDirectory.mkdir(exist_ok=True)
+        for staleCachePath in cacheDirectory.glob(f"{path.stem}.*.json"):
+            staleCachePath.unlink(missing_ok=True)
+        temporaryPath = cachePath.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporaryPath, "w", encoding="utf-8") as cacheFile:
+            json.dump(localizedActivities._asdict(), cacheFile, ensure_ascii=False)
+        os.replace(temporaryPath, cachePath)
+    except OSError:
+        logging.debug(f"Could not cache the compiled '{path}'", exc_info=True)
+
+    return localizedActivities
@@ -0,0 +1,147 @@
+import difflib
+import re
+import unicodedata
+from typing import Iterable, NamedTuple
+
+# Zero-width characters aren't considered as whitespace by str.split
+INVISIBLE_CHARACTERS = re.compile("[\u200b\u200c\u200d\u2060\ufeff]")
+
+
+class TitleMatch(NamedTuple):
+    """
+    Result of matching an activity title against the localized activities.
+    """
+
+    title: str
+    """
+    the title as displayed on the dashboard
+    """
+    key: str | None
+    """
+    the matching title of the localized activities, None if nothing matched
+    """
+    score: float
+    """
+    similarity between the title and the key, 1.0 for an exact match
+    """
+    ignored: bool
+    queries: list[str] | None
+
+    @property
+    def exact(self) -> bool:
+        return self.score == 1.0
+
+
+def normalizeTitle(title: str) -> str:
+    """
+    Normalizes an activity title for lookups: casefolded, with zero-width characters
+    removed and any run of Unicode whitespace replaced with a single space.
+    """
+    title = unicodedata.normalize("NFKC", INVISIBLE_CHARACTERS.sub("", title))
+    return " ".join(title.casefold().split())
+
+
+class ActivityTitleIndex:
+    """
+    Index of the localized activity titles, built once, matching dashboard titles
+    exactly, by prefix or by similarity.
+
+    Match results are cached per title, and titles that didn't match exactly are
+    kept to report them, so that the localized activities can be updated.
+    """
+
+    def __init__(
+        self,
+        titleToQueries: dict[str, list[str]],
+        ignored: Iterable[str],
+        threshold: float = 0.85,
+        nearMissThreshold: float = 0.6,
+        normalizedTitles: dict[str, str] | None = None,
+    ):
+        """
+        Args:
+            normalizedTitles: the already normalized titles, if known, to avoid
+            normalizing them again.
+        """
+        normalizedTitles = normalizedTitles or {}
+
+        def normalize(title: str) -> str:
+            return normalizedTitles.get(title) or normalizeTitle(title)
+
+        self.threshold = threshold
+        self.nearMissThreshold = nearMissThreshold
+        self.titleToQueries = titleToQueries
+        self.ignored = {normalize(title) for title in ignored}
+        self.keys: dict[str, str] = {}
+        for title in (*titleToQueries, *ignored):
+            self.keys.setdefault(normalize(title), title)
+        self._cache: dict[str, TitleMatch] = {}
+        self.nearMisses: dict[str, TitleMatch] = {}
+
+    def match(self, title: str) -> TitleMatch:
+        if title not in self._cache:
+            self._cache[title] = self._match(title)
+        return self._cache[title]
+
+    def _match(self, title: str) -> TitleMatch:
+        normalized = normalizeTitle(title)
+        normalizedKey, score = self._findKey(normalized)
+        if not normalizedKey or score < self.threshold:
+            if normalizedKey and score >= self.nearMissThreshold:
+                self.nearMisses[title] = TitleMatch(
+                    title, self.keys[normalizedKey], score, False, None
+                )
+            return TitleMatch(title, None, score, False, None)
+
+        key = self.keys[normalizedKey]
+        match = TitleMatch(
+            title,
+            key,
+            score,
+            normalizedKey in self.ignored,
+            self.titleToQueries.get(key),
+        )
+        if not match.exact:
+            self.nearMisses[title] = match
+        return match
+
+    def _findKey(self, normalized: str) -> tuple[str | None, float]:
+        if normalized in self.keys:
+            return normalized, 1.0
+
+        # Microsoft sometimes appends words to a known title, or truncates it
+        prefixes = [
+            key
+            for key in self.keys
+            if min(len(key), len(normalized)) >= 8
+            and (normalized.startswith(key) or key.startswith(normalized))
+        ]
+        if prefixes:
+            key = max(prefixes, key=len)
+            return key, max(
+                self.threshold, difflib.SequenceMatcher(None, normalized, key).ratio()
+            )
+
+        closeMatches = difflib.get_close_matches(
+            normalized, self.keys, n=1, cutoff=self.nearMissThreshold
+        )
+        if not closeMatches:
+            return None, 0.0
+        key = closeMatches[0]
+        return key, difflib.SequenceMatcher(None, normalized, key).ratio()
+
+    def isIgnored(self, title: str) -> bool:
+        return self.match(title).ignored
+
+    def queriesFor(self, title: str) -> list[str] | None:
+        return self.match(title).queries
+
+    def nearMissesReport(self) -> list[str]:
+        """
+        Describes the titles that were matched approximately, or almost matched.
+        """
+        return [
+            f"{match.title!r} ~ {match.key!r} ({match.score:.0%},"
+            f" {'matched' if match.score >= self.threshold else 'not matched'})"
+            for match in self.nearMisses.values()
+        ]
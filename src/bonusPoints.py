@@ -6,6 +6,10 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 
 from src.browser import Browser
+from src.constants import REWARDS_URL
+from src.navigation import elementOrLoaded
+
+BONUS_BANNER = (By.ID, "user-pointclaim-container")
 
 
 class BonusPoints:
@@ -20,7 +24,14 @@ class BonusPoints:
     def claimBonusPoints(self) -> None:
         logging.info("[BONUS POINTS] Checking for bonus points to claim...")
         try:
-            container = self.webdriver.find_elements(By.ID, "user-pointclaim-container")
+            # Most days there's no banner to wait for
+            bannerReady = elementOrLoaded(BONUS_BANNER)
+            if self.webdriver.current_url == REWARDS_URL:
+                # Usually left on the dashboard by the plan of the run
+                WebDriverWait(self.webdriver, 30, poll_frequency=0.1).until(bannerReady)
+            else:
+                self.browser.utils.goToRewards(bannerReady)
+            container = self.webdriver.find_elements(*BONUS_BANNER)
             if not container:
                 logging.info("[BONUS POINTS] No bonus points banner found")
                 return
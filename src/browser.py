@@ -1,6 +1,7 @@
 import logging
 import os
 import random
+from concurrent.futures import Future
 from pathlib import Path
 from types import TracebackType
 from typing import Any, Type
@@ -12,14 +13,23 @@ from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.virtual_authenticator import VirtualAuthenticatorOptions, Protocol, Transport
 
 from src import RemainingSearches
+from src.navigation import (
+    PAGE_LOAD_STRATEGIES,
+    PERFORMANCE_LOG_PREFS,
+    enableLifecycleEvents,
+)
+from src.sessionMaintenance import checkSession, sweepOrphanProcesses
 from src.userAgentGenerator import GenerateUserAgent
+from src.watchdog import PhaseTimeout, killProcessTree
 from src.utils import (
     CONFIG,
+    RUN_REPORT,
+    WATCHDOG,
     Utils,
     getBrowserConfig,
     getProjectRoot,
     saveBrowserConfig,
-    PREFER_BING_INFO, LANGUAGE, COUNTRY,
+    LANGUAGE, COUNTRY,
 )
 
 
@@ -42,6 +52,12 @@ class Browser:
         if not self.proxy and account.get("proxy"):
             self.proxy = account.proxy
         self.userDataDir = self.setupProfiles()
+        if CONFIG.sessions.get("sweep-orphans"):
+            sweepOrphanProcesses(self.userDataDir)
+        if CONFIG.sessions.get("auto-compact"):
+            checkSession(
+                self.userDataDir, CONFIG.sessions.get("max-size") * 1024 * 1024
+            )
         self.browserConfig = getBrowserConfig(self.userDataDir)
         (
             self.userAgent,
@@ -53,6 +69,19 @@ class Browser:
             saveBrowserConfig(self.userDataDir, self.browserConfig)
         self.webdriver = self.browserSetup()
         self.utils = Utils(self.webdriver)
+        if self.webdriver.caps.get(
+            "pageLoadStrategy"
+        ) == "eager" and logging.getLogger().isEnabledFor(logging.DEBUG):
+            self.utils.lifecycleEvents = enableLifecycleEvents(self.webdriver)
+        self.killed = False
+        """
+        whether the watchdog killed the browser, see `Browser.kill`
+        """
+        self.backgroundEarning: Future | None = None
+        """
+        work earning points for the account without the browser, like Read to Earn,
+        see `Browser.balanceShared`
+        """
         logging.debug("out __init__")
 
     def __enter__(self):
@@ -69,9 +98,50 @@ class Browser:
         logging.debug(
             f"in __exit__ exc_type={exc_type} exc_value={exc_value} traceback={traceback}"
         )
-        # turns out close is needed for undetected_chromedriver
-        self.webdriver.close()
-        self.webdriver.quit()
+        elementCache = RUN_REPORT.account(self.email).elementCache
+        for outcome, count in self.utils.elementCache.items():
+            elementCache[outcome] = elementCache.get(outcome, 0) + count
+        if self.killed:
+            return
+        try:
+            with WATCHDOG.phase("close-browser", self):
+                # turns out close is needed for undetected_chromedriver
+                self.webdriver.close()
+                self.webdriver.quit()
+        except PhaseTimeout:
+            logging.warning("[WATCHDOG] Chrome didn't close in time and was killed")
+
+    @property
+    def balanceShared(self) -> bool:
+        """
+        Whether points are being earned in the background, so that the balance grows
+        without telling what the browser earned.
+        """
+        return self.backgroundEarning is not None and not self.backgroundEarning.done()
+
+    def processIds(self) -> list[int]:
+        """
+        Returns:
+            list[int]: the pids of chromedriver and Chrome, the roots of the process
+            tree of the browser.
+        """
+        return [
+            pid
+            for pid in (
+                getattr(getattr(self.webdriver.service, "process", None), "pid", None),
+                getattr(self.webdriver, "browser_pid", None),
+            )
+            if pid
+        ]
+
+    def kill(self) -> None:
+        """
+        Kills chromedriver and Chrome with all their child processes, for when they
+        hang. The browser can't be used afterward.
+        """
+        self.killed = True
+        killed = killProcessTree(self.processIds())
+        logging.warning(f"[WATCHDOG] Killed {len(killed)} chromedriver/Chrome process(es)")
 
     def browserSetup(
         self,
@@ -99,7 +169,18 @@ class Browser:
         options.add_argument("--disable-features=PrivacySandboxSettings4")
         options.add_argument("--disable-http2")
         options.add_argument("--disable-search-engine-choice-screen")  # 153
-        options.page_load_strategy = "normal"
+        pageLoad = CONFIG.get("browser.page-load")
+        if pageLoad not in PAGE_LOAD_STRATEGIES:
+            logging.warning(
+                f"[BROWSER] Unknown page load strategy '{pageLoad}', using 'normal'"
+            )
+            pageLoad = "normal"
+        options.page_load_strategy = pageLoad
+        if pageLoad == "eager" and logging.getLogger().isEnabledFor(logging.DEBUG):
+            # For the lifecycle events of the pages logged by `Utils.navigate`, only
+            # read while debugging, as the log is kept until it's read
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option("perfLoggingPrefs", PERFORMANCE_LOG_PREFS)
 
         seleniumwireOptions: dict[str, Any] = {"verify_ssl": False}
 
@@ -273,50 +354,9 @@ class Browser:
     def getRemainingSearches(
         self, desktopAndMobile: bool = False
     ) -> RemainingSearches | int:
-        if PREFER_BING_INFO:
-            bingInfo = self.utils.getBingInfo()
-        else:
-            bingInfo = self.utils.getDashboardData()
-        searchPoints = 1
-        if PREFER_BING_INFO:
-            counters = bingInfo["flyoutResult"]["userStatus"]["counters"]
-        else:
-            counters = bingInfo["userStatus"]["counters"]
-        pcSearch: dict = counters["PCSearch" if PREFER_BING_INFO else "pcSearch"][0]
-        pointProgressMax: int = pcSearch["pointProgressMax"]
-
-        searchPoints: int
-        if pointProgressMax in [30, 90, 102]:
-            searchPoints = 3
-        elif pointProgressMax in [50, 150] or pointProgressMax >= 170:
-            searchPoints = 5
-        pcPointsRemaining = pcSearch["pointProgressMax"] - pcSearch["pointProgress"]
-        assert pcPointsRemaining % searchPoints == 0
-        remainingDesktopSearches: int = int(pcPointsRemaining / searchPoints)
-
-        if PREFER_BING_INFO:
-            activeLevel = bingInfo["userInfo"]["profile"]["attributes"]["level"]
-        else:
-            activeLevel = bingInfo["userStatus"]["levelInfo"]["activeLevel"]
-        remainingMobileSearches: int = 0
-        if activeLevel == "Level2":
-            mobileSearch: dict = counters[
-                "MobileSearch" if PREFER_BING_INFO else "mobileSearch"
-            ][0]
-            mobilePointsRemaining = (
-                mobileSearch["pointProgressMax"] - mobileSearch["pointProgress"]
-            )
-            assert mobilePointsRemaining % searchPoints == 0
-            remainingMobileSearches = int(mobilePointsRemaining / searchPoints)
-        elif activeLevel == "Level1":
-            pass
-        else:
-            raise AssertionError(f"Unknown activeLevel: {activeLevel}")
-
+        remainingSearches = self.utils.getUserStatus().remainingSearches()
         if desktopAndMobile:
-            return RemainingSearches(
-                desktop=remainingDesktopSearches, mobile=remainingMobileSearches
-            )
+            return remainingSearches
         if self.mobile:
-            return remainingMobileSearches
-        return remainingDesktopSearches
+            return remainingSearches.mobile
+        return remainingSearches.desktop
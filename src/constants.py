@@ -1,3 +1,4 @@
 REWARDS_URL = "https://rewards.bing.com/"
+SIGNIN_URL = REWARDS_URL + "Signin/"
 SEARCH_URL = "https://bing.com/"
 VERSION = 3
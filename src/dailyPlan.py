@@ -0,0 +1,179 @@
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from .activityTitles import ActivityTitleIndex
+from .dashboard import Dashboard, Promotion, PunchCard
+from .eligibility import (
+    cleanupActivityTitle,
+    isIncomplete,
+    isPromotionalItemDoable,
+    skipReason,
+)
+from .runCheckpoint import PHASES, RunCheckpoint
+
+READ_TO_EARN_POINTS = 30
+"""
+10 articles of 3 points, the dashboard doesn't tell how many are left
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Task:
+    phase: str
+    description: str
+    points: int
+    """
+    the points expected from the dashboard, 0 if unknown
+    """
+    count: int = 1
+    """
+    the units of work of the task, like searches, that can be done separately
+    """
+    item: Promotion | PunchCard | None = None
+    """
+    the activity, punch card or promotional item to complete
+    """
+
+    def describe(self) -> str:
+        return f"{self.count} {self.description}" if self.count > 1 else self.description
+
+
+@dataclass
+class DailyPlan:
+    """
+    The work left for the day, planned from one dashboard snapshot, so that phases with
+    nothing to do are skipped without opening any page.
+    """
+
+    phases: tuple[str, ...]
+    """
+    the phases that were planned, in the order to run them
+    """
+    tasks: list[Task] = field(default_factory=list)
+    deferred: list[Task] = field(default_factory=list)
+    """
+    the tasks left for a later run, out of the time budget
+    """
+    estimatedSeconds: float | None = None
+    deadline: float | None = None
+    """
+    `time.monotonic` time after which the remaining phases are deferred
+    """
+
+    def tasksFor(self, phase: str) -> list[Task]:
+        return [task for task in self.tasks if task.phase == phase]
+
+    def hasWork(self, phase: str) -> bool:
+        """
+        Whether the phase has tasks, or wasn't planned so it's unknown.
+        """
+        return phase not in self.phases or any(
+            task.phase == phase for task in self.tasks
+        )
+
+    def units(self, phase: str) -> int:
+        return sum(task.count for task in self.tasksFor(phase))
+
+    def items(self, phase: str) -> list:
+        return [task.item for task in self.tasksFor(phase) if task.item is not None]
+
+    def runOrder(self, phases: Iterable[str]) -> list[str]:
+        """
+        Returns:
+            list[str]: the phases sorted in the planned order, the phases that weren't
+            planned first.
+        """
+        return sorted(
+            phases,
+            key=lambda phase: self.phases.index(phase) if phase in self.phases else -1,
+        )
+
+    def defer(self, phase: str) -> None:
+        self.deferred += self.tasksFor(phase)
+        self.tasks = [task for task in self.tasks if task.phase != phase]
+
+    @property
+    def expectedPoints(self) -> int:
+        return sum(task.points for task in self.tasks)
+
+    def describe(self) -> list[str]:
+        lines = []
+        for phase in self.phases:
+            tasks = self.tasksFor(phase)
+            if not tasks:
+                lines.append(f"{phase}: nothing to do")
+                continue
+            points = sum(task.points for task in tasks)
+            lines.append(
+                f"{phase}: {len(tasks)} task(s), {points} points expected"
+                f" ({', '.join(task.describe() for task in tasks)})"
+            )
+        return lines
+
+
+def planDay(
+    dashboard: Dashboard,
+    checkpoint: RunCheckpoint,
+    phases: Iterable[str],
+    activityTitles: ActivityTitleIndex,
+) -> DailyPlan:
+    """
+    Args:
+        phases: the phases that will run, the phases done today are left out.
+        activityTitles: the localized activities, telling which ones are ignored.
+    """
+    plan = DailyPlan(tuple(phase for phase in phases if not checkpoint.isDone(phase)))
+    assert set(plan.phases) <= set(PHASES), f"Unknown phases: {plan.phases}"
+    remainingSearches = dashboard.userStatus.remainingSearches()
+    counters = dashboard.userStatus.counters
+
+    def add(phase: str, description: str, points: int, **fields) -> None:
+        if phase in plan.phases:
+            plan.tasks.append(Task(phase, description, points, **fields))
+
+    # The banner is only on the rewards page, which the snapshot was taken on
+    add("bonus-points", "claim the bonus points, if any", 0)
+    for activity in dashboard.activities:
+        if skipReason(activity, activityTitles) or checkpoint.isActivityDone(activity):
+            continue
+        add(
+            "activities",
+            f"'{cleanupActivityTitle(activity.title)}'",
+            activity.pointProgressMax - activity.pointProgress,
+            item=activity,
+        )
+    item = dashboard.promotionalItem
+    if isPromotionalItemDoable(item):
+        add(
+            "punch-cards",
+            f"promotional item '{item.title}'",
+            item.pointProgressMax - item.pointProgress,
+            item=item,
+        )
+    for punchCard in filter(isIncomplete, dashboard.punchCards):
+        parentPromotion = punchCard.parentPromotion
+        if checkpoint.isActivityDone(parentPromotion):
+            continue
+        steps = sum(not child.complete for child in punchCard.childPromotions)
+        add(
+            "punch-cards",
+            f"punch card '{parentPromotion.title}' ({steps} step(s) left)",
+            parentPromotion.pointProgressMax - parentPromotion.pointProgress,
+            item=punchCard,
+        )
+    if remainingSearches.desktop:
+        add(
+            "desktop-searches",
+            "searches",
+            sum(counter.remainingPoints for counter in counters.pcSearch),
+            count=remainingSearches.desktop,
+        )
+    add("read-to-earn", "read articles in the app", READ_TO_EARN_POINTS)
+    if remainingSearches.mobile:
+        add(
+            "mobile-searches",
+            "searches",
+            sum(counter.remainingPoints for counter in counters.mobileSearch),
+            count=remainingSearches.mobile,
+        )
+    return plan
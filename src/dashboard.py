@@ -0,0 +1,384 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable
+
+from .remainingSearches import RemainingSearches
+
+_REQUIRED = object()
+
+PROJECTION_SCRIPT = """
+const projected = {};
+for (const path of arguments[0]) {
+  const keys = path.split(".");
+  let source = dashboard;
+  let target = projected;
+  for (const [index, key] of keys.entries()) {
+    const value = source[key];
+    if (value === undefined) break;
+    if (index === keys.length - 1) {
+      target[key] = value;
+      break;
+    }
+    // Stops at leaves, and at objects already copied whole for a shorter path
+    if (value === null || typeof value !== "object" || target[key] === value) break;
+    target = target[key] ??= {};
+    source = value;
+  }
+}
+return projected;
+"""
+"""
+Copies the fields at the dotted paths given as argument out of the `dashboard` object
+of the rewards page, so only those cross the WebDriver wire.
+"""
+
+USER_STATUS_PATHS = (
+    "userStatus.availablePoints",
+    "userStatus.levelInfo.activeLevel",
+    "userStatus.redeemGoal.price",
+    "userStatus.redeemGoal.title",
+    "userStatus.counters.pcSearch",
+    "userStatus.counters.mobileSearch",
+)
+"""
+the fields of `UserStatus`, always fetched to parse a `Dashboard`
+"""
+
+
+def dailySetKey(day: date | None = None) -> str:
+    return (day or date.today()).strftime("%m/%d/%Y")
+
+
+def activitiesPaths(day: date | None = None) -> tuple[str, ...]:
+    return f"dailySetPromotions.{dailySetKey(day)}", "morePromotions"
+
+
+def allPaths(day: date | None = None) -> tuple[str, ...]:
+    """
+    Returns:
+        tuple[str, ...]: the paths of all the fields the models use.
+    """
+    return *activitiesPaths(day), "punchCards", "promotionalItem"
+
+
+class DashboardError(ValueError):
+    """
+    Raised when the dashboard doesn't have the expected shape, naming the faulty field.
+    """
+
+
+def _field(
+    data: Any, path: str, kind: type, where: str, default: Any = _REQUIRED
+) -> Any:
+    """
+    Returns:
+        Any: the field at the dotted path, or the default if it's missing.
+
+    Raises:
+        DashboardError: if the field is missing without default, or of another kind.
+    """
+    value = data
+    for key in path.split("."):
+        if not isinstance(value, dict) or value.get(key) is None:
+            if default is _REQUIRED:
+                raise DashboardError(f"{where}.{path} is missing")
+            return default
+        value = value[key]
+    if not isinstance(value, kind):
+        raise DashboardError(
+            f"{where}.{path} is a {type(value).__name__}, not a {kind.__name__}"
+        )
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Promotion:
+    """
+    An activity of the daily set or of the other promotions, a punch card or one of its
+    steps, or the promotional item.
+    """
+
+    title: str
+    complete: bool
+    pointProgressMax: int
+    pointProgress: int = 0
+    name: str = ""
+    offerId: str = ""
+    promotionType: str = ""
+    destination: str = ""
+    """
+    `attributes.destination`, the page of a punch card
+    """
+    destinationUrl: str = ""
+    """
+    the page of the promotional item, which may differ from its `destination`
+    """
+    isUnlocked: bool = True
+
+    @property
+    def id(self) -> str:
+        return self.name or self.offerId or self.title
+
+    @property
+    def earnedPoints(self) -> int:
+        return self.pointProgressMax if self.complete else self.pointProgress
+
+    @classmethod
+    def fromDict(cls, data: Any, where: str) -> "Promotion":
+        return cls(
+            title=_field(data, "title", str, where),
+            complete=_field(data, "complete", bool, where),
+            pointProgressMax=_field(data, "pointProgressMax", int, where),
+            pointProgress=_field(data, "pointProgress", int, where, 0),
+            name=_field(data, "name", str, where, ""),
+            offerId=_field(data, "offerId", str, where, ""),
+            promotionType=_field(data, "promotionType", str, where, ""),
+            destination=_field(data, "attributes.destination", str, where, ""),
+            destinationUrl=_field(data, "destinationUrl", str, where, ""),
+            isUnlocked=str(
+                _field(data, "attributes.is_unlocked", object, where, "True")
+            )
+            == "True",
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PunchCard:
+    parentPromotion: Promotion | None
+    childPromotions: tuple[Promotion, ...]
+
+    @classmethod
+    def fromDict(cls, data: Any, where: str) -> "PunchCard":
+        parent = _field(data, "parentPromotion", dict, where, None)
+        return cls(
+            None
+            if parent is None
+            else Promotion.fromDict(parent, f"{where}.parentPromotion"),
+            _promotions(
+                _field(data, "childPromotions", list, where, []),
+                f"{where}.childPromotions",
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SearchCounter:
+    pointProgress: int
+    pointProgressMax: int
+
+    @property
+    def complete(self) -> bool:
+        return self.pointProgress >= self.pointProgressMax
+
+    @property
+    def remainingPoints(self) -> int:
+        return max(self.pointProgressMax - self.pointProgress, 0)
+
+    @classmethod
+    def fromDict(cls, data: Any, where: str) -> "SearchCounter":
+        return cls(
+            _field(data, "pointProgress", int, where),
+            _field(data, "pointProgressMax", int, where),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Counters:
+    pcSearch: tuple[SearchCounter, ...]
+    """
+    never empty
+    """
+    mobileSearch: tuple[SearchCounter, ...]
+
+    @classmethod
+    def fromDict(
+        cls,
+        data: Any,
+        where: str,
+        pcSearchKey: str = "pcSearch",
+        mobileSearchKey: str = "mobileSearch",
+    ) -> "Counters":
+        pcSearch = tuple(
+            SearchCounter.fromDict(counter, f"{where}.{pcSearchKey}[{index}]")
+            for index, counter in enumerate(_field(data, pcSearchKey, list, where))
+        )
+        if not pcSearch:
+            raise DashboardError(f"{where}.{pcSearchKey} is empty")
+        mobileSearch = tuple(
+            SearchCounter.fromDict(counter, f"{where}.{mobileSearchKey}[{index}]")
+            for index, counter in enumerate(
+                _field(data, mobileSearchKey, list, where, [])
+            )
+        )
+        return cls(pcSearch, mobileSearch)
+
+
+@dataclass(frozen=True, slots=True)
+class UserStatus:
+    availablePoints: int
+    activeLevel: str
+    counters: Counters
+    goalPoints: int = 0
+    """
+    0 if no redeem goal is set
+    """
+    goalTitle: str = ""
+
+    def remainingSearches(self) -> RemainingSearches:
+        pcSearch = self.counters.pcSearch[0]
+        pointProgressMax: int = pcSearch.pointProgressMax
+
+        searchPoints = 1
+        if pointProgressMax in [30, 90, 102]:
+            searchPoints = 3
+        elif pointProgressMax in [50, 150] or pointProgressMax >= 170:
+            searchPoints = 5
+        pcPointsRemaining = pcSearch.pointProgressMax - pcSearch.pointProgress
+        assert pcPointsRemaining % searchPoints == 0
+        remainingDesktopSearches: int = int(pcPointsRemaining / searchPoints)
+
+        remainingMobileSearches: int = 0
+        if self.activeLevel == "Level2":
+            mobileSearch = self.counters.mobileSearch[0]
+            mobilePointsRemaining = (
+                mobileSearch.pointProgressMax - mobileSearch.pointProgress
+            )
+            assert mobilePointsRemaining % searchPoints == 0
+            remainingMobileSearches = int(mobilePointsRemaining / searchPoints)
+        elif self.activeLevel == "Level1":
+            pass
+        else:
+            raise AssertionError(f"Unknown activeLevel: {self.activeLevel}")
+
+        return RemainingSearches(
+            desktop=remainingDesktopSearches, mobile=remainingMobileSearches
+        )
+
+    @classmethod
+    def fromDict(cls, data: Any, where: str = "dashboard.userStatus") -> "UserStatus":
+        return cls(
+            availablePoints=_field(data, "availablePoints", int, where),
+            activeLevel=_field(data, "levelInfo.activeLevel", str, where),
+            counters=Counters.fromDict(
+                _field(data, "counters", dict, where), f"{where}.counters"
+            ),
+            goalPoints=_field(data, "redeemGoal.price", int, where, 0),
+            goalTitle=_field(data, "redeemGoal.title", str, where, ""),
+        )
+
+    @classmethod
+    def fromBingInfo(cls, bingInfo: Any) -> "UserStatus":
+        """
+        Parses the user info of the Bing rewards flyout, see `Utils.getBingInfo`.
+        """
+        where = "bingInfo"
+        return cls(
+            availablePoints=_field(bingInfo, "userInfo.balance", int, where),
+            activeLevel=_field(
+                bingInfo, "userInfo.profile.attributes.level", str, where
+            ),
+            counters=Counters.fromDict(
+                _field(bingInfo, "flyoutResult.userStatus.counters", dict, where),
+                f"{where}.flyoutResult.userStatus.counters",
+                "PCSearch",
+                "MobileSearch",
+            ),
+            goalPoints=_field(bingInfo, "flyoutResult.userGoal.price", int, where, 0),
+            goalTitle=_field(bingInfo, "flyoutResult.userGoal.title", str, where, ""),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Dashboard:
+    """
+    The fields of the rewards dashboard the bot uses, validated when parsed, so that a
+    change of its shape fails right away with the path of the field.
+    """
+
+    userStatus: UserStatus
+    dailySetPromotions: tuple[Promotion, ...]
+    """
+    the daily set of the day the dashboard was parsed
+    """
+    morePromotions: tuple[Promotion, ...]
+    punchCards: tuple[PunchCard, ...]
+    promotionalItem: Promotion | None
+
+    @property
+    def activities(self) -> tuple[Promotion, ...]:
+        return self.dailySetPromotions + self.morePromotions
+
+    @classmethod
+    def fromDict(cls, data: Any, day: date | None = None) -> "Dashboard":
+        """
+        Parses the `dashboard` object of the rewards page.
+        """
+        where = "dashboard"
+        today = dailySetKey(day)
+        promotionalItem = _field(data, "promotionalItem", dict, where, None)
+        return cls(
+            userStatus=UserStatus.fromDict(_field(data, "userStatus", dict, where)),
+            dailySetPromotions=_promotions(
+                _field(data, "dailySetPromotions", dict, where, {}).get(today) or [],
+                f"{where}.dailySetPromotions[{today}]",
+            ),
+            morePromotions=_promotions(
+                _field(data, "morePromotions", list, where, []), f"{where}.morePromotions"
+            ),
+            punchCards=tuple(
+                PunchCard.fromDict(punchCard, f"{where}.punchCards[{index}]")
+                for index, punchCard in enumerate(
+                    _field(data, "punchCards", list, where, [])
+                )
+            ),
+            promotionalItem=None
+            if promotionalItem is None
+            else Promotion.fromDict(promotionalItem, f"{where}.promotionalItem"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ActivityProgress:
+    """
+    An activity in two snapshots of the dashboard, matched by its id.
+    """
+
+    before: Promotion
+    after: Promotion | None
+    """
+    None if the activity left the dashboard in between
+    """
+
+    @property
+    def pointsGained(self) -> int:
+        if self.after is None:
+            return 0
+        return self.after.earnedPoints - self.before.earnedPoints
+
+    @property
+    def incomplete(self) -> bool:
+        return (
+            self.after is not None
+            and self.after.pointProgress < self.after.pointProgressMax
+            and not self.after.complete
+            and self.after.isUnlocked
+        )
+
+
+def activityProgress(
+    before: Iterable[Promotion], after: Iterable[Promotion]
+) -> list[ActivityProgress]:
+    """
+    Returns:
+        list[ActivityProgress]: each activity of `before` with its state in `after`,
+        the activities added in between are left out.
+    """
+    afterById = {activity.id: activity for activity in after}
+    return [ActivityProgress(activity, afterById.get(activity.id)) for activity in before]
+
+
+def _promotions(data: list, where: str) -> tuple[Promotion, ...]:
+    return tuple(
+        Promotion.fromDict(promotion, f"{where}[{index}]")
+        for index, promotion in enumerate(data)
+    )
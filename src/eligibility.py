@@ -0,0 +1,58 @@
+"""
+Which dashboard items are worth doing, shared by the daily plan and the phases doing
+them. It depends on no browser nor configuration, so that the plan can be made and
+tested without them.
+"""
+
+import urllib.parse
+
+from .activityTitles import ActivityTitleIndex, normalizeTitle
+from .constants import REWARDS_URL
+from .dashboard import Promotion, PunchCard
+
+
+def cleanupActivityTitle(activityTitle: str) -> str:
+    return activityTitle.replace("\u200b", "").replace("\xa0", " ")
+
+
+def skipReason(activity: Promotion, activityTitles: ActivityTitleIndex) -> str | None:
+    """
+    Returns:
+        str | None: why the activity isn't worth opening, None if it is.
+    """
+    activityTitle = cleanupActivityTitle(activity.title)
+    normalizedTitle = normalizeTitle(activityTitle)
+    if activity.complete or activity.pointProgressMax == 0:
+        return "already done"
+    if activityTitles.isIgnored(activityTitle):
+        return "ignored"
+    if "puzzle" in normalizedTitle or normalizedTitle == "windows search":
+        return "not supported"
+    if not activity.isUnlocked:
+        return "locked"
+    return None
+
+
+def isIncomplete(punchCard: PunchCard) -> bool:
+    parentPromotion = punchCard.parentPromotion
+    return bool(
+        parentPromotion
+        and punchCard.childPromotions
+        and not parentPromotion.complete
+        and parentPromotion.pointProgressMax != 0
+    )
+
+
+def isPromotionalItemDoable(item: Promotion | None) -> bool:
+    if item is None:
+        return False
+    destUrl = urllib.parse.urlparse(item.destinationUrl or item.destination)
+    baseUrl = urllib.parse.urlparse(REWARDS_URL)
+    return (
+        (item.pointProgressMax in [100, 200, 500])
+        and not item.complete
+        and (
+            (destUrl.hostname == baseUrl.hostname and destUrl.path == baseUrl.path)
+            or destUrl.hostname == "www.bing.com"
+        )
+    )
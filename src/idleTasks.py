@@ -0,0 +1,84 @@
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+
+class IdleTasks:
+    """
+    Non-browser work (saving statistics, prefetching keywords, pruning sessions...)
+    queued by name and run on a background thread during the cooldowns, so that it
+    overlaps time the bot waits anyway. A cooldown lasts as long with or without queued
+    work. The work still queued when the run ends is dropped, so it must be optional.
+    """
+
+    def __init__(self):
+        self._queue: dict[str, Callable[[], Any]] = {}
+        self._windowEnd = 0.0
+        self._running: str | None = None
+        self._worker: threading.Thread | None = None
+        self._condition = threading.Condition()
+
+    def submit(self, name: str, job: Callable[..., Any], *args, **kwargs) -> None:
+        """
+        Queues a job, in place of the queued job of the same name if any.
+        """
+        with self._condition:
+            self._queue[name] = lambda: job(*args, **kwargs)
+            self._condition.notify_all()
+
+    @property
+    def pending(self) -> list[str]:
+        with self._condition:
+            return list(self._queue)
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Sleeps for `seconds`, starting the queued jobs in the meantime. A job started
+        near the end may finish after it, on its own thread. Several threads can sleep
+        at once, the jobs run until the last one wakes up.
+        """
+        end = time.monotonic() + seconds
+        with self._condition:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._work, name="IdleTasks", daemon=True
+                )
+                self._worker.start()
+            self._windowEnd = max(self._windowEnd, end)
+            self._condition.notify_all()
+        try:
+            time.sleep(max(0.0, end - time.monotonic()))
+        finally:
+            with self._condition:
+                if self._windowEnd <= end:
+                    self._windowEnd = 0.0
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Waits for the running job to finish, before work that could conflict with it.
+
+        Returns:
+            bool: False if it was still running after the timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._running is None, timeout)
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._queue and time.monotonic() < self._windowEnd
+                )
+                name = next(iter(self._queue))
+                job = self._queue.pop(name)
+                self._running = name
+            logging.debug(f"[IDLE] Running '{name}' during the cooldown")
+            try:
+                job()
+            except Exception:
+                logging.error(f"[IDLE] Error running '{name}'", exc_info=True)
+            finally:
+                with self._condition:
+                    self._running = None
+                    self._condition.notify_all()
@@ -1,4 +1,5 @@
 import logging
+import time
 
 from pyotp import TOTP
 from selenium.common import TimeoutException
@@ -12,7 +13,19 @@ from selenium.webdriver.support.wait import WebDriverWait
 from undetected_chromedriver import Chrome
 
 from src.browser import Browser
-from src.utils import CONFIG, APPRISE
+from src.constants import REWARDS_URL, SIGNIN_URL
+from src.loginClassifier import (
+    OTP_INPUT_SCREENS,
+    OTP_SUBMIT_SCREENS,
+    POST_PASSWORD_SCREENS,
+    SESSION_SCREENS,
+    waitForScreen,
+)
+from src.navigation import elementOrLoaded
+from src.utils import CONFIG, saveBrowserConfig
+
+EMAIL_FIELD = (By.CSS_SELECTOR, "#usernameEntry, #i0116")
+REWARDS_PORTAL = (By.CSS_SELECTOR, 'html[data-role-name="RewardsPortal"]')
 
 
 class LoginError(Exception):
@@ -69,22 +82,108 @@ class Login:
 
     def login(self) -> None:
         try:
-            if self.utils.isLoggedIn():
+            if self.isSessionRecentlyVerified():
+                # Checked on the first rewards page load instead, without navigating now
+                logging.info("[LOGIN] Session verified recently, skipping login check")
+                self.utils.sessionCheck = self.checkLoadedSession
+                return
+            if self.probeSession() == "logged_in":
                 logging.info("[LOGIN] Already logged-in")
             else:
                 logging.info("[LOGIN] Logging-in...")
                 self.execute_login()
-                assert self.utils.isLoggedIn()
+                assert self.probeSession() == "logged_in"
                 logging.info("[LOGIN] Logged-in successfully!")
-            self.check_locked_user()
-            self.check_banned_user()
+            self.saveVerifiedSession()
         except Exception as e:
             logging.error(f"Error during login: {e}")
+            self.forgetVerifiedSession()
             self.webdriver.close()
             raise
 
+    def probeSession(self) -> str:
+        """
+        Visits the rewards page once, and checks whether the session is logged-in,
+        locked or banned in a single script per poll.
+
+        Returns:
+            str: "logged_in" or "logged_out"
+
+        Raises:
+            LoginError: if the account is locked or banned.
+        """
+        # Ready once a screen is recognized, see `getSessionState`
+        self.utils.navigate(REWARDS_URL)
+        return self.getSessionState()
+
+    def getSessionState(self) -> str:
+        try:
+            state, element = waitForScreen(
+                WebDriverWait(self.webdriver, 10), SESSION_SCREENS
+            )
+        except TimeoutException:
+            return "logged_out"
+        if state == "locked":
+            self.locked(element)
+        elif state == "banned":
+            self.banned(element)
+        return state
+
+    def checkLoadedSession(self) -> None:
+        """
+        Checks the session on the rewards page that was just loaded, logging-in again
+        if it expired since it was last verified.
+        """
+        try:
+            if self.getSessionState() == "logged_in":
+                return
+            logging.info("[LOGIN] Session expired since it was last verified, logging-in...")
+            self.forgetVerifiedSession()
+            self.execute_login()
+            assert self.probeSession() == "logged_in"
+            logging.info("[LOGIN] Logged-in successfully!")
+            self.saveVerifiedSession()
+        except Exception:
+            self.forgetVerifiedSession()
+            raise
+
+    def isSessionRecentlyVerified(self) -> bool:
+        """
+        Whether this browser type verified the session less than `login.session-ttl`
+        ago. The mobile browser always checks it, as its searches may never load the
+        rewards page, where the check is deferred to, see `Utils.goToRewards`.
+        """
+        if self.browser.mobile:
+            return False
+        verifiedAt = self._verifiedAt().get(self.browser.browserType)
+        sessionTtl = CONFIG.get("login.session-ttl")
+        return bool(
+            verifiedAt and sessionTtl and 0 <= time.time() - verifiedAt < sessionTtl
+        )
+
+    def _verifiedAt(self) -> dict[str, float]:
+        """
+        Returns:
+            dict[str, float]: when the session was last verified, by browser type, as
+            both browsers share the session folder.
+        """
+        verifiedAt = self.browser.browserConfig.get("loginVerifiedAt")
+        # Saved as a single time by earlier versions
+        return verifiedAt if isinstance(verifiedAt, dict) else {}
+
+    def saveVerifiedSession(self) -> None:
+        self.browser.browserConfig["loginVerifiedAt"] = self._verifiedAt() | {
+            self.browser.browserType: time.time()
+        }
+        saveBrowserConfig(self.browser.userDataDir, self.browser.browserConfig)
+
+    def forgetVerifiedSession(self) -> None:
+        if self.browser.browserConfig.pop("loginVerifiedAt", None) is not None:
+            saveBrowserConfig(self.browser.userDataDir, self.browser.browserConfig)
+
     def execute_login(self) -> None:
-        self.webdriver.get("https://rewards.bing.com/Signin/")
+        # Waited for below, with the screens it may redirect to without it
+        self.utils.navigate(SIGNIN_URL, elementOrLoaded(EMAIL_FIELD))
 
         wait = WebDriverWait(self.webdriver, 10)
 
@@ -114,9 +213,7 @@ class Login:
                 return
             # Check if already on RewardsPortal
             try:
-                self.utils.waitUntilVisible(
-                    By.CSS_SELECTOR, 'html[data-role-name="RewardsPortal"]', 5
-                )
+                self.utils.waitUntilVisible(*REWARDS_PORTAL, 5)
                 logging.info("[LOGIN] Already on RewardsPortal after redirect.")
                 return
             except TimeoutException:
@@ -327,101 +424,25 @@ class Login:
         except TimeoutException:
             logging.debug("[LOGIN] Password field did not go stale quickly after submit.")
 
-        def detector(_):
-            if self._find_first_visible([
-                (By.NAME, "OneTimeCodeViewForm"),
-                (By.CSS_SELECTOR, "input[name='otc']"),
-                (By.ID, "idTxtBx_SAOTCC_OTC"),
-                (By.CSS_SELECTOR, "input[id*='SAOTCC']"),
-                (By.CSS_SELECTOR, "input[id*='OTC']"),
-                (By.CSS_SELECTOR, "input[aria-label='Code']"),
-                (By.CSS_SELECTOR, "input[placeholder='Code']"),
-                (By.CSS_SELECTOR, "input[autocomplete='one-time-code']"),
-                (By.CSS_SELECTOR, "input[inputmode='numeric']"),
-                (By.CSS_SELECTOR, "input[type='tel']"),
-            ]):
-                return "totp"
-
-            if self._find_first_visible([
-                (By.XPATH, "//button[contains(., 'Other ways to sign in') or contains(., 'other ways to sign in')]"),
-            ]):
-                return "other_ways"
-
-            if (
-                "passkey/enroll" in self.webdriver.current_url
-                or self._find_first_visible([(By.NAME, "kmsiForm")])
-                or self._find_first_visible([(By.ID, "iPageTitle")])
-                or self._find_first_visible([(By.CSS_SELECTOR, 'html[data-role-name="RewardsPortal"]')])
-            ):
-                return "post_login"
-
-            page_text = self.webdriver.page_source
-            if (
-                "sErrorCode\":\"80041032" in page_text
-                or "Please enter the password for your Microsoft account." in page_text
-            ):
-                return "password_required"
-
-            return False
-
-        return wait.until(detector)
+        state, _ = waitForScreen(wait, POST_PASSWORD_SCREENS)
+        return state
 
     def _wait_for_otp_input(self, wait, timeout: int = 10):
         custom_wait = WebDriverWait(self.webdriver, timeout)
         try:
-            return custom_wait.until(EC.any_of(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[name='otc']")),
-                EC.element_to_be_clickable((By.ID, "idTxtBx_SAOTCC_OTC")),
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[id*='SAOTCC']")),
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[id*='OTC']")),
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[aria-label='Code']")),
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[placeholder='Code']")),
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[autocomplete='one-time-code']")),
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[inputmode='numeric']")),
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='tel']")),
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "form[name='OneTimeCodeViewForm'] input[type='text']")),
-            ))
+            _, otpField = waitForScreen(custom_wait, OTP_INPUT_SCREENS, clickable=True)
         except TimeoutException:
-            return custom_wait.until(EC.any_of(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "input[name='otc']")),
-                EC.visibility_of_element_located((By.ID, "idTxtBx_SAOTCC_OTC")),
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "input[id*='SAOTCC']")),
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "input[id*='OTC']")),
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "input[aria-label='Code']")),
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder='Code']")),
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "input[autocomplete='one-time-code']")),
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "input[inputmode='numeric']")),
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "input[type='tel']")),
-                EC.visibility_of_element_located((By.CSS_SELECTOR, "form[name='OneTimeCodeViewForm'] input[type='text']")),
-            ))
+            _, otpField = waitForScreen(custom_wait, OTP_INPUT_SCREENS)
+        return otpField
 
     def _submit_otp(self) -> None:
-        for by, selector in (
-            (By.ID, "idSubmit_SAOTCC_Continue"),
-            (By.ID, "idSIButton9"),
-            (By.CSS_SELECTOR, "[data-testid='primaryButton']"),
-            (By.XPATH, "//button[contains(., 'Verify') or contains(., 'Next')]"),
-            (By.XPATH, "//input[@value='Verify' or @value='Next']"),
-            (By.CSS_SELECTOR, "button[type='submit']"),
-            (By.CSS_SELECTOR, "input[type='submit']"),
-        ):
-            try:
-                self.utils.waitUntilClickable(by, selector, 3).click()
-                return
-            except TimeoutException:
-                continue
-        raise TimeoutException("[LOGIN] Could not find OTP submit button.")
-
-    def _find_first_visible(self, selectors):
-        for by, selector in selectors:
-            elements = self.webdriver.find_elements(by, selector)
-            for element in elements:
-                try:
-                    if element.is_displayed():
-                        return element
-                except Exception:
-                    continue
-        return None
+        try:
+            _, submitButton = waitForScreen(
+                WebDriverWait(self.webdriver, 10), OTP_SUBMIT_SCREENS, clickable=True
+            )
+        except TimeoutException:
+            raise TimeoutException("[LOGIN] Could not find OTP submit button.")
+        submitButton.click()
 
     def _handle_post_login_dialogs(self, wait) -> None:
         self.check_locked_user()
@@ -429,9 +450,7 @@ class Login:
 
         for _ in range(5):
             try:
-                self.utils.waitUntilVisible(
-                    By.CSS_SELECTOR, 'html[data-role-name="RewardsPortal"]', 5
-                )
+                self.utils.waitUntilVisible(*REWARDS_PORTAL, 5)
                 return
             except TimeoutException:
                 pass
@@ -440,7 +459,7 @@ class Login:
             page_text = self.webdriver.page_source
             if "HTTP ERROR" in page_text or "ERR_TIMED_OUT" in page_text or "isn't working" in page_text:
                 logging.warning(f"[LOGIN] Error page detected (URL: {self.webdriver.current_url}). Retrying navigation...")
-                self.webdriver.get("https://rewards.bing.com/")
+                self.utils.navigate(REWARDS_URL, elementOrLoaded(REWARDS_PORTAL))
                 continue
 
             # "Is your security info still accurate?" dialog (old form, uses element IDs)
@@ -471,7 +490,7 @@ class Login:
                 except TimeoutException:
                     pass
                 logging.warning("[LOGIN] Could not dismiss passkey dialog, navigating away...")
-                self.webdriver.get("https://rewards.bing.com/")
+                self.utils.navigate(REWARDS_URL, elementOrLoaded(REWARDS_PORTAL))
                 continue
 
             # "Keep me signed in" form (old login form)
@@ -502,6 +521,4 @@ class Login:
             print("Account protection detected, handle prompts and press enter when on rewards page")
             input()
 
-        self.utils.waitUntilVisible(
-            By.CSS_SELECTOR, 'html[data-role-name="RewardsPortal"]'
-        )
+        self.utils.waitUntilVisible(*REWARDS_PORTAL)
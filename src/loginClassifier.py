@@ -0,0 +1,180 @@
+from typing import NamedTuple
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.wait import WebDriverWait
+
+
+class LoginScreen(NamedTuple):
+    """
+    Signature of a login screen. The screen is recognized if the URL contains one of
+    `urls`, if one of `selectors` (CSS) or `xpaths` matches a visible element, or if the
+    page HTML contains one of `texts`.
+    """
+
+    state: str
+    selectors: tuple[str, ...] = ()
+    xpaths: tuple[str, ...] = ()
+    urls: tuple[str, ...] = ()
+    texts: tuple[str, ...] = ()
+
+
+OTP_INPUT_SELECTORS = (
+    "input[name='otc']",
+    "#idTxtBx_SAOTCC_OTC",
+    "input[id*='SAOTCC']",
+    "input[id*='OTC']",
+    "input[aria-label='Code']",
+    "input[placeholder='Code']",
+    "input[autocomplete='one-time-code']",
+    "input[inputmode='numeric']",
+    "input[type='tel']",
+)
+
+OTHER_WAYS_TO_SIGN_IN_XPATH = (
+    "//button[contains(., 'Other ways to sign in') or contains(., 'other ways to sign in')]"
+)
+
+# Screens that can follow the password submission, by order of precedence
+POST_PASSWORD_SCREENS = (
+    LoginScreen(
+        "totp", selectors=("[name='OneTimeCodeViewForm']", *OTP_INPUT_SELECTORS)
+    ),
+    LoginScreen("other_ways", xpaths=(OTHER_WAYS_TO_SIGN_IN_XPATH,)),
+    LoginScreen(
+        "post_login",
+        urls=("passkey/enroll",),
+        selectors=(
+            "[name='kmsiForm']",
+            "#iPageTitle",
+            'html[data-role-name="RewardsPortal"]',
+        ),
+    ),
+    LoginScreen(
+        "password_required",
+        texts=(
+            'sErrorCode":"80041032',
+            "Please enter the password for your Microsoft account.",
+        ),
+    ),
+)
+
+# State of the session once on the rewards page, checked in a single page visit
+SESSION_SCREENS = (
+    LoginScreen("locked", selectors=("#serviceAbuseLandingTitle",)),
+    LoginScreen("banned", selectors=("#fraudErrorBody",)),
+    LoginScreen(
+        "logged_out",
+        urls=(
+            "login.live.com",
+            "login.microsoftonline.com",
+            "rewards.bing.com/welcome",
+        ),
+    ),
+    LoginScreen("logged_in", selectors=('html[data-role-name="RewardsPortal"]',)),
+)
+
+OTP_INPUT_SCREENS = (
+    LoginScreen(
+        "otp_input",
+        selectors=(
+            *OTP_INPUT_SELECTORS,
+            "form[name='OneTimeCodeViewForm'] input[type='text']",
+        ),
+    ),
+)
+
+OTP_SUBMIT_SCREENS = (
+    LoginScreen(
+        "otp_submit",
+        selectors=("#idSubmit_SAOTCC_Continue", "#idSIButton9", "[data-testid='primaryButton']"),
+        xpaths=(
+            "//button[contains(., 'Verify') or contains(., 'Next')]",
+            "//input[@value='Verify' or @value='Next']",
+        ),
+    ),
+    LoginScreen(
+        "otp_submit", selectors=("button[type='submit']", "input[type='submit']")
+    ),
+)
+
+CLASSIFY_SCRIPT = """
+const [screens, clickable] = arguments;
+const isUsable = (element) => {
+    const visible = element.checkVisibility
+        ? element.checkVisibility({checkOpacity: true, checkVisibilityCSS: true})
+        : element.getClientRects().length > 0;
+    return visible && !(clickable && element.disabled);
+};
+const findByXPath = (xpath) => {
+    const result = document.evaluate(
+        xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    const elements = [];
+    for (let i = 0; i < result.snapshotLength; i++) {
+        elements.push(result.snapshotItem(i));
+    }
+    return elements;
+};
+let html = null;
+for (const screen of screens) {
+    if (screen.urls.some((url) => location.href.includes(url))) {
+        return [screen.state, null];
+    }
+    for (const selector of screen.selectors) {
+        const element = [...document.querySelectorAll(selector)].find(isUsable);
+        if (element) {
+            return [screen.state, element];
+        }
+    }
+    for (const xpath of screen.xpaths) {
+        const element = findByXPath(xpath).find(isUsable);
+        if (element) {
+            return [screen.state, element];
+        }
+    }
+    if (screen.texts.length) {
+        html = html ?? document.documentElement.outerHTML;
+        if (screen.texts.some((text) => html.includes(text))) {
+            return [screen.state, null];
+        }
+    }
+}
+return null;
+"""
+
+
+def classifyPage(
+    webdriver: WebDriver, screens: tuple[LoginScreen, ...], clickable: bool = False
+) -> tuple[str, WebElement | None] | None:
+    """
+    Evaluates all the screen signatures in a single script.
+
+    Args:
+        clickable: if True, disabled elements don't match.
+
+    Returns:
+        tuple[str, WebElement | None] | None: the state of the first recognized screen
+        and the element that matched, if any, or None if no screen was recognized.
+    """
+    result = webdriver.execute_script(
+        CLASSIFY_SCRIPT, [screen._asdict() for screen in screens], clickable
+    )
+    if not result:
+        return None
+    state, element = result
+    return state, element
+
+
+def waitForScreen(
+    wait: WebDriverWait, screens: tuple[LoginScreen, ...], clickable: bool = False
+) -> tuple[str, WebElement | None]:
+    """
+    Waits until one of the screens is recognized, with a single script per poll.
+
+    Raises:
+        TimeoutException: if no screen was recognized in time.
+    """
+    return wait.until(
+        lambda driver: classifyPage(driver, screens, clickable) or False
+    )
@@ -0,0 +1,101 @@
+import json
+import logging
+from typing import Callable
+
+from selenium.common import WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+
+PAGE_LOAD_STRATEGIES = ("eager", "normal")
+"""
+"eager" returns from a navigation at DOMContentLoaded, "normal" waits for the load
+event, i.e. for every subresource, third-party ones included
+"""
+
+ReadyCondition = Callable[[WebDriver], object]
+"""
+what a page needs to be used, waited for after an eager navigation
+"""
+
+
+def dashboardLoaded(webdriver: WebDriver) -> bool:
+    return webdriver.execute_script("return typeof dashboard !== 'undefined'")
+
+
+def documentLoaded(webdriver: WebDriver) -> bool:
+    return webdriver.execute_script("return document.readyState") == "complete"
+
+
+def elementOrLoaded(locator: tuple[str, str]) -> ReadyCondition:
+    """
+    Returns:
+        ReadyCondition: ready once the element is there, or once the page is loaded
+        without it, for the pages that may not have it.
+    """
+    return expected_conditions.any_of(
+        expected_conditions.presence_of_element_located(locator), documentLoaded
+    )
+
+
+SEARCH_BOX_READY: ReadyCondition = expected_conditions.presence_of_element_located(
+    (By.ID, "sb_form_q")
+)
+SEARCH_RESULTS_READY: ReadyCondition = expected_conditions.presence_of_element_located(
+    (By.ID, "b_results")
+)
+
+
+PERFORMANCE_LOG_PREFS = {"enableNetwork": False, "enablePage": True}
+"""
+the Chrome performance log with the page events only, read by `lifecycleTimings`
+"""
+
+
+def enableLifecycleEvents(webdriver: WebDriver) -> bool:
+    """
+    Makes Chrome send `Page.lifecycleEvent` to the performance log.
+
+    Returns:
+        bool: False if the browser doesn't support it.
+    """
+    try:
+        webdriver.execute_cdp_cmd("Page.enable", {})
+        webdriver.execute_cdp_cmd("Page.setLifecycleEventsEnabled", {"enabled": True})
+    except WebDriverException:
+        logging.debug("[NAVIGATION] Lifecycle events not available", exc_info=True)
+        return False
+    return True
+
+
+def lifecycleTimings(webdriver: WebDriver) -> dict[str, float]:
+    """
+    Reads the lifecycle events logged since the last call, which clears them.
+
+    Returns:
+        dict[str, float]: the seconds from the start of the last navigation of the top
+        frame to each of its events, like "DOMContentLoaded", "load" or
+        "networkAlmostIdle".
+    """
+    try:
+        topFrame = webdriver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]
+        entries = webdriver.get_log("performance")
+    except WebDriverException:
+        return {}
+    events = []
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        if message["method"] != "Page.lifecycleEvent":
+            continue
+        params = message["params"]
+        if params["frameId"] == topFrame["frame"]["id"]:
+            events.append(params)
+    if not events:
+        return {}
+    loaderId = events[-1]["loaderId"]
+    events = [event for event in events if event["loaderId"] == loaderId]
+    start = next(
+        (event["timestamp"] for event in events if event["name"] == "init"),
+        events[0]["timestamp"],
+    )
+    return {event["name"]: round(event["timestamp"] - start, 3) for event in events}
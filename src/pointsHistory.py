@@ -0,0 +1,200 @@
+import contextlib
+import json
+import math
+import sqlite3
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS points (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account TEXT NOT NULL,
+    date TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    balance INTEGER NOT NULL,
+    delta INTEGER NOT NULL,
+    goal INTEGER
+);
+CREATE INDEX IF NOT EXISTS points_by_account ON points (account, id);
+CREATE INDEX IF NOT EXISTS points_by_account_date ON points (account, date);
+"""
+
+
+class DailyDelta(NamedTuple):
+    """
+    Points earned by an account on a given day, and its balance at the end of the day.
+    """
+
+    date: date
+    delta: int
+    balance: int
+
+
+class GoalEta(NamedTuple):
+    """
+    Estimation of when an account will reach its redeem goal.
+    """
+
+    goal: int
+    remaining: int
+    averageDailyDelta: float
+    days: int | None
+    """
+    None if the account isn't earning points
+    """
+
+
+class PointsHistory:
+    """
+    Append-only history of the points balance of each account, stored in SQLite.
+
+    Each run appends one row per account with its balance and the difference with the
+    last known balance. Every write is a single transaction, so an interrupted run
+    never leaves a partially written history.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @contextlib.contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            connection.executescript(SCHEMA)
+            yield connection
+        finally:
+            connection.close()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def record(self, account: str, balance: int, goal: int | None = None) -> int:
+        """
+        Appends the current balance of the account.
+
+        Returns:
+            int: The difference with the last known balance, 0 for a new account.
+        """
+        with self.transaction() as connection:
+            last = self._lastBalance(connection, account)
+            delta = 0 if last is None else balance - last
+            now = datetime.now()
+            connection.execute(
+                "INSERT INTO points (account, date, recorded_at, balance, delta, goal)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    account,
+                    now.date().isoformat(),
+                    now.isoformat(timespec="seconds"),
+                    balance,
+                    delta,
+                    goal,
+                ),
+            )
+        return delta
+
+    def lastBalance(self, account: str) -> int | None:
+        with self.connect() as connection:
+            return self._lastBalance(connection, account)
+
+    @staticmethod
+    def _lastBalance(connection: sqlite3.Connection, account: str) -> int | None:
+        row = connection.execute(
+            "SELECT balance FROM points WHERE account = ? ORDER BY id DESC LIMIT 1",
+            (account,),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def lastGoal(self, account: str) -> int | None:
+        with self.connect() as connection:
+            row = connection.execute(
+                "SELECT goal FROM points WHERE account = ? AND goal IS NOT NULL"
+                " ORDER BY id DESC LIMIT 1",
+                (account,),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def accounts(self) -> list[str]:
+        with self.connect() as connection:
+            return [
+                row[0]
+                for row in connection.execute(
+                    "SELECT DISTINCT account FROM points ORDER BY account"
+                )
+            ]
+
+    def dailyDeltas(self, account: str, days: int = 30) -> list[DailyDelta]:
+        """
+        Returns the points earned each day over the last `days` days, oldest first.
+        """
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        with self.connect() as connection:
+            # SQLite takes the bare `balance` column from the row matching MAX(id)
+            rows = connection.execute(
+                "SELECT date, SUM(delta), balance, MAX(id) FROM points"
+                " WHERE account = ? AND date >= ? GROUP BY date ORDER BY date",
+                (account, since),
+            ).fetchall()
+        return [
+            DailyDelta(date.fromisoformat(day), delta, balance)
+            for day, delta, balance, _ in rows
+        ]
+
+    def goalEta(self, account: str, days: int = 30) -> GoalEta | None:
+        """
+        Estimates when the account will reach its goal, based on the average points
+        earned per day over the last `days` days.
+
+        Returns:
+            GoalEta | None: None if the account has no known balance or goal.
+        """
+        balance = self.lastBalance(account)
+        goal = self.lastGoal(account)
+        if balance is None or not goal:
+            return None
+        deltas = self.dailyDeltas(account, days)
+        average = sum(delta.delta for delta in deltas) / len(deltas) if deltas else 0
+        remaining = max(goal - balance, 0)
+        if remaining == 0:
+            etaDays = 0
+        elif average > 0:
+            etaDays = math.ceil(remaining / average)
+        else:
+            etaDays = None
+        return GoalEta(goal, remaining, average, etaDays)
+
+    def importPreviousPointsData(self, path: Path) -> None:
+        """
+        Seeds the history with the last balances saved by older versions in
+        `previous_points_data.json`, then renames the file so it's only imported once.
+        """
+        if not path.is_file():
+            return
+        with open(path, encoding="utf-8") as file:
+            previousPointsData: dict[str, int] = json.load(file)
+        recordedAt = datetime.fromtimestamp(path.stat().st_mtime)
+        with self.transaction() as connection:
+            for account, balance in previousPointsData.items():
+                if self._lastBalance(connection, account) is not None:
+                    continue
+                connection.execute(
+                    "INSERT INTO points (account, date, recorded_at, balance, delta)"
+                    " VALUES (?, ?, ?, ?, 0)",
+                    (
+                        account,
+                        recordedAt.date().isoformat(),
+                        recordedAt.isoformat(timespec="seconds"),
+                        balance,
+                    ),
+                )
+        path.replace(path.with_name(path.name + ".bak"))
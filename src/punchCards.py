@@ -1,12 +1,20 @@
 import logging
 import random
 import time
-import urllib.parse
 
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
 
 from src.browser import Browser
-from .constants import REWARDS_URL
+from .dashboard import Promotion, PunchCard
+from .eligibility import isIncomplete, isPromotionalItemDoable
+from .navigation import documentLoaded, elementOrLoaded
+from .runCheckpoint import RunCheckpoint
+
+OFFER_CTA = (By.XPATH, "//a[@class='offer-cta']")
+# A punch card without anything left to do has no link
+OFFER_CTA_READY = elementOrLoaded(OFFER_CTA)
+PROMO_ITEM = (By.XPATH, '//*[@id="promo-item"]/section/div/div/div/span')
 
 
 class PunchCards:
@@ -14,39 +22,41 @@ class PunchCards:
     Class to handle punch cards in MS Rewards.
     """
 
-    def __init__(self, browser: Browser):
+    def __init__(self, browser: Browser, checkpoint: RunCheckpoint | None = None):
         self.browser = browser
         self.webdriver = browser.webdriver
+        self.checkpoint = checkpoint
 
     def _visit_offer_cta(self):
         """For urlreward: extract href and navigate directly in the same tab,
         then navigate back. Avoids new-tab issues."""
-        link = self.webdriver.find_element(By.XPATH, "//a[@class='offer-cta']")
+        link = self.browser.utils.waitUntilVisible(*OFFER_CTA)
         href = link.get_attribute("href")
         if href:
             current_url = self.webdriver.current_url
-            self.webdriver.get(href)
+            # The visit is credited by the scripts of the page
+            self.browser.utils.navigate(href, documentLoaded)
             time.sleep(random.randint(3, 5))
-            self.webdriver.get(current_url)
+            self.browser.utils.navigate(current_url, OFFER_CTA_READY)
         else:
             self.webdriver.execute_script("arguments[0].scrollIntoView({block: 'center'});", link)
             link.click()
 
     def _click_offer_cta_new_tab(self):
         """For quiz: scroll CTA into view, force target=_blank, then click."""
-        link = self.webdriver.find_element(By.XPATH, "//a[@class='offer-cta']")
+        link = self.browser.utils.waitUntilVisible(*OFFER_CTA)
         self.webdriver.execute_script("arguments[0].scrollIntoView({block: 'center'});", link)
         self.webdriver.execute_script("arguments[0].setAttribute('target', '_blank');", link)
         link.click()
 
-    def completePunchCard(self, url: str, childPromotions: dict):
+    def completePunchCard(self, url: str, childPromotions: tuple[Promotion, ...]):
         # Function to complete a specific punch card
-        self.webdriver.get(url)
+        self.browser.utils.navigate(url, OFFER_CTA_READY)
         for child in childPromotions:
-            if child["complete"] is False:
-                if child["promotionType"] == "urlreward":
+            if child.complete is False:
+                if child.promotionType == "urlreward":
                     self._visit_offer_cta()
-                if child["promotionType"] == "quiz":
+                if child.promotionType == "quiz":
                     self._click_offer_cta_new_tab()
                     self.browser.utils.switchToNewTab()
                     counter = str(
@@ -73,55 +83,57 @@ class PunchCards:
                         time.sleep(random.randint(100, 700) / 100)
                     time.sleep(random.randint(100, 700) / 100)
 
-    def completePunchCards(self):
-        # Function to complete all punch cards
+    def completePunchCards(
+        self, items: list[PunchCard | Promotion | None] | None = None
+    ) -> bool:
+        """
+        Args:
+            items: the punch cards and promotional item to do, from a snapshot of the
+            dashboard, all the ones of the dashboard by default.
+
+        Returns:
+            bool: False if a punch card failed, True otherwise.
+        """
         logging.info("[PUNCH CARDS] " + "Trying to complete the Punch Cards...")
-        self.completePromotionalItems()
-        punchCards = self.browser.utils.getDashboardData()["punchCards"]
-        self.browser.utils.goToRewards()
-        for punchCard in punchCards:
+        if items is None:
+            dashboard = self.browser.utils.getDashboardData(
+                "punchCards", "promotionalItem"
+            )
+            items = [dashboard.promotionalItem, *dashboard.punchCards]
+        for item in items:
+            if not isinstance(item, PunchCard):
+                self.completePromotionalItems(item)
+        completed = True
+        punchCards = [item for item in items if isinstance(item, PunchCard)]
+        for punchCard in filter(isIncomplete, punchCards):
+            parentPromotion = punchCard.parentPromotion
+            if self.checkpoint and self.checkpoint.isActivityDone(parentPromotion):
+                logging.debug("[PUNCH CARDS] Already done in an earlier run today")
+                continue
             try:
-                if (
-                    punchCard["parentPromotion"]
-                    and punchCard["childPromotions"]
-                    and not punchCard["parentPromotion"]["complete"]
-                    and punchCard["parentPromotion"]["pointProgressMax"] != 0
-                ):
-                    # Complete each punch card
-                    self.completePunchCard(
-                        punchCard["parentPromotion"]["attributes"]["destination"],
-                        punchCard["childPromotions"],
-                    )
+                # Complete each punch card
+                self.completePunchCard(
+                    parentPromotion.destination, punchCard.childPromotions
+                )
+                if self.checkpoint:
+                    self.checkpoint.markActivityDone(parentPromotion)
             except Exception:
                 logging.error("[PUNCH CARDS] Error Punch Cards", exc_info=True)
                 self.browser.utils.resetTabs()
-                continue
+                completed = False
         logging.info("[PUNCH CARDS] Exiting")
+        return completed
 
-    def completePromotionalItems(self):
+    def completePromotionalItems(self, item: Promotion | None):
         # Function to complete promotional items
         try:
-            item = self.browser.utils.getDashboardData()["promotionalItem"]
-            if item is None:
+            if not isPromotionalItemDoable(item):
                 return
-            self.browser.utils.goToRewards()
-            destUrl = urllib.parse.urlparse(item["destinationUrl"])
-            baseUrl = urllib.parse.urlparse(REWARDS_URL)
-            if (
-                (item["pointProgressMax"] in [100, 200, 500])
-                and not item["complete"]
-                and (
-                    (
-                        destUrl.hostname == baseUrl.hostname
-                        and destUrl.path == baseUrl.path
-                    )
-                    or destUrl.hostname == "www.bing.com"
-                )
-            ):
-                # Click on promotional item and visit new tab
-                self.webdriver.find_element(
-                    By.XPATH, '//*[@id="promo-item"]/section/div/div/div/span'
-                ).click()
-                self.browser.utils.switchToNewTab(True)
+            self.browser.utils.goToRewards(
+                expected_conditions.element_to_be_clickable(PROMO_ITEM)
+            )
+            # Click on promotional item and visit new tab
+            self.webdriver.find_element(*PROMO_ITEM).click()
+            self.browser.utils.switchToNewTab(True)
         except Exception:
             logging.debug("", exc_info=True)
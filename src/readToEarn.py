@@ -2,12 +2,20 @@ import logging
 import random
 import secrets
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
 
+import requests
+from oauthlib.oauth2 import OAuth2Error
 from requests_oauthlib import OAuth2Session
+from selenium.common import TimeoutException
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.wait import WebDriverWait
 
 from src.browser import Browser
 from .activities import Activities
-from .utils import makeRequestsSession, cooldown
+from .tokenCache import isFresh
+from .utils import RUN_REPORT, makeRequestsSession, cooldown, getTokenCache
 
 # todo Use constant naming style
 client_id = "0000000040170455"
@@ -15,6 +23,28 @@ authorization_base_url = "https://login.live.com/oauth20_authorize.srf"
 token_url = "https://login.microsoftonline.com/consumers/oauth2/v2.0/token"
 redirect_uri = " https://login.live.com/oauth20_desktop.srf"
 scope = ["service::prod.rewardsplatform.microsoft.com::MBI_SSL"]
+ACTIVITIES_URL = "https://prod.rewardsplatform.microsoft.com/dapi/me/activities"
+
+
+def mobileAppSession(
+    token: dict | None = None, tokenUpdater: Callable[[dict], None] = lambda _: None
+) -> OAuth2Session:
+    """
+    Returns:
+        OAuth2Session: a session of the mobile app refreshing its token when it
+        expires, e.g. between two articles, and passing it to `tokenUpdater`.
+    """
+    return makeRequestsSession(
+        OAuth2Session(
+            client_id,
+            scope=scope,
+            redirect_uri=redirect_uri,
+            token=token,
+            auto_refresh_url=token_url,
+            auto_refresh_kwargs={"client_id": client_id},
+            token_updater=tokenUpdater,
+        )
+    )
 
 
 class ReadToEarn:
@@ -28,36 +58,108 @@ class ReadToEarn:
         self.activities = Activities(browser)
 
     def completeReadToEarn(self):
-
+        self.readArticles(self.login())
+
+    def startReadToEarn(self) -> Future[None]:
+        """
+        Logs in the mobile app with the browser, then reads the articles on a worker
+        thread, so that the browser can go on with other phases meanwhile.
+
+        Returns:
+            Future[None]: the reading of the articles, to join before reading the points.
+        """
+        mobileApp = self.login()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ReadToEarn")
+        reading = executor.submit(self.readArticles, mobileApp, background=True)
+        executor.shutdown(wait=False)
+        self.browser.backgroundEarning = reading
+        return reading
+
+    def login(self) -> OAuth2Session:
+        """
+        Uses the cached token of the account, refreshed if needed, and logs in the
+        mobile app with the browser only if there's none or it can't be refreshed.
+
+        Returns:
+            OAuth2Session: a session of the mobile app with its token, which needs no
+            browser afterward.
+        """
         logging.info("[READ TO EARN] " + "Trying to complete Read to Earn...")
 
+        tokenCache = getTokenCache()
+        token = tokenCache.load(self.browser.email) if tokenCache else None
+
+        def saveToken(refreshedToken: dict) -> None:
+            if tokenCache:
+                tokenCache.save(self.browser.email, refreshedToken)
+
+        mobileApp = self.refreshedSession(token, saveToken) if token else None
+        if mobileApp is None:
+            mobileApp = self.browserLogin(saveToken)
+        saveToken(mobileApp.token)
+        return mobileApp
+
+    @staticmethod
+    def refreshedSession(
+        token: dict, tokenUpdater: Callable[[dict], None] = lambda _: None
+    ) -> OAuth2Session | None:
+        """
+        Returns:
+            OAuth2Session | None: a session with the token, refreshed if it expires
+            soon, None if it couldn't be refreshed.
+        """
+        mobileApp = mobileAppSession(token, tokenUpdater)
+        if isFresh(token):
+            logging.info("[READ TO EARN] Using the cached token")
+            return mobileApp
+        if not token.get("refresh_token"):
+            return None
+        try:
+            mobileApp.refresh_token(
+                token_url, refresh_token=token["refresh_token"], client_id=client_id
+            )
+        except (OAuth2Error, requests.RequestException):
+            logging.warning(
+                "[READ TO EARN] Could not refresh the cached token, logging in again",
+                exc_info=True,
+            )
+            return None
+        logging.info("[READ TO EARN] Refreshed the cached token")
+        return mobileApp
+
+    def browserLogin(
+        self, tokenUpdater: Callable[[dict], None] = lambda _: None
+    ) -> OAuth2Session:
         accountName = self.browser.email
-        mobileApp = makeRequestsSession(
-            OAuth2Session(client_id, scope=scope, redirect_uri=redirect_uri)
-        )
+        mobileApp = mobileAppSession(tokenUpdater=tokenUpdater)
         authorization_url = mobileApp.authorization_url(
             authorization_base_url, access_type="offline_access", login_hint=accountName
         )[0]
 
         # Get Referer URL from webdriver
         self.webdriver.get(authorization_url)
-        count = 0
-        while True:
-            logging.info("[READ TO EARN] Waiting for Login")
-            if self.webdriver.current_url.startswith(
-                "https://login.live.com/oauth20_desktop.srf?code="
-            ):
-                redirect_response = self.webdriver.current_url
-                break
-            time.sleep(1)
-            count += 1
-            if count >= 10:
-                raise Exception("Stuck in waiting for login")
+        logging.info("[READ TO EARN] Waiting for Login")
+        try:
+            WebDriverWait(self.webdriver, 10, poll_frequency=0.1).until(
+                expected_conditions.url_contains("oauth20_desktop.srf?code=")
+            )
+        except TimeoutException as e:
+            raise Exception("Stuck in waiting for login") from e
+        redirect_response = self.webdriver.current_url
 
         logging.info("[READ TO EARN] Logged-in successfully !")
-        token = mobileApp.fetch_token(
+        mobileApp.fetch_token(
             token_url, authorization_response=redirect_response, include_client_id=True
         )
+        return mobileApp
+
+    def readArticles(self, mobileApp: OAuth2Session, background: bool = False) -> None:
+        """
+        Does the daily check-in and reads the articles, with HTTP requests only.
+
+        Args:
+            background: whether it runs on a worker thread, see `cooldown`.
+        """
         # Do Daily Check in
         json_data = {
             "amount": 1,
@@ -70,10 +172,10 @@ class ReadToEarn:
         }
         logging.info("[READ TO EARN] Daily App Check In")
         r = mobileApp.post(
-            "https://prod.rewardsplatform.microsoft.com/dapi/me/activities",
+            ACTIVITIES_URL,
             json=json_data,
         )
-        balance = r.json().get("response").get("balance")
+        balance = startBalance = r.json().get("response").get("balance")
         time.sleep(random.randint(10, 20))
 
         # json data to confirm an article is read
@@ -92,7 +194,7 @@ class ReadToEarn:
             # Replace ID with a random value so get credit for a new article
             json_data["id"] = secrets.token_hex(64)
             r = mobileApp.post(
-                "https://prod.rewardsplatform.microsoft.com/dapi/me/activities",
+                ACTIVITIES_URL,
                 json=json_data,
             )
             newbalance = r.json().get("response").get("balance")
@@ -103,6 +205,11 @@ class ReadToEarn:
 
             logging.info("[READ TO EARN] Read Article " + str(i + 1))
             balance = newbalance
-            cooldown()
+            cooldown(background)
 
-        logging.info("[READ TO EARN] Completed the Read to Earn successfully !")
+        # The account balance read by the browser also grows with the searches meanwhile
+        RUN_REPORT.account(self.browser.email).readToEarnPoints = balance - startBalance
+        logging.info(
+            f"[READ TO EARN] Completed the Read to Earn successfully, {balance - startBalance}"
+            " points !"
+        )
@@ -0,0 +1,100 @@
+import logging
+import queue
+import threading
+from typing import Any, Callable
+
+from apprise import Apprise
+
+
+class Reporter:
+    """
+    Runs post-run reporting work (notifications, points history writes, ...) on a
+    background thread, so that the bot doesn't wait on it between accounts.
+
+    Jobs are executed one at a time, in submission order. Notifications are batched and
+    sent as a single digest when the reporter is flushed.
+    """
+
+    def __init__(self, apprise: Apprise, timeout: float = 30):
+        self.apprise = apprise
+        self.timeout = timeout
+        self._queue: queue.Queue[Callable[[], Any]] = queue.Queue()
+        self._notifications: list[tuple[str, str]] = []
+        self._worker: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, job: Callable[..., Any], *args, **kwargs) -> None:
+        """
+        Queues a job to be executed by the background worker.
+        """
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._work, name="Reporter", daemon=True
+                )
+                self._worker.start()
+        self._queue.put(lambda: job(*args, **kwargs))
+
+    def notify(self, body: str, title: str) -> None:
+        """
+        Queues a notification, sent with the next digest.
+        """
+        self.submit(self._notifications.append, (title, body))
+
+    def flush(self) -> bool:
+        """
+        Waits for the queued jobs to be done, then sends the notifications digest.
+
+        Returns:
+            bool: False if the queue could not be flushed in time.
+        """
+        with self._lock:
+            if self._worker is None and self._queue.empty():
+                # Nothing was submitted, no worker to start, even at interpreter shutdown
+                return True
+        flushed = threading.Event()
+        self.submit(self._sendDigest)
+        self.submit(flushed.set)
+        if not flushed.wait(self.timeout * 2):
+            logging.warning(
+                f"[REPORTING] Reporting queue not flushed after {self.timeout * 2} seconds"
+            )
+            return False
+        return True
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                job()
+            except Exception:
+                logging.error("[REPORTING] Error executing reporting job", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    def _sendDigest(self) -> None:
+        notifications, self._notifications = self._notifications, []
+        if not notifications:
+            return
+        if len(notifications) == 1:
+            title, body = notifications[0]
+        else:
+            title = f"MS Rewards Farmer: {len(notifications)} notifications"
+            body = "\n\n".join(
+                f"{noteTitle}\n{noteBody}" for noteTitle, noteBody in notifications
+            )
+
+        # Apprise has no global timeout, so the delivery gets its own thread
+        delivery = threading.Thread(
+            target=self.apprise.notify,
+            args=(body, title),
+            name="ReporterDelivery",
+            daemon=True,
+        )
+        delivery.start()
+        delivery.join(self.timeout)
+        if delivery.is_alive():
+            logging.warning(
+                f"[REPORTING] Notification not delivered after {self.timeout} seconds,"
+                f" giving up"
+            )
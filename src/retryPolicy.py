@@ -0,0 +1,238 @@
+import contextlib
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Any, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class RetriesStrategy(Enum):
+    """
+    method to use when retrying
+    """
+
+    EXPONENTIAL = auto()
+    """
+    an exponentially increasing `backoff-factor` between attempts
+    """
+    CONSTANT = auto()
+    """
+    the default; a constant `backoff-factor` between attempts
+    """
+
+
+class Jitter(Enum):
+    """
+    randomization of the delay between attempts
+    """
+
+    NONE = auto()
+    """
+    the exact delay of the strategy
+    """
+    ADDITIVE = auto()
+    """
+    the default; up to one `backoff-factor` added to the delay of the strategy
+    """
+    FULL = auto()
+    """
+    a random delay between zero and the delay of the strategy
+    """
+
+
+@dataclass
+class RetryMetrics:
+    """
+    What the retries of an operation cost over the run.
+    """
+
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    exhausted: int = 0
+    """
+    the calls that failed after their last allowed attempt
+    """
+    sleptSeconds: float = 0.0
+
+
+_metricsLock = threading.Lock()
+METRICS: dict[str, RetryMetrics] = {}
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def retryBudget(seconds: float | None) -> Iterator[None]:
+    """
+    Caps the time all the retrying operations in this block can sleep between their
+    attempts, in this thread. The rest of the block, like the cooldowns between
+    searches, isn't counted. A nested budget can't extend the budget of the enclosing
+    block, and what it spends is charged to it.
+    """
+    if seconds is None:
+        yield
+        return
+    previous = getattr(_local, "budgetLeft", None)
+    start = _local.budgetLeft = seconds if previous is None else min(previous, seconds)
+    try:
+        yield
+    finally:
+        if previous is not None:
+            previous -= start - _local.budgetLeft
+        _local.budgetLeft = previous
+
+
+def isRetrying() -> bool:
+    """
+    Whether the current thread is already in an operation run by a `RetryPolicy`.
+    """
+    return getattr(_local, "depth", 0) > 0
+
+
+class RetryPolicy:
+    """
+    Runs an operation until it succeeds, sleeping between attempts, within a number of
+    attempts, a deadline for the operation and the sleep budget of the enclosing
+    `retryBudget` block, if any.
+
+    Only the outermost policy retries: an operation run by a policy inside another
+    policy's operation gets a single attempt, so failures aren't retried at several
+    layers at once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxRetries: int,
+        backoffFactor: float,
+        strategy: RetriesStrategy = RetriesStrategy.EXPONENTIAL,
+        jitter: Jitter = Jitter.ADDITIVE,
+        deadline: float | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            maxRetries: the number of attempts after the first one.
+            deadline: the maximal time, in seconds, the operation can take with its
+            retries.
+        """
+        self.name = name
+        self.maxRetries = maxRetries
+        self.backoffFactor = backoffFactor
+        self.strategy = strategy
+        self.jitter = jitter
+        self.deadline = deadline
+        self.sleep = sleep
+
+    def delay(self, retry: int) -> float:
+        """
+        Returns:
+            float: the delay, in seconds, before the given retry, starting from 1.
+        """
+        if self.strategy == RetriesStrategy.EXPONENTIAL:
+            delay = self.backoffFactor * 2 ** (retry - 1)
+        elif self.strategy == RetriesStrategy.CONSTANT:
+            delay = self.backoffFactor
+        else:
+            raise AssertionError
+        if self.jitter == Jitter.ADDITIVE:
+            delay += self.backoffFactor * random.random()
+        elif self.jitter == Jitter.FULL:
+            delay *= random.random()
+        return delay
+
+    def run(
+        self,
+        operation: Callable[[int], T],
+        retryOn: tuple[type[BaseException], ...] = (),
+        isSuccess: Callable[[T], bool] | None = None,
+    ) -> T:
+        """
+        Calls `operation` with the attempt number, starting from 0, until it returns a
+        successful result.
+
+        Args:
+            retryOn: the exceptions after which the operation is retried, others are
+            raised immediately.
+            isSuccess: checks the result, any result is successful if not given.
+
+        Returns:
+            T: the first successful result, or the last result if it never succeeded.
+
+        Raises:
+            the last exception of `retryOn`, if the last attempt raised it.
+        """
+        metrics = self.metrics()
+        with _metricsLock:
+            metrics.calls += 1
+        nested = isRetrying()
+        maxRetries = 0 if nested else self.maxRetries
+        end = None if self.deadline is None else time.monotonic() + self.deadline
+
+        _local.depth = getattr(_local, "depth", 0) + 1
+        try:
+            attempt = 0
+            while True:
+                with _metricsLock:
+                    metrics.attempts += 1
+                try:
+                    result = operation(attempt)
+                except retryOn as e:
+                    failure: Any = e
+                else:
+                    if isSuccess is None or isSuccess(result):
+                        return result
+                    failure = None
+
+                attempt += 1
+                delay = self.delay(attempt)
+                budgetLeft = getattr(_local, "budgetLeft", None)
+                outOfTime = (end is not None and time.monotonic() + delay > end) or (
+                    budgetLeft is not None and delay > budgetLeft
+                )
+                if attempt > maxRetries or outOfTime:
+                    with _metricsLock:
+                        metrics.exhausted += 1
+                    if not nested:
+                        logging.info(
+                            f"[RETRY] {self.name} failed after {attempt} attempt(s)"
+                            + (", out of time" if outOfTime else "")
+                        )
+                    if failure is not None:
+                        raise failure
+                    return result
+
+                logging.info(
+                    f"[RETRY] {self.name} attempt {attempt}/{maxRetries + 1} failed"
+                    + (f" ({type(failure).__name__}: {failure})" if failure else "")
+                    + f", retrying in {round(delay)} seconds..."
+                )
+                with _metricsLock:
+                    metrics.retries += 1
+                    metrics.sleptSeconds += delay
+                if budgetLeft is not None:
+                    _local.budgetLeft = budgetLeft - delay
+                self.sleep(delay)
+        finally:
+            _local.depth -= 1
+
+    def metrics(self) -> RetryMetrics:
+        with _metricsLock:
+            return METRICS.setdefault(self.name, RetryMetrics())
+
+
+def retryMetricsReport() -> list[str]:
+    """
+    Describes the operations that had to be retried during the run.
+    """
+    with _metricsLock:
+        return [
+            f"{name}: {metrics.calls} call(s), {metrics.retries} retry(ies),"
+            f" {metrics.exhausted} gave up, slept {round(metrics.sleptSeconds)}s"
+            for name, metrics in sorted(METRICS.items())
+            if metrics.retries or metrics.exhausted
+        ]
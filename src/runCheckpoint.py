@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+from datetime import date
+from pathlib import Path
+
+from .dashboard import Dashboard, Promotion
+
+PHASES = (
+    "bonus-points",
+    "activities",
+    "punch-cards",
+    "desktop-searches",
+    "read-to-earn",
+    "mobile-searches",
+)
+
+
+class RunCheckpoint:
+    """
+    Progress of the run of an account for the day: the phases and the activities that
+    are done, so that a rerun skips them instead of visiting their pages again.
+
+    The checkpoint is saved after every change, and starts empty on a new day.
+    """
+
+    def __init__(self, path: Path, day: date | None = None):
+        self.path = path
+        self.day = (day or date.today()).isoformat()
+        self.phases: set[str] = set()
+        self.activities: set[str] = set()
+        try:
+            with open(path, encoding="utf-8") as file:
+                saved = json.load(file)
+            if saved.get("date") == self.day:
+                self.phases = set(saved.get("phases", ()))
+                self.activities = set(saved.get("activities", ()))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError, TypeError):
+            logging.warning(f"[CHECKPOINT] Ignoring unreadable checkpoint '{path}'")
+
+    @property
+    def resumed(self) -> bool:
+        """
+        Whether an earlier run of the day already made some progress.
+        """
+        return bool(self.phases or self.activities)
+
+    def isDone(self, phase: str) -> bool:
+        return phase in self.phases
+
+    def markDone(self, phase: str) -> None:
+        assert phase in PHASES, f"Unknown phase: {phase}"
+        self.phases.add(phase)
+        self.save()
+
+    def isActivityDone(self, activity: Promotion) -> bool:
+        return activity.id in self.activities
+
+    def markActivityDone(self, activity: Promotion) -> None:
+        self.activities.add(activity.id)
+        self.save()
+
+    def reconcile(self, dashboard: Dashboard) -> list[str]:
+        """
+        Forgets the progress that the dashboard contradicts: activities recorded as
+        done but still incomplete, with their phase, and search phases with searches
+        remaining.
+
+        Returns:
+            list[str]: the phases that have to be done again.
+        """
+        promotions = [
+            (promotion, "activities") for promotion in dashboard.activities
+        ] + [
+            (punchCard.parentPromotion, "punch-cards")
+            for punchCard in dashboard.punchCards
+            if punchCard.parentPromotion
+        ]
+        incomplete = {
+            promotion.id: phase
+            for promotion, phase in promotions
+            if not promotion.complete and promotion.pointProgressMax
+        }
+
+        redo: set[str] = set()
+        for activityId in self.activities & incomplete.keys():
+            self.activities.discard(activityId)
+            redo.add(incomplete[activityId])
+
+        counters = dashboard.userStatus.counters
+        for searches, phase in (
+            (counters.pcSearch, "desktop-searches"),
+            (counters.mobileSearch, "mobile-searches"),
+        ):
+            if not all(search.complete for search in searches):
+                redo.add(phase)
+
+        redo &= self.phases
+        self.phases -= redo
+        self.save()
+        return sorted(redo)
+
+    def save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporaryPath = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temporaryPath, "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "date": self.day,
+                        "phases": sorted(self.phases),
+                        "activities": sorted(self.activities),
+                    },
+                    file,
+                    indent=2,
+                )
+            os.replace(temporaryPath, self.path)
+        except OSError:
+            logging.warning(
+                f"[CHECKPOINT] Could not save the checkpoint to '{self.path}'",
+                exc_info=True,
+            )
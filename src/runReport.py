@@ -0,0 +1,248 @@
+import contextlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import psutil
+
+
+@dataclass
+class MemorySample:
+    """
+    Resident memory, in bytes, of the bot and of the Chrome process tree. Memory shared
+    between Chrome processes is counted once per process, so the Chrome figure is an
+    upper bound.
+    """
+
+    python: int
+    chrome: int
+
+    @property
+    def total(self) -> int:
+        return self.python + self.chrome
+
+    def toDict(self) -> dict[str, float]:
+        return {
+            "python": round(self.python / 1024 / 1024, 1),
+            "chrome": round(self.chrome / 1024 / 1024, 1),
+        }
+
+
+@dataclass
+class PhaseMemory:
+    """
+    Memory at the end of a phase, and at its peak among the samples taken during it.
+    """
+
+    end: MemorySample | None = None
+    peak: MemorySample | None = None
+
+    def add(self, sample: MemorySample) -> None:
+        self.end = sample
+        if self.peak is None or sample.total > self.peak.total:
+            self.peak = sample
+
+
+def processTreeMemory(pids: Iterable[int]) -> int:
+    processes: dict[int, psutil.Process] = {}
+    for pid in pids:
+        with contextlib.suppress(psutil.Error):
+            process = psutil.Process(pid)
+            processes[pid] = process
+            for child in process.children(recursive=True):
+                processes[child.pid] = child
+    memory = 0
+    for process in processes.values():
+        with contextlib.suppress(psutil.Error):
+            memory += process.memory_info().rss
+    return memory
+
+
+def sampleMemory(chromePids: Iterable[int]) -> MemorySample:
+    return MemorySample(
+        psutil.Process(os.getpid()).memory_info().rss, processTreeMemory(chromePids)
+    )
+
+
+class MemorySampler:
+    """
+    Samples the memory of the bot and of the Chrome process tree in the background
+    during each phase, when enabled.
+    """
+
+    def __init__(self, enabled: bool, interval: float = 5):
+        self.enabled = enabled
+        self.interval = interval
+
+    @contextlib.contextmanager
+    def sample(self, chromePids: Callable[[], Iterable[int]]) -> Iterator[PhaseMemory]:
+        """
+        Args:
+            chromePids: returns the pids of the roots of the Chrome process tree.
+        """
+        memory = PhaseMemory()
+        if not self.enabled:
+            yield memory
+            return
+
+        stopped = threading.Event()
+
+        def sampleUntilStopped() -> None:
+            while not stopped.wait(self.interval):
+                with contextlib.suppress(psutil.Error):
+                    memory.add(sampleMemory(chromePids()))
+
+        thread = threading.Thread(
+            target=sampleUntilStopped, name="memory-sampler", daemon=True
+        )
+        thread.start()
+        try:
+            yield memory
+        finally:
+            stopped.set()
+            thread.join()
+            with contextlib.suppress(psutil.Error):
+                memory.add(sampleMemory(chromePids()))
+
+
+@dataclass
+class PhaseReport:
+    name: str
+    status: str
+    """
+    "done", "incomplete", "skipped", "nothing to do", "deferred", "timed out" or
+    "failed", and "running" while it goes on in the background
+    """
+    seconds: float = 0.0
+    memory: PhaseMemory = field(default_factory=PhaseMemory)
+
+    def toDict(self) -> dict:
+        report = {"name": self.name, "status": self.status, "seconds": round(self.seconds, 1)}
+        if self.memory.end:
+            report["memory"] = self.memory.end.toDict()
+        if self.memory.peak:
+            report["peakMemory"] = self.memory.peak.toDict()
+        return report
+
+
+@dataclass
+class ActivityReport:
+    id: str
+    title: str
+    pointsGained: int
+    complete: bool
+
+
+@dataclass
+class SearchReport:
+    browserType: str
+    counted: int
+    """
+    the searches that earned points
+    """
+    points: int
+    """
+    the points the search counters gained, which unlike the balance leave out the
+    points earned in the background meanwhile, like Read to Earn
+    """
+    rewardsLoads: int
+    searchLoads: int
+
+    @property
+    def loadsPerSearch(self) -> float | None:
+        if not self.counted:
+            return None
+        return round((self.rewardsLoads + self.searchLoads) / self.counted, 2)
+
+
+@dataclass
+class AccountReport:
+    email: str
+    phases: list[PhaseReport] = field(default_factory=list)
+    recycles: int = 0
+    """
+    the browsers closed because the memory ceiling was exceeded
+    """
+    error: str | None = None
+    activities: list[ActivityReport] = field(default_factory=list)
+    """
+    the points gained by each activity done, from the dashboard before and after
+    """
+    searches: list[SearchReport] = field(default_factory=list)
+    readToEarnPoints: int = 0
+    """
+    the points of the articles read, from the balances of the mobile app
+    """
+    elementCache: dict[str, int] = field(default_factory=dict)
+    """
+    the element lookups of the browsers by outcome, see `Utils.cachedElement`
+    """
+    deferred: list[str] = field(default_factory=list)
+    """
+    the tasks left for a later run, out of the time budget
+    """
+
+    def toDict(self) -> dict:
+        """
+        Copies each collection at once before reading it, as the report is also saved
+        from the idle tasks while the run updates it, see `RunReport.save`.
+        """
+        return {
+            "email": self.email,
+            "phases": [phase.toDict() for phase in list(self.phases)],
+            "recycles": self.recycles,
+            "error": self.error,
+            "activities": [asdict(activity) for activity in list(self.activities)],
+            "searches": [
+                asdict(search) | {"loadsPerSearch": search.loadsPerSearch}
+                for search in list(self.searches)
+            ],
+            "readToEarnPoints": self.readToEarnPoints,
+            "elementCache": dict(self.elementCache),
+            "deferred": list(self.deferred),
+        }
+
+
+class RunReport:
+    """
+    What happened to each account during the run, saved as JSON at the end of the run.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.started = datetime.now()
+        self.accounts: dict[str, AccountReport] = {}
+        self._lock = threading.Lock()
+
+    def account(self, email: str) -> AccountReport:
+        return self.accounts.setdefault(email, AccountReport(email))
+
+    def toDict(self) -> dict:
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "finished": datetime.now().isoformat(timespec="seconds"),
+            "accounts": [
+                # Copied, as it's also saved from the idle tasks during the run
+                account.toDict()
+                for account in list(self.accounts.values())
+            ],
+        }
+
+    def save(self) -> None:
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporaryPath = self.path.with_suffix(f".{os.getpid()}.tmp")
+                with open(temporaryPath, "w", encoding="utf-8") as file:
+                    json.dump(self.toDict(), file, indent=2)
+                os.replace(temporaryPath, self.path)
+            except OSError:
+                logging.warning(
+                    f"[REPORT] Could not save the run report to '{self.path}'",
+                    exc_info=True,
+                )
@@ -0,0 +1,86 @@
+from dataclasses import replace
+
+from .dailyPlan import DailyPlan, Task
+from .taskTimings import TaskTimings
+
+MOBILE_PHASES = ("read-to-earn", "mobile-searches")
+
+
+def scheduleWithin(
+    plan: DailyPlan,
+    budget: float,
+    timings: TaskTimings,
+    mobileStart: float = 0,
+) -> DailyPlan:
+    """
+    Keeps the work that earns the most points within the budget, taking the tasks by
+    points per second, down to single searches, and orders the phases the same way.
+    The bonus points, which need no page load, stay first.
+
+    Args:
+        budget: the time left for the account, in seconds.
+        mobileStart: the time to start the mobile browser, counted once if a mobile
+        phase is kept.
+
+    Returns:
+        DailyPlan: the plan with the tasks kept, and the others in `deferred`.
+    """
+
+    def unitSeconds(task: Task) -> float:
+        return max(timings.estimate(task.phase), 1.0)
+
+    def density(task: Task) -> float:
+        return task.points / task.count / unitSeconds(task)
+
+    kept: dict[int, int] = {}
+    used = 0.0
+    mobileStarted = not mobileStart
+    candidates = sorted(
+        enumerate(plan.tasks),
+        key=lambda indexedTask: (
+            indexedTask[1].phase != "bonus-points",
+            -density(indexedTask[1]),
+        ),
+    )
+    for index, task in candidates:
+        overhead = (
+            mobileStart if task.phase in MOBILE_PHASES and not mobileStarted else 0.0
+        )
+        units = min(task.count, int((budget - used - overhead) // unitSeconds(task)))
+        if units <= 0:
+            continue
+        kept[index] = units
+        used += overhead + units * unitSeconds(task)
+        mobileStarted |= task.phase in MOBILE_PHASES
+
+    scheduled = DailyPlan(plan.phases, deferred=list(plan.deferred))
+    for index, task in enumerate(plan.tasks):
+        units = kept.get(index, 0)
+        if units:
+            scheduled.tasks.append(split(task, units))
+        if units < task.count:
+            scheduled.deferred.append(split(task, task.count - units))
+
+    def phaseDensity(phase: str) -> float:
+        tasks = scheduled.tasksFor(phase)
+        seconds = sum(task.count * unitSeconds(task) for task in tasks)
+        return sum(task.points for task in tasks) / seconds if seconds else 0.0
+
+    scheduled.phases = tuple(
+        sorted(
+            plan.phases,
+            key=lambda phase: (phase != "bonus-points", -phaseDensity(phase)),
+        )
+    )
+    scheduled.estimatedSeconds = used
+    return scheduled
+
+
+def split(task: Task, units: int) -> Task:
+    """
+    Returns:
+        Task: the part of the task with the given number of units.
+    """
+    if units == task.count:
+        return task
+    return replace(task, count=units, points=round(task.points * units / task.count))
@@ -1,31 +1,32 @@
+import contextlib
 import dbm.dumb
 import logging
 import shelve
-from enum import Enum, auto
-from random import random
 from time import sleep
-from typing import Final
 
+from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.wait import WebDriverWait
 from trendspy import Trends
 
 from src.browser import Browser
-from src.utils import CONFIG, getProjectRoot, cooldown, COUNTRY
+from src.dashboard import UserStatus
+from src.navigation import SEARCH_RESULTS_READY
+from src.runReport import SearchReport
+from src.utils import (
+    COUNTRY,
+    IDLE_TASKS,
+    RUN_REPORT,
+    cooldown,
+    getProjectRoot,
+    getRetryPolicy,
+)
 
-
-class RetriesStrategy(Enum):
-    """
-    method to use when retrying
-    """
-
-    EXPONENTIAL = auto()
-    """
-    an exponentially increasing `backoff-factor` between attempts
-    """
-    CONSTANT = auto()
-    """
-    the default; a constant `backoff-factor` between attempts
-    """
+COUNTERS_CHECK_INTERVAL = 10
+"""
+the searches counted from the Bing header after which the counters are read again
+"""
 
 
 class Searches:
@@ -33,23 +34,39 @@ class Searches:
     Class to handle searches in MS Rewards.
     """
 
-    maxRetries: Final[int] = CONFIG.retries.max
-    """
-    the max amount of retries to attempt
-    """
-    baseDelay: Final[float] = CONFIG.get("retries.backoff-factor")
-    """
-    how many seconds to delay
-    """
-    # retriesStrategy = Final[  # todo Figure why doesn't work with equality below
-    retriesStrategy = RetriesStrategy[CONFIG.retries.strategy]
-
     def __init__(self, browser: Browser):
         self.browser = browser
         self.webdriver = browser.webdriver
 
         dumbDbm = dbm.dumb.open((getProjectRoot() / "google_trends").__str__())
         self.googleTrendsShelf: shelve.Shelf = shelve.Shelf(dumbDbm)
+        self._prefetchedTrends: list | None = None
+        """
+        trends fetched during a cooldown, stored in the shelf by the next load
+        """
+        self.points = 0
+        """
+        the points of the account after the last search
+        """
+        self.remaining = 0
+        """
+        the searches left for this browser, from the counters and the searches counted
+        since they were read
+        """
+        self.userStatus: UserStatus | None = None
+        """
+        the user status read since the counters were last used, if any
+        """
+        self.trustHeader = True
+        """
+        whether the points in the Bing header count the searches, see `bingSearch`
+        """
+        self.counted = 0
+        self.counterPoints: list[int] = []
+        """
+        the points of the search counters of this browser each time they were read,
+        which unlike the balance only grow with the searches
+        """
 
     def __enter__(self):
         return self
@@ -57,92 +74,167 @@ class Searches:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.googleTrendsShelf.__exit__(None, None, None)
 
+    def _prefetchTrends(self, count: int) -> None:
+        self._prefetchedTrends = Trends().trending_now(geo=COUNTRY)[:count]
+
     def _loadTrends(self, count: int = 20) -> None:
         logging.debug(
             f"google_trends before load = {list(self.googleTrendsShelf.items())}"
         )
-        trends = Trends().trending_now(geo=COUNTRY)[:count]
+        trends, self._prefetchedTrends = self._prefetchedTrends, None
+        if trends is None or len(trends) < count:
+            trends = Trends().trending_now(geo=COUNTRY)[:count]
         for trend in trends:
             self.googleTrendsShelf[trend.keyword] = trend
         logging.debug(
             f"google_trends after load = {list(self.googleTrendsShelf.items())}"
         )
 
-    def bingSearches(self) -> None:
-        # Function to perform Bing searches
+    def bingSearches(self, maxSearches: int | None = None) -> bool:
+        """
+        Plans the searches from the counters read once, checks each one with the points
+        in the Bing header, and reads the counters again only every
+        `COUNTERS_CHECK_INTERVAL` searches, when the header doesn't tell, and at the end.
+        While points are earned in the background, the balance doesn't tell what a
+        search earned, so each search is checked with the counters instead.
+
+        Args:
+            maxSearches: stops after this many counted searches, the others are left
+            for a later run.
+
+        Returns:
+            bool: False if it gave up before all the searches were counted.
+        """
         logging.info(
             f"[BING] Starting {self.browser.browserType.capitalize()} Edge Bing searches..."
         )
+        utils = self.browser.utils
+        pageLoadsBefore = utils.pageLoads.copy()
+        self.counted = 0
+        self.counterPoints = []
+        try:
+            utils.goToSearch()
+            return self._searchUntilDone(maxSearches)
+        finally:
+            pageLoads = utils.pageLoads - pageLoadsBefore
+            report = SearchReport(
+                self.browser.browserType,
+                self.counted,
+                self.counterPoints[-1] - self.counterPoints[0] if self.counterPoints else 0,
+                pageLoads["rewards"],
+                pageLoads["search"],
+            )
+            RUN_REPORT.account(self.browser.email).searches.append(report)
+            logging.info(
+                f"[BING] {report.counted} counted searches for {report.points} points,"
+                f" {report.rewardsLoads}"
+                f" rewards and {report.searchLoads} Bing page loads"
+                f" ({report.loadsPerSearch} per search)"
+            )
 
-        self.browser.utils.goToSearch()
+    def _readUserStatus(self) -> UserStatus:
+        userStatus = self.browser.utils.getUserStatus()
+        counters = userStatus.counters
+        searchCounters = counters.mobileSearch if self.browser.mobile else counters.pcSearch
+        self.counterPoints.append(sum(counter.pointProgress for counter in searchCounters))
+        return userStatus
 
+    def _remaining(self, userStatus: UserStatus) -> tuple[int, int]:
+        """
+        Returns:
+            tuple[int, int]: the remaining searches of this browser, and of both.
+        """
+        remainingSearches = userStatus.remainingSearches()
+        if self.browser.mobile:
+            return remainingSearches.mobile, remainingSearches.getTotal()
+        return remainingSearches.desktop, remainingSearches.getTotal()
+
+    def _searchUntilDone(self, maxSearches: int | None) -> bool:
+        total = 0
+        # Searches counted since the counters were read
+        unchecked = 0
+        self.userStatus = self._readUserStatus()
         while True:
-            desktopAndMobileRemaining = self.browser.getRemainingSearches(
-                desktopAndMobile=True
-            )
-            logging.info(f"[BING] Remaining searches={desktopAndMobileRemaining}")
-            if (
-                self.browser.browserType == "desktop"
-                and desktopAndMobileRemaining.desktop == 0
-            ) or (
-                self.browser.browserType == "mobile"
-                and desktopAndMobileRemaining.mobile == 0
-            ):
-                break
-
-            if desktopAndMobileRemaining.getTotal() > len(self.googleTrendsShelf):
-                self._loadTrends(desktopAndMobileRemaining.getTotal())
+            if self.userStatus is not None:
+                fresh, total = self._remaining(self.userStatus)
+                if unchecked and fresh > self.remaining:
+                    self._distrustHeader()
+                self.remaining = fresh
+                self.points = self.userStatus.availablePoints
+                self.userStatus = None
+                unchecked = 0
+                logging.info(f"[BING] Remaining searches={self.remaining}")
+            if self.remaining == 0:
+                if not unchecked:
+                    break
+                self.userStatus = self._readUserStatus()
+                continue
+            if maxSearches is not None and self.counted >= maxSearches:
+                logging.info(
+                    f"[BING] Stopping after {self.counted} searches, the time budget is used"
+                )
+                return False
+
+            if total > len(self.googleTrendsShelf):
+                self._loadTrends(total)
+            if total >= len(self.googleTrendsShelf) and self._prefetchedTrends is None:
+                # The next load is close, fetch its trends during the cooldown
+                IDLE_TASKS.submit("prefetch-trends", self._prefetchTrends, max(total, 20))
 
             result_search_counted = self.bingSearch()
             if not result_search_counted:
                 logging.info(
                     f"[BING] Giving up on {self.browser.browserType.capitalize()} Edge Bing searches !"
                 )
-                return
+                return False
+            self.counted += 1
+            self.remaining -= 1
+            total -= 1
+            unchecked += 1
+            if unchecked >= COUNTERS_CHECK_INTERVAL and self.userStatus is None:
+                self.userStatus = self._readUserStatus()
 
         logging.info(
             f"[BING] Finished {self.browser.browserType.capitalize()} Edge Bing searches !"
         )
+        return True
+
+    def _distrustHeader(self) -> None:
+        if self.trustHeader:
+            logging.info(
+                "[BING] The Bing header counted searches the counters didn't,"
+                " checking them on the rewards page from now on"
+            )
+        self.trustHeader = False
 
     def bingSearch(self) -> bool:
-        # Function to perform a single Bing search
-        pointsBefore = self.browser.utils.getAccountPoints()
+        """
+        Searches until the search is counted, checked with the points in the Bing
+        header if they can be trusted, or else with the search counters.
+        """
 
         trend = list(self.googleTrendsShelf.keys())[0]
         trendKeywords = self.googleTrendsShelf[trend].trend_keywords
         logging.debug(f"trendKeywords={trendKeywords}")
         logging.debug(f"trend={trend}")
-        baseDelay = Searches.baseDelay
-
-        for i in range(self.maxRetries + 1):
-            if i != 0:
-                if not trendKeywords:
-                    del self.googleTrendsShelf[trend]
-
-                    if not self.googleTrendsShelf:
-                        logging.info("[BING] Trend shelf empty, reloading...")
-                        self._loadTrends()
-
-                    trend = list(self.googleTrendsShelf.keys())[0]
-                    trendKeywords = self.googleTrendsShelf[trend].trend_keywords
-
-                sleepTime: int
-                if Searches.retriesStrategy == Searches.retriesStrategy.EXPONENTIAL:
-                    sleepTime = baseDelay * 2 ** (i - 1)
-                elif Searches.retriesStrategy == Searches.retriesStrategy.CONSTANT:
-                    sleepTime = baseDelay
-                else:
-                    raise AssertionError
-                sleepTime = round(sleepTime + baseDelay * random())
-                logging.info(
-                    f"[BING] Search attempt not counted {i}/{Searches.maxRetries},"
-                    f" sleeping {sleepTime}"
-                    f" seconds..."
-                )
-                sleep(sleepTime)
 
-            self.browser.utils.goToSearch()
-            searchbar = self.browser.utils.waitUntilClickable(
+        def search(attempt: int) -> bool:
+            nonlocal trend, trendKeywords
+            if attempt != 0 and not trendKeywords:
+                del self.googleTrendsShelf[trend]
+
+                if not self.googleTrendsShelf:
+                    logging.info("[BING] Trend shelf empty, reloading...")
+                    self._loadTrends()
+
+                trend = list(self.googleTrendsShelf.keys())[0]
+                trendKeywords = self.googleTrendsShelf[trend].trend_keywords
+
+            # The search box of the last results is reused, the page is loaded again
+            # only to retry
+            if attempt != 0 or not self.browser.utils.isOnSearchPage():
+                self.browser.utils.goToSearch()
+            searchbar = self.browser.utils.cachedElement(
                 By.ID, "sb_form_q", timeToWait=40
             )
             searchbar.clear()
@@ -152,16 +244,42 @@ class Searches:
             searchbar.send_keys(trendKeyword)
             sleep(1)
             searchbar.submit()
+            self.browser.utils.pageLoads["search"] += 1
+            # Submitting doesn't wait for the results, whatever the page load strategy
+            wait = WebDriverWait(self.webdriver, 10, poll_frequency=0.1)
+            with contextlib.suppress(TimeoutException):
+                wait.until(expected_conditions.staleness_of(searchbar))
+                wait.until(SEARCH_RESULTS_READY)
 
-            pointsAfter = self.browser.utils.getAccountPoints()
-            if pointsBefore < pointsAfter:
-                del self.googleTrendsShelf[trend]
-                cooldown()
-                return True
+            # The balance also grows with the points earned in the background meanwhile
+            useHeader = self.trustHeader and not self.browser.balanceShared
+            if useHeader:
+                points = self.browser.utils.getSearchPagePoints(above=self.points)
+                if points is not None:
+                    self.points = points
+                    return True
+            # Not shown in the header, or not yet, the counters tell for sure
+            self.userStatus = self._readUserStatus()
+            self.points = self.userStatus.availablePoints
+            remaining = self._remaining(self.userStatus)[0]
+            if remaining > self.remaining:
+                # Searches counted from the header earlier weren't
+                self._distrustHeader()
+                self.remaining = remaining
+                return False
+            counted = remaining < self.remaining
+            if useHeader and counted:
+                logging.debug("[BING] The Bing header doesn't show the points")
+                self.trustHeader = False
+            return counted
 
-            # todo
-            # if i == (maxRetries / 2):
-            #     logging.info("[BING] " + "TIMED OUT GETTING NEW PROXY")
-            #     self.webdriver.proxy = self.browser.giveMeProxy()
+        # todo
+        # if attempt == (maxRetries / 2):
+        #     logging.info("[BING] " + "TIMED OUT GETTING NEW PROXY")
+        #     self.webdriver.proxy = self.browser.giveMeProxy()
+        if getRetryPolicy("bing-search").run(search, isSuccess=bool):
+            del self.googleTrendsShelf[trend]
+            cooldown()
+            return True
         logging.error("[BING] Reached max search attempt retries")
         return False
@@ -0,0 +1,295 @@
+import logging
+import os
+import shutil
+import socket
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+import psutil
+
+# Directories Chrome recreates on demand. Relative to the user data dir, or to a
+# profile directory (e.g. "Default") when listed in PROFILE_CACHE_DIRECTORIES.
+# Cookies, Local Storage, IndexedDB, Preferences and Login Data are never touched,
+# so the session stays logged in.
+USER_DATA_CACHE_DIRECTORIES = (
+    "BrowserMetrics",
+    "Crash Reports",
+    "Crashpad",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+    "component_crx_cache",
+    "extensions_crx_cache",
+)
+PROFILE_CACHE_DIRECTORIES = (
+    "Cache",
+    "Code Cache",
+    "DawnCache",
+    "DawnGraphiteCache",
+    "DawnWebGPUCache",
+    "GPUCache",
+    "Media Cache",
+    "Service Worker/CacheStorage",
+    "Service Worker/ScriptCache",
+    "blob_storage",
+)
+SINGLETON_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile")
+USER_DATA_DIR_ARGUMENT = "--user-data-dir="
+
+
+class CompactionResult(NamedTuple):
+    """
+    Outcome of compacting a session profile.
+    """
+
+    sizeBefore: int
+    sizeAfter: int
+    removedLock: bool
+
+    @property
+    def reclaimed(self) -> int:
+        return self.sizeBefore - self.sizeAfter
+
+
+class SweepResult(NamedTuple):
+    """
+    Outcome of stopping the processes left behind by crashed runs.
+    """
+
+    stopped: int
+    killed: int
+    """
+    the processes that didn't exit when asked to, and were killed
+    """
+    memory: int
+    """
+    the resident memory of the stopped processes, in bytes
+    """
+
+
+def directorySize(path: Path) -> int:
+    """
+    Returns the total size in bytes of the files under the given directory,
+    without following symlinks.
+    """
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def getLockOwnerPid(sessionPath: Path) -> int | None:
+    """
+    Returns the pid recorded in Chrome's `SingletonLock`, or None if there is no lock
+    or it was written on another host.
+
+    On Linux and macOS, `SingletonLock` is a symlink pointing to "<hostname>-<pid>".
+    """
+    lockPath = sessionPath / "SingletonLock"
+    try:
+        target = os.readlink(lockPath)
+    except OSError:
+        return None
+    hostname, _, pid = target.rpartition("-")
+    if hostname != socket.gethostname() or not pid.isdigit():
+        return None
+    return int(pid)
+
+
+def isSessionLocked(sessionPath: Path) -> bool:
+    """
+    Checks whether a live Chrome process currently holds the session profile.
+    """
+    pid = getLockOwnerPid(sessionPath)
+    if pid is not None:
+        return psutil.pid_exists(pid)
+    # Windows keeps an exclusive handle on "lockfile" while Chrome runs, so it can't be
+    # opened. A stale one is removed by `removeStaleLock`
+    try:
+        with open(sessionPath / "lockfile", "r+b"):
+            return False
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return True
+
+
+def removeStaleLock(sessionPath: Path) -> bool:
+    """
+    Removes the singleton files left behind by a crashed Chrome.
+
+    Returns:
+        bool: True if a stale lock was found and removed.
+    """
+    removed = False
+    for name in SINGLETON_FILES:
+        path = sessionPath / name
+        if not (path.is_symlink() or path.exists()):
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            logging.warning(f"[SESSION] Could not remove '{path}'", exc_info=True)
+            continue
+        removed = removed or name == "SingletonLock"
+    return removed
+
+
+def compactSession(sessionPath: Path) -> CompactionResult | None:
+    """
+    Prunes the cache directories of a session profile, keeping cookies and login state.
+
+    Returns:
+        CompactionResult | None: None if the profile is in use by a running Chrome.
+    """
+    if isSessionLocked(sessionPath):
+        logging.warning(
+            f"[SESSION] '{sessionPath.name}' is in use by a running Chrome, not compacting"
+        )
+        return None
+
+    sizeBefore = directorySize(sessionPath)
+    removedLock = removeStaleLock(sessionPath)
+    if removedLock:
+        logging.warning(
+            f"[SESSION] Removed stale SingletonLock of '{sessionPath.name}'"
+            f" left by a crashed Chrome"
+        )
+
+    cacheDirectories = [sessionPath / name for name in USER_DATA_CACHE_DIRECTORIES]
+    for profile in sessionPath.iterdir():
+        if profile.is_dir() and (profile / "Preferences").is_file():
+            cacheDirectories.extend(profile / name for name in PROFILE_CACHE_DIRECTORIES)
+    for directory in cacheDirectories:
+        if directory.is_dir():
+            shutil.rmtree(directory, ignore_errors=True)
+
+    return CompactionResult(sizeBefore, directorySize(sessionPath), removedLock)
+
+
+def checkSession(sessionPath: Path, maxSize: int) -> None:
+    """
+    Pre-launch health check: removes a stale lock, and compacts the profile if it's
+    larger than `maxSize` bytes.
+    """
+    if isSessionLocked(sessionPath):
+        logging.warning(
+            f"[SESSION] '{sessionPath.name}' is in use by a running Chrome,"
+            f" launching may fail"
+        )
+        return
+    size = directorySize(sessionPath)
+    logging.debug(f"[SESSION] '{sessionPath.name}' is {formatSize(size)}")
+    if size <= maxSize:
+        if removeStaleLock(sessionPath):
+            logging.warning(
+                f"[SESSION] Removed stale SingletonLock of '{sessionPath.name}'"
+                f" left by a crashed Chrome"
+            )
+        return
+    result = compactSession(sessionPath)
+    if result:
+        logging.info(
+            f"[SESSION] Compacted '{sessionPath.name}' from {formatSize(result.sizeBefore)}"
+            f" to {formatSize(result.sizeAfter)}"
+        )
+
+
+def _normalizePath(path: str | Path) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _usesSession(cmdline: Iterable[str], sessionsPrefix: str) -> bool:
+    return any(
+        argument.startswith(USER_DATA_DIR_ARGUMENT)
+        and (
+            _normalizePath(argument.removeprefix(USER_DATA_DIR_ARGUMENT)) + os.sep
+        ).startswith(sessionsPrefix + os.sep)
+        for argument in cmdline
+    )
+
+
+def findOrphanProcesses(sessionsPath: Path) -> list[psutil.Process]:
+    """
+    Finds the Chrome processes using a user data dir under `sessionsPath`, with their
+    child processes, and the chromedriver processes whose parent is gone that started
+    them.
+
+    Chrome is started detached from chromedriver, so its parent doesn't tell whether
+    a run still uses it: callers must only sweep the sessions they're about to use.
+    """
+    sessionsPrefix = _normalizePath(sessionsPath)
+    found: dict[int, psutil.Process] = {}
+    for process in psutil.process_iter(["name", "cmdline", "ppid"]):
+        if process.pid == os.getpid():
+            continue
+        name = (process.info["name"] or "").lower()
+        cmdline = process.info["cmdline"] or ()
+        isOrphanDriver = "chromedriver" in name and (
+            process.info["ppid"] in (0, 1) or not psutil.pid_exists(process.info["ppid"])
+        )
+        if isOrphanDriver:
+            # Only the drivers of Chrome on these sessions, not other tools' ones
+            try:
+                children = process.children(recursive=True)
+                isOrphanDriver = any(
+                    _usesSession(child.cmdline(), sessionsPrefix) for child in children
+                )
+            except psutil.Error:
+                continue
+        if not (_usesSession(cmdline, sessionsPrefix) or isOrphanDriver):
+            continue
+        found[process.pid] = process
+        try:
+            for child in process.children(recursive=True):
+                found.setdefault(child.pid, child)
+        except psutil.Error:
+            continue
+    return list(found.values())
+
+
+def sweepOrphanProcesses(sessionsPath: Path, timeout: float = 5) -> SweepResult:
+    """
+    Stops the processes left behind by crashed runs on the sessions under
+    `sessionsPath`, see `findOrphanProcesses`: asks them to exit, then kills the ones
+    still running after `timeout` seconds.
+    """
+    processes = findOrphanProcesses(sessionsPath)
+    memory = 0
+    for process in processes:
+        try:
+            memory += process.memory_info().rss
+            process.terminate()
+        except psutil.Error:
+            continue
+    _, alive = psutil.wait_procs(processes, timeout=timeout)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.Error:
+            continue
+    psutil.wait_procs(alive, timeout=timeout)
+    result = SweepResult(len(processes), len(alive), memory)
+    if processes:
+        logging.warning(
+            f"[SESSION] Stopped {result.stopped} Chrome/chromedriver process(es) left by"
+            f" a previous run ({result.killed} killed), reclaiming"
+            f" {formatSize(result.memory)} of memory"
+        )
+    return result
+
+
+def formatSize(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB"
@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+import statistics
+import threading
+from collections import deque
+from pathlib import Path
+
+BROWSER_START = "browser-start"
+"""
+the key of the time to start a browser and log in, in `TaskTimings`
+"""
+
+
+class TaskTimings:
+    """
+    Rolling durations of the tasks of each phase, per unit of work (an activity, a
+    search...), persisted between runs to estimate how long the planned work takes.
+    """
+
+    def __init__(self, path: Path, defaults: dict[str, float], window: int = 20):
+        """
+        Args:
+            defaults: the estimates, in seconds, of the keys without history.
+        """
+        self.path = path
+        self.defaults = defaults
+        self.window = window
+        self._samples: dict[str, deque[float]] | None = None
+        self._changed = False
+        self._lock = threading.Lock()
+
+    @property
+    def samples(self) -> dict[str, deque[float]]:
+        if self._samples is None:
+            self._samples = {}
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    for key, durations in json.load(file).items():
+                        self._samples[key] = deque(durations, maxlen=self.window)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, TypeError, AttributeError):
+                logging.warning(
+                    f"[SCHEDULE] Ignoring unreadable task timings '{self.path}'"
+                )
+        return self._samples
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self.samples.setdefault(key, deque(maxlen=self.window)).append(
+                round(seconds, 1)
+            )
+            self._changed = True
+
+    def estimate(self, key: str) -> float:
+        """
+        Returns:
+            float: the median duration of the key, in seconds.
+        """
+        with self._lock:
+            durations = list(self.samples.get(key, ()))
+        if not durations:
+            return self.defaults.get(key, self.defaults["default"])
+        return statistics.median(durations)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._changed:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporaryPath = self.path.with_suffix(f".{os.getpid()}.tmp")
+                with open(temporaryPath, "w", encoding="utf-8") as file:
+                    json.dump(
+                        {key: list(value) for key, value in self.samples.items()},
+                        file,
+                        indent=2,
+                    )
+                os.replace(temporaryPath, self.path)
+                self._changed = False
+            except OSError:
+                logging.warning(
+                    f"[SCHEDULE] Could not save the task timings to '{self.path}'",
+                    exc_info=True,
+                )
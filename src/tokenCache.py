@@ -0,0 +1,78 @@
+import contextlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from cryptography.fernet import Fernet, InvalidToken
+
+TOKEN_FILENAME = "mobile_app_token"
+
+
+class TokenCache:
+    """
+    The OAuth tokens of the mobile app, stored in the session folder of each account and
+    encrypted at rest, so that later runs can refresh them without the browser.
+    """
+
+    def __init__(self, sessionsPath: Path, key: bytes):
+        """
+        Args:
+            key: the Fernet key encrypting the tokens, see `loadKey`.
+        """
+        self.sessionsPath = sessionsPath
+        self.fernet = Fernet(key)
+
+    def path(self, email: str) -> Path:
+        return self.sessionsPath / email / TOKEN_FILENAME
+
+    def load(self, email: str) -> dict | None:
+        """
+        Returns:
+            dict | None: the token of the account, None if there's none or it can't be
+            decrypted, e.g. after the key changed.
+        """
+        try:
+            return json.loads(self.fernet.decrypt(self.path(email).read_bytes()))
+        except FileNotFoundError:
+            return None
+        except (OSError, InvalidToken, ValueError):
+            logging.warning(f"[TOKENS] Ignoring unreadable token of '{email}'")
+            return None
+
+    def save(self, email: str, token: dict) -> None:
+        path = self.path(email)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporaryPath = path.with_suffix(f".{os.getpid()}.tmp")
+            temporaryPath.write_bytes(self.fernet.encrypt(json.dumps(token).encode()))
+            os.chmod(temporaryPath, 0o600)
+            os.replace(temporaryPath, path)
+        except OSError:
+            logging.warning(
+                f"[TOKENS] Could not save the token of '{email}'", exc_info=True
+            )
+
+    def delete(self, email: str) -> None:
+        self.path(email).unlink(missing_ok=True)
+
+
+def isFresh(token: dict, margin: float = 300) -> bool:
+    """
+    Whether the access token is valid for at least `margin` more seconds.
+    """
+    return token.get("expires_at", 0) > time.time() + margin
+
+
+def loadKey(keyPath: Path) -> bytes:
+    """
+    Returns:
+        bytes: the key stored at `keyPath`, generated and readable only by the user on
+        first use.
+    """
+    with contextlib.suppress(FileExistsError):
+        descriptor = os.open(keyPath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(Fernet.generate_key())
+    return keyPath.read_bytes().strip()
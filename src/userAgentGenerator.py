@@ -32,6 +32,20 @@ class GenerateUserAgent:
     OS_PLATFORMS = {"win": "Windows NT 10.0", "android": "Linux"}
     OS_CPUS = {"win": "Win64; x64", "android": "Android 13"}
 
+    versions: tuple[str, str, str] | None = None
+    """
+    the latest Edge for Windows, Edge for Android and Chrome versions, shared by the
+    browsers of the run
+    """
+
+    @classmethod
+    def refreshVersions(cls) -> None:
+        """
+        Fetches the latest versions, for the next browsers started.
+        """
+        generator = cls()
+        cls.versions = (*generator.getEdgeVersions(), generator.getChromeVersion())
+
     def userAgent(
         self,
         browserConfig: dict[str, Any] | None,
@@ -116,11 +130,12 @@ class GenerateUserAgent:
         Returns:
             A dictionary containing the application components for the user agent string.
         """
-        edgeWindowsVersion, edgeAndroidVersion = self.getEdgeVersions()
+        if GenerateUserAgent.versions is None:
+            self.refreshVersions()
+        edgeWindowsVersion, edgeAndroidVersion, chromeVersion = GenerateUserAgent.versions
         edgeVersion = edgeAndroidVersion if mobile else edgeWindowsVersion
         edgeMajorVersion = edgeVersion.split(".")[0]
 
-        chromeVersion = self.getChromeVersion()
         chromeMajorVersion = chromeVersion.split(".")[0]
         chromeReducedVersion = f"{chromeMajorVersion}.0.0.0"
 
@@ -1,5 +1,6 @@
+import atexit
 import contextlib
-import importlib
+import functools
 import json
 import locale as pylocale
 import logging
@@ -9,13 +10,12 @@ import shutil
 import sys
 import time
 from argparse import Namespace, ArgumentParser
+from collections import Counter
 from copy import deepcopy
-from datetime import date
 from pathlib import Path
-from types import ModuleType
-from typing import Any, Self
+from typing import Any, Callable, Self
+from urllib.parse import urlparse
 
-import psutil
 import pycountry
 import requests
 import yaml
@@ -24,10 +24,12 @@ from ipapi import ipapi
 from ipapi.exceptions import RateLimited
 from requests import Session, JSONDecodeError
 from requests.adapters import HTTPAdapter
+from urllib3 import Retry
 from selenium.common import (
     ElementClickInterceptedException,
     ElementNotInteractableException,
     NoSuchElementException,
+    StaleElementReferenceException,
     TimeoutException,
 )
 from selenium.webdriver.chrome.webdriver import WebDriver
@@ -35,9 +37,36 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.wait import WebDriverWait
-from urllib3 import Retry
 
+from .activityCatalog import LocalizedActivities, loadCatalog
+from .activityTitles import ActivityTitleIndex
 from .constants import REWARDS_URL, SEARCH_URL
+from .dashboard import (
+    PROJECTION_SCRIPT,
+    USER_STATUS_PATHS,
+    Dashboard,
+    Promotion,
+    UserStatus,
+    activitiesPaths,
+    dailySetKey,
+)
+from .idleTasks import IdleTasks
+from .navigation import (
+    SEARCH_BOX_READY,
+    ReadyCondition,
+    dashboardLoaded,
+    lifecycleTimings,
+)
+from .pointsHistory import PointsHistory
+from .reporting import Reporter
+from .retryPolicy import Jitter, RetriesStrategy, RetryPolicy
+from .runCheckpoint import RunCheckpoint
+from .runReport import MemorySampler, RunReport
+from .sessionMaintenance import compactSession, formatSize, sweepOrphanProcesses
+from .taskTimings import BROWSER_START, TaskTimings
+from .tokenCache import TokenCache, loadKey
+from .waitStatistics import WaitStatistics
+from .watchdog import Watchdog
 
 PREFER_BING_INFO = False
 
@@ -181,6 +210,7 @@ DEFAULT_CONFIG: Config = Config(
                 "login-code": True,
             },
             "summary": "ON_ERROR",
+            "timeout": 30,
             "urls": [],
         },
         "browser": {
@@ -188,15 +218,32 @@ DEFAULT_CONFIG: Config = Config(
             "language": None,
             "visible": False,
             "proxy": None,
+            "page-load": "eager",
         },
         "rtfr": False,
         "logging": {
             "format": "%(asctime)s [%(levelname)s] %(message)s",
             "level": "INFO",
         },
-        "retries": {"backoff-factor": 120, "max": 4, "strategy": "EXPONENTIAL"},
+        "retries": {
+            "backoff-factor": 120,
+            "max": 4,
+            "strategy": "EXPONENTIAL",
+            "jitter": "ADDITIVE",
+            "phase-budget": 3600,
+        },
         "cooldown": {"min": 300, "max": 600},
         "search": {"type": "both"},
+        "sessions": {"auto-compact": True, "max-size": 300, "sweep-orphans": True},
+        "login": {"session-ttl": 3600},
+        "waits": {"adaptive": True, "margin": 3, "minimum": 2, "min-cap-fraction": 0.5},
+        "watchdog": {
+            "enabled": True,
+            "deadlines": {"default": 1800, "login": 300, "close-browser": 60},
+        },
+        "memory": {"sample": False, "interval": 5, "ceiling": None},
+        "time-budget": None,
+        "tokens": {"cache": True, "key": None},
         "accounts": [],
     }
 )
@@ -209,6 +256,23 @@ class Utils:
 
     def __init__(self, webdriver: WebDriver):
         self.webdriver = webdriver
+        self.sessionCheck: Callable[[], None] | None = None
+        """
+        a check of the session to run on the next rewards page load, see `Login.login`
+        """
+        self.pageLoads: Counter[str] = Counter()
+        """
+        the pages loaded, by kind: "rewards" or "search"
+        """
+        self.lifecycleEvents = False
+        """
+        whether Chrome logs the lifecycle events of the pages, see `navigate`
+        """
+        self._elements: dict[tuple[str, str], WebElement] = {}
+        self.elementCache: Counter[str] = Counter()
+        """
+        the lookups of `cachedElement`, by outcome: "hits", "revalidations" or "misses"
+        """
         with contextlib.suppress(Exception):
             locale = pylocale.getlocale()[0]
             pylocale.setlocale(pylocale.LC_NUMERIC, locale)
@@ -216,17 +280,83 @@ class Utils:
     def waitUntilVisible(
         self, by: str, selector: str, timeToWait: float = 10
     ) -> WebElement:
-        return WebDriverWait(self.webdriver, timeToWait).until(
-            expected_conditions.visibility_of_element_located((by, selector))
+        return self.waitUntil(
+            expected_conditions.visibility_of_element_located((by, selector)),
+            by,
+            selector,
+            timeToWait,
         )
 
     def waitUntilClickable(
         self, by: str, selector: str, timeToWait: float = 10
     ) -> WebElement:
-        return WebDriverWait(self.webdriver, timeToWait).until(
-            expected_conditions.element_to_be_clickable((by, selector))
+        return self.waitUntil(
+            expected_conditions.element_to_be_clickable((by, selector)),
+            by,
+            selector,
+            timeToWait,
         )
 
+    def waitUntil(
+        self,
+        condition: Callable[[WebDriver], Any],
+        by: str,
+        selector: str,
+        timeToWait: float,
+    ) -> Any:
+        """
+        Waits for the condition on the element, for at most `timeToWait` seconds, or
+        less if the element usually appears faster on this page, see `WaitStatistics`.
+        """
+        if not CONFIG.get("waits.adaptive"):
+            return WebDriverWait(self.webdriver, timeToWait).until(condition)
+
+        key = WAIT_STATISTICS.key(self.webdriver.current_url, by, selector)
+        deadline = WAIT_STATISTICS.deadline(key, timeToWait)
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(self.webdriver, deadline).until(condition)
+        except TimeoutException:
+            if deadline < timeToWait:
+                logging.debug(
+                    f"[WAITS] {selector} timed out after an adaptive {deadline:.1f}s"
+                    f" (cap {timeToWait}s)"
+                )
+                WAIT_STATISTICS.record(key, deadline)
+            raise
+        WAIT_STATISTICS.record(key, time.monotonic() - start)
+        return result
+
+    def cachedElement(
+        self, by: str, selector: str, timeToWait: float = 10
+    ) -> WebElement:
+        """
+        Returns the element found by the last call on this page, without waiting for it
+        again. If it went stale, e.g. the page was rendered again, it's looked up once
+        more without waiting, and only then waited for to be clickable. The cache is
+        cleared on navigation through `Utils`.
+        """
+        key = (by, selector)
+        element = self._elements.get(key)
+        if element is not None:
+            try:
+                element.is_enabled()
+                self.elementCache["hits"] += 1
+                return element
+            except StaleElementReferenceException:
+                with contextlib.suppress(NoSuchElementException):
+                    element = self.webdriver.find_element(by, selector)
+                    self._elements[key] = element
+                    self.elementCache["revalidations"] += 1
+                    return element
+        self.elementCache["misses"] += 1
+        element = self.waitUntilClickable(by, selector, timeToWait)
+        self._elements[key] = element
+        return element
+
+    def clearElementCache(self) -> None:
+        self._elements.clear()
+
     def checkIfTextPresentAfterDelay(self, text: str, timeToWait: float = 10) -> bool:
         time.sleep(timeToWait)
         text_found = re.search(text, self.webdriver.page_source)
@@ -252,8 +382,39 @@ class Utils:
         time.sleep(0.5)
         self.goToRewards()
 
-    def goToRewards(self) -> None:
-        self.webdriver.get(REWARDS_URL)
+    def navigate(
+        self, url: str, ready: ReadyCondition | None = None, timeToWait: float = 30
+    ) -> None:
+        """
+        Loads the page, then waits until it's `ready` for what the caller needs, as the
+        eager page load strategy returns at DOMContentLoaded.
+        """
+        self.clearElementCache()
+        start = time.monotonic()
+        self.webdriver.get(url)
+        if ready is not None:
+            WebDriverWait(self.webdriver, timeToWait, poll_frequency=0.1).until(ready)
+        if self.lifecycleEvents and logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                f"[NAVIGATION] {url} ready in {time.monotonic() - start:.2f}s,"
+                f" lifecycle={lifecycleTimings(self.webdriver)}"
+            )
+
+    def goToRewards(self, ready: ReadyCondition | None = None) -> None:
+        """
+        Args:
+            ready: what the caller needs on the dashboard, not waited for if it
+            redirected to the login, see `getDashboardFields`.
+        """
+        self.pageLoads["rewards"] += 1
+        if ready is not None:
+            ready = expected_conditions.any_of(
+                ready, expected_conditions.url_changes(REWARDS_URL)
+            )
+        self.navigate(REWARDS_URL, ready)
+        if self.sessionCheck:
+            sessionCheck, self.sessionCheck = self.sessionCheck, None
+            sessionCheck()
         assert (
             self.webdriver.current_url == REWARDS_URL
         ), f"{self.webdriver.current_url} {REWARDS_URL}"
@@ -281,81 +442,111 @@ class Utils:
         logging.debug("[COOKIE BANNER] No cookie banner found")
 
     def goToSearch(self) -> None:
-        self.webdriver.get(SEARCH_URL)
+        self.pageLoads["search"] += 1
+        self.navigate(SEARCH_URL, SEARCH_BOX_READY, timeToWait=40)
+
+    def isOnSearchPage(self) -> bool:
+        """
+        Whether a Bing page with the search box is open, like the results of a search.
+        """
+        hostname = urlparse(self.webdriver.current_url).hostname
+        return hostname in ("bing.com", "www.bing.com")
+
+    def getSearchPagePoints(self, above: int, timeToWait: float = 5) -> int | None:
+        """
+        Reads the points in the header of the Bing page, without loading the rewards
+        page.
+
+        Returns:
+            int | None: the points once above `above`, None if they aren't shown or
+            didn't go above it in time.
+        """
+
+        def pointsAbove(webdriver: WebDriver) -> int | None:
+            with contextlib.suppress(
+                NoSuchElementException, StaleElementReferenceException, ValueError
+            ):
+                header = webdriver.find_element(By.ID, "id_rc")
+                points = int(re.sub(r"\D", "", header.text))
+                if points > above:
+                    return points
+            return None
+
+        try:
+            return WebDriverWait(self.webdriver, timeToWait, poll_frequency=0.25).until(
+                pointsAbove
+            )
+        except TimeoutException:
+            return None
 
     # Prefer getBingInfo if possible
-    def getDashboardData(self) -> dict:
-        self.goToRewards()
-        time.sleep(5)  # fixme Avoid busy wait (if this works)
-        return self.webdriver.execute_script("return dashboard")
+    def getDashboardData(self, *paths: str) -> Dashboard:
+        """
+        Args:
+            paths: the dotted paths of the dashboard fields to fetch besides the user
+            status, like "punchCards", see `src.dashboard.allPaths`. The others are
+            parsed as empty.
+        """
+        return Dashboard.fromDict(self.getDashboardFields(*USER_STATUS_PATHS, *paths))
 
-    def getDailySetPromotions(self) -> list[dict]:
-        return self.getDashboardData()["dailySetPromotions"][
-            date.today().strftime("%m/%d/%Y")
-        ]
+    def getDashboardFields(self, *paths: str) -> dict:
+        """
+        Returns:
+            dict: the dashboard with only the fields at the given dotted paths, like
+            "userStatus.availablePoints", picked in the page to transfer less data.
+        """
+        self.goToRewards()
+        WebDriverWait(self.webdriver, 10, poll_frequency=0.25).until(dashboardLoaded)
+        return self.webdriver.execute_script(PROJECTION_SCRIPT, list(paths))
+
+    def getDailySetPromotions(self) -> list[Promotion]:
+        return list(
+            self.getDashboardData(
+                f"dailySetPromotions.{dailySetKey()}"
+            ).dailySetPromotions
+        )
 
-    def getMorePromotions(self) -> list[dict]:
-        return self.getDashboardData()["morePromotions"]
+    def getMorePromotions(self) -> list[Promotion]:
+        return list(self.getDashboardData("morePromotions").morePromotions)
 
-    def getActivities(self) -> list[dict]:
-        return self.getDailySetPromotions() + self.getMorePromotions()
+    def getActivities(self) -> list[Promotion]:
+        return list(self.getDashboardData(*activitiesPaths()).activities)
 
     def getBingInfo(self) -> Any:
         session = makeRequestsSession()
-        retries = CONFIG.retries.max
-        backoff_factor = CONFIG.get("retries.backoff-factor")
 
         for cookie in self.webdriver.get_cookies():
             session.cookies.set(cookie["name"], cookie["value"])
 
-        for attempt in range(retries):
-            try:
-                response = session.get(
-                    "https://www.bing.com/rewards/panelflyout/getuserinfo"
-                )
-                assert (
-                    response.status_code == requests.codes.ok
-                )  # pylint: disable=no-member
-                return response.json()
-            except (JSONDecodeError, AssertionError) as e:
-                logging.info(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < retries - 1:
-                    sleep_time = backoff_factor * (2**attempt)
-                    logging.info(f"Retrying in {sleep_time} seconds...")
-                    time.sleep(sleep_time)
-                else:
-                    # noinspection PyUnboundLocalVariable
-                    logging.debug(response)
-                    raise
-
-    def isLoggedIn(self) -> bool:
-        if self.getBingInfo()["isRewardsUser"]:  # faster, if it works
-            return True
-        self.webdriver.get(
-            "https://rewards.bing.com/"
-        )  # changed site to allow bypassing when M$ blocks access to login.live.com randomly
-        with contextlib.suppress(TimeoutException):
-            self.waitUntilVisible(
-                By.CSS_SELECTOR, 'html[data-role-name="RewardsPortal"]', 10
+        def getUserInfo(_: int) -> Any:
+            response = session.get(
+                "https://www.bing.com/rewards/panelflyout/getuserinfo"
             )
-
-            return self.webdriver.current_url != "https://rewards.bing.com/welcome?idru=%2F"
-        return False
+            if response.status_code != requests.codes.ok:  # pylint: disable=no-member
+                logging.debug(response)
+            assert (
+                response.status_code == requests.codes.ok
+            )  # pylint: disable=no-member
+            return response.json()
+
+        # `retries.max` attempts in all, as before it used a retry policy
+        return getRetryPolicy(
+            "bing-info", maxRetries=max(CONFIG.retries.max - 1, 0)
+        ).run(getUserInfo, retryOn=(JSONDecodeError, AssertionError))
+
+    def getUserStatus(self) -> UserStatus:
+        if PREFER_BING_INFO:
+            return UserStatus.fromBingInfo(self.getBingInfo())
+        return self.getDashboardData().userStatus
 
     def getAccountPoints(self) -> int:
-        if PREFER_BING_INFO:
-            return self.getBingInfo()["userInfo"]["balance"]
-        return self.getDashboardData()["userStatus"]["availablePoints"]
+        return self.getUserStatus().availablePoints
 
     def getGoalPoints(self) -> int:
-        if PREFER_BING_INFO:
-            return self.getBingInfo()["flyoutResult"]["userGoal"]["price"]
-        return self.getDashboardData()["userStatus"]["redeemGoal"]["price"]
+        return self.getUserStatus().goalPoints
 
     def getGoalTitle(self) -> str:
-        if PREFER_BING_INFO:
-            return self.getBingInfo()["flyoutResult"]["userGoal"]["title"]
-        return self.getDashboardData()["userStatus"]["redeemGoal"]["title"]
+        return self.getUserStatus().goalTitle
 
     def tryDismissAllMessages(self) -> None:
         byValues = [
@@ -383,11 +574,13 @@ class Utils:
 
     def switchToNewTab(self, timeToWait: float = 10, closeTab: bool = False) -> None:
         time.sleep(timeToWait)
+        self.clearElementCache()
         self.webdriver.switch_to.window(window_name=self.webdriver.window_handles[1])
         if closeTab:
             self.closeCurrentTab()
 
     def closeCurrentTab(self) -> None:
+        self.clearElementCache()
         self.webdriver.close()
         time.sleep(0.5)
         self.webdriver.switch_to.window(window_name=self.webdriver.window_handles[0])
@@ -395,16 +588,18 @@ class Utils:
 
     def click(self, element: WebElement) -> None:
         try:
+            # Usually just waited for, so the wait returns at its first check
             WebDriverWait(self.webdriver, 10).until(
                 expected_conditions.element_to_be_clickable(element)
             ).click()
         except (
             TimeoutException,
+            StaleElementReferenceException,
             ElementClickInterceptedException,
             ElementNotInteractableException,
         ):
             self.tryDismissAllMessages()
-            with contextlib.suppress(TimeoutException):
+            with contextlib.suppress(TimeoutException, StaleElementReferenceException):
                 WebDriverWait(self.webdriver, 10).until(
                     expected_conditions.element_to_be_clickable(element)
                 )
@@ -511,8 +706,36 @@ def argumentParser() -> Namespace:
         "-r",
         "--reset",
         action="store_true",
-        help="Delete the session folder and temporary files and kill"
-        " all chrome processes. Can help resolve issues.",
+        help="Delete the session folder and temporary files and stop"
+        " the chrome processes using the sessions. Can help resolve issues.",
+    )
+    parser.add_argument(
+        "-cs",
+        "--compact-sessions",
+        action="store_true",
+        help="Prune the cache directories of all sessions and remove locks left by"
+        " crashed chrome processes, keeping cookies and login state.",
+    )
+    parser.add_argument(
+        "-H",
+        "--history",
+        type=int,
+        nargs="?",
+        const=30,
+        default=None,
+        metavar="DAYS",
+        help="Print the points earned each day over the last DAYS days (default: 30)"
+        " and the estimated time to reach the redeem goal, then exit."
+        " Only for the account given with --email if any.",
+    )
+    parser.add_argument(
+        "-tb",
+        "--time-budget",
+        type=float,
+        default=None,
+        metavar="MINUTES",
+        help="Finish the run within MINUTES, doing the work that earns the most points"
+        " per second first and leaving the rest for a later run",
     )
     return parser.parse_args()
 
@@ -547,6 +770,8 @@ def commandLineArgumentsAsConfig(args: Namespace) -> Config:
     if args.searchtype:
         config.search = Config()
         config.search.type = args.searchtype
+    if args.time_budget:
+        config["time-budget"] = args.time_budget
     if args.email and args.password:
         account = Config(
             email=args.email,
@@ -644,29 +869,149 @@ def createEmptyConfig(configPath: Path, config: Config) -> None:
 
 def resetBot():
     """
-    Delete the session folder and temporary files and kill all chrome processes.
+    Stop the chrome processes using the sessions, and delete the session folder and
+    temporary files.
     """
 
     sessionPath = getProjectRoot() / "sessions"
+    result = sweepOrphanProcesses(sessionPath)
+    print(
+        f"Stopped {result.stopped} chrome processes, reclaiming {formatSize(result.memory)}"
+    )
     if sessionPath.exists():
         print(f"Deleting sessions folder '{sessionPath}'")
         shutil.rmtree(sessionPath)
 
+    checkpointsPath = getProjectRoot() / "logs" / "checkpoints"
+    if checkpointsPath.exists():
+        print(f"Deleting checkpoints folder '{checkpointsPath}'")
+        shutil.rmtree(checkpointsPath)
+
     filesToDeletePaths = (
         getProjectRoot() / "google_trends.bak",
         getProjectRoot() / "google_trends.dat",
         getProjectRoot() / "google_trends.dir",
         getProjectRoot() / "logs" / "previous_points_data.json",
+        getProjectRoot() / "logs" / "previous_points_data.json.bak",
+        getProjectRoot() / "logs" / "wait_statistics.json",
+        getProjectRoot() / "logs" / "task_timings.json",
     )
     for path in filesToDeletePaths:
         print(f"Deleting file '{path}'")
         path.unlink(missing_ok=True)
 
-    for proc in psutil.process_iter(["pid", "name"]):
-        if proc.info["name"] == "chrome.exe":
-            proc.kill()
+    sys.exit()
+
+
+def compactSessions():
+    """
+    Prune the cache directories of all sessions, keeping cookies and login state.
+    """
+
+    sessionsPath = getProjectRoot() / "sessions"
+    if not sessionsPath.exists():
+        print(f"No sessions folder found at '{sessionsPath}'")
+        sys.exit()
 
-    print("All chrome processes killed")
+    reclaimed = 0
+    for sessionPath in sorted(sessionsPath.iterdir()):
+        if not sessionPath.is_dir():
+            continue
+        result = compactSession(sessionPath)
+        if result is None:
+            print(f"Skipping '{sessionPath.name}', it's in use by a running chrome")
+            continue
+        print(
+            f"Compacted '{sessionPath.name}' from {formatSize(result.sizeBefore)}"
+            f" to {formatSize(result.sizeAfter)}"
+            + (" (removed stale lock)" if result.removedLock else "")
+        )
+        reclaimed += result.reclaimed
+
+    print(f"Reclaimed {formatSize(reclaimed)}")
+    sys.exit()
+
+
+def getPointsHistory() -> PointsHistory:
+    return PointsHistory(getProjectRoot() / "logs" / "points_history.db")
+
+
+def getRunCheckpoint(email: str) -> RunCheckpoint:
+    return RunCheckpoint(getProjectRoot() / "logs" / "checkpoints" / f"{email}.json")
+
+
+def getWatchdog() -> Watchdog:
+    return Watchdog(
+        getProjectRoot() / "logs" / "watchdog",
+        CONFIG.watchdog.deadlines if CONFIG.watchdog.enabled else {},
+    )
+
+
+def getRunReport() -> RunReport:
+    return RunReport(getProjectRoot() / "logs" / "run_report.json")
+
+
+def getMemorySampler() -> MemorySampler:
+    # The ceiling needs the memory of each phase even if it isn't reported
+    return MemorySampler(
+        bool(CONFIG.memory.sample or CONFIG.memory.ceiling), CONFIG.memory.interval
+    )
+
+
+def getWaitStatistics() -> WaitStatistics:
+    return WaitStatistics(
+        getProjectRoot() / "logs" / "wait_statistics.json",
+        margin=CONFIG.get("waits.margin"),
+        minimum=CONFIG.get("waits.minimum"),
+        minCapFraction=CONFIG.get("waits.min-cap-fraction"),
+    )
+
+
+def getTaskTimings() -> TaskTimings:
+    # Activities, searches and articles each wait a cooldown afterward
+    cooldownTime = (CONFIG.cooldown.min + CONFIG.cooldown.max) / 2
+    return TaskTimings(
+        getProjectRoot() / "logs" / "task_timings.json",
+        {
+            "default": 10,
+            BROWSER_START: 60,
+            "activities": 30 + cooldownTime,
+            "punch-cards": 120,
+            "desktop-searches": 10 + cooldownTime,
+            "read-to-earn": 10 * (5 + cooldownTime),
+            "mobile-searches": 10 + cooldownTime,
+        },
+    )
+
+
+def printPointsHistory(days: int, email: str | None = None):
+    """
+    Print the points earned each day and the estimated time to reach the redeem goal.
+    """
+
+    pointsHistory = getPointsHistory()
+    accounts = [email] if email else pointsHistory.accounts()
+    if not accounts:
+        print("No points history found")
+    for account in accounts:
+        balance = pointsHistory.lastBalance(account)
+        if balance is None:
+            print(f"No points history found for '{account}'")
+            continue
+        print(f"{account}: {balance:,} points")
+        for dailyDelta in pointsHistory.dailyDeltas(account, days):
+            print(
+                f"  {dailyDelta.date.isoformat()}"
+                f" {dailyDelta.delta:>+8,} {dailyDelta.balance:>10,}"
+            )
+        goalEta = pointsHistory.goalEta(account, days)
+        if goalEta is None:
+            continue
+        if goalEta.days is None:
+            eta = "not reachable at the current pace"
+        else:
+            eta = f"{goalEta.days} day(s) at {goalEta.averageDailyDelta:,.0f} points/day"
+        print(f"  Goal: {goalEta.remaining:,} of {goalEta.goal:,} points remaining, {eta}")
     sys.exit()
 
 
@@ -685,6 +1030,12 @@ def loadConfig(configFilename="config.yaml") -> Config:
     if args.reset:
         resetBot()
 
+    if args.compact_sessions:
+        compactSessions()
+
+    if args.history is not None:
+        printPointsHistory(args.history, args.email)
+
     config = DEFAULT_CONFIG | Config.fromYaml(configFile) | args_config
 
     if config.rtfr:
@@ -736,34 +1087,110 @@ from typing import TypeVar
 T = TypeVar("T", bound=Session)
 
 
-def makeRequestsSession(session: T = requests.session()) -> T:
-    retry = Retry(
-        total=CONFIG.retries.max,
-        backoff_factor=CONFIG.get("retries.backoff-factor"),
-        status_forcelist=[
-            500,
-            502,
-            503,
-            504,
-        ],
+class RetryingHTTPAdapter(HTTPAdapter):
+    """
+    Retries connection errors and server errors with a `RetryPolicy`, so that requests
+    made in an operation that is already retried aren't retried twice.
+
+    Only idempotent requests are retried, like urllib3 does by default: a POST reporting
+    an activity could otherwise be credited twice.
+    """
+
+    RETRY_STATUSES = (500, 502, 503, 504)
+    RETRY_METHODS = frozenset(Retry.DEFAULT_ALLOWED_METHODS)
+
+    class ServerError(Exception):
+        def __init__(self, response: requests.Response):
+            super().__init__(f"HTTP {response.status_code}")
+            self.response = response
+
+    def send(self, request, **kwargs) -> requests.Response:
+        if request.method not in self.RETRY_METHODS:
+            return super().send(request, **kwargs)
+        failed: list[requests.Response] = []
+
+        def sendOnce(_: int) -> requests.Response:
+            # Releases the connection of the response thrown away
+            while failed:
+                failed.pop().close()
+            response = super(RetryingHTTPAdapter, self).send(request, **kwargs)
+            if response.status_code in self.RETRY_STATUSES:
+                failed.append(response)
+                raise RetryingHTTPAdapter.ServerError(response)
+            return response
+
+        try:
+            return getRetryPolicy("http", backoffFactor=1, deadline=60).run(
+                sendOnce,
+                retryOn=(
+                    requests.ConnectionError,
+                    requests.Timeout,
+                    RetryingHTTPAdapter.ServerError,
+                ),
+            )
+        except RetryingHTTPAdapter.ServerError as e:
+            return e.response
+
+
+def getRetryPolicy(
+    name: str,
+    backoffFactor: float | None = None,
+    deadline: float | None = None,
+    maxRetries: int | None = None,
+) -> RetryPolicy:
+    """
+    Returns a retry policy with the configured number of retries and strategy.
+
+    Args:
+        backoffFactor: the base delay, if not the configured `retries.backoff-factor`.
+        deadline: the maximal time, in seconds, spent on the operation.
+        maxRetries: the number of retries, if not the configured `retries.max`.
+    """
+    return RetryPolicy(
+        name,
+        maxRetries=CONFIG.retries.max if maxRetries is None else maxRetries,
+        backoffFactor=(
+            CONFIG.get("retries.backoff-factor") if backoffFactor is None else backoffFactor
+        ),
+        strategy=RetriesStrategy[CONFIG.retries.strategy],
+        jitter=Jitter[CONFIG.retries.jitter],
+        deadline=deadline,
+        sleep=WATCHDOG.sleep,
     )
-    session.mount(
-        "https://", HTTPAdapter(max_retries=retry)
-    )  # See https://stackoverflow.com/a/35504626/4164390 to finetune
-    session.mount(
-        "http://", HTTPAdapter(max_retries=retry)
-    )  # See https://stackoverflow.com/a/35504626/4164390 to finetune
+
+
+def makeRequestsSession(session: T = requests.session()) -> T:
+    session.mount("https://", RetryingHTTPAdapter())
+    session.mount("http://", RetryingHTTPAdapter())
     return session
 
 
-def cooldown() -> None:
+def cooldown(background: bool = False) -> None:
+    """
+    Args:
+        background: whether it's called from a worker thread rather than a phase, so
+        that the watchdog deadlines of the phases aren't pushed back.
+    """
     if sys.gettrace():
         logging.info("[DEBUGGER] Debugger is attached, skipping cooldown.")
         return
 
     cooldownTime = random.randint(CONFIG.cooldown.min, CONFIG.cooldown.max)
     logging.info(f"[COOLDOWN] Waiting for {cooldownTime} seconds")
-    time.sleep(cooldownTime)
+    IDLE_TASKS.submit("save-statistics", saveStatistics)
+    if background:
+        IDLE_TASKS.sleep(cooldownTime)
+    else:
+        WATCHDOG.sleep(cooldownTime, IDLE_TASKS.sleep)
+
+
+def saveStatistics() -> None:
+    """
+    Saves what the run learned so far, so that a crash doesn't lose it.
+    """
+    WAIT_STATISTICS.save()
+    TASK_TIMINGS.save()
+    RUN_REPORT.save()
 
 
 def isValidCountryCode(countryCode: str) -> bool:
@@ -872,19 +1299,64 @@ def getLanguageCountry() -> tuple[str, str]:
 
 # todo Could remove this functionality in favor of https://pypi.org/project/translate/
 # That's assuming all activity titles are in English
-def load_localized_activities(language: str) -> ModuleType:
+def load_localized_activities(language: str) -> LocalizedActivities:
+    """
+    Loads the localized activities of the given language.
+
+    Raises:
+        FileNotFoundError: if there are no localized activities for this language.
+        CatalogError: if the localized activities aren't valid.
+    """
+    return loadCatalog(getProjectRoot() / "localized_activities" / f"{language}.json")
+
+
+@functools.cache
+def getTokenCache() -> TokenCache | None:
+    """
+    Returns the cache of the mobile app tokens, with its key generated on first use if
+    none is configured.
+    """
+    if not CONFIG.tokens.cache:
+        return None
+    key = CONFIG.tokens.key
+    return TokenCache(
+        getProjectRoot() / "sessions",
+        key.encode() if key else loadKey(getProjectRoot() / "token.key"),
+    )
+
+
+@functools.cache
+def getActivityTitles() -> ActivityTitleIndex:
+    """
+    Returns the index of the localized activities for the configured language,
+    loaded on first use.
+    """
+    language = LANGUAGE.split("-")[0]
     try:
-        search_module = importlib.import_module(f"localized_activities.{language}")
-        return search_module
-    except ModuleNotFoundError:
-        logging.warning(f"No search queries found for language: {language}, defaulting to English (en)")
-        return importlib.import_module("localized_activities.en")
+        localizedActivities = load_localized_activities(language)
+    except FileNotFoundError:
+        logging.warning(
+            f"No search queries found for language: {language}, defaulting to English (en)"
+        )
+        localizedActivities = load_localized_activities("en")
+    return ActivityTitleIndex(
+        localizedActivities.title_to_query,
+        localizedActivities.ignore,
+        normalizedTitles=localizedActivities.normalized_titles,
+    )
+
 
 CONFIG = loadConfig()
 APPRISE = initApprise()
+REPORTER = Reporter(APPRISE, CONFIG.apprise.timeout)
+POINTS_HISTORY = getPointsHistory()
+WAIT_STATISTICS = getWaitStatistics()
+WATCHDOG = getWatchdog()
+RUN_REPORT = getRunReport()
+MEMORY_SAMPLER = getMemorySampler()
+TASK_TIMINGS = getTaskTimings()
+IDLE_TASKS = IdleTasks()
+atexit.register(REPORTER.flush)
+atexit.register(WAIT_STATISTICS.save)
+atexit.register(TASK_TIMINGS.save)
 LANGUAGE, COUNTRY = getLanguageCountry()
-localized_activities = load_localized_activities(
-    LANGUAGE.split("-")[0] if "-" in LANGUAGE else LANGUAGE
-)
-ACTIVITY_TITLES_TO_QUERIES = localized_activities.title_to_query
-IGNORED_ACTIVITIES = localized_activities.ignore
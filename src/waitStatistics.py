@@ -0,0 +1,121 @@
+import json
+import logging
+import math
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from urllib.parse import urlsplit
+
+
+class WaitStatistics:
+    """
+    Rolling latencies of the waits on elements, by page and selector, persisted between
+    runs, to derive deadlines from how long an element usually takes to appear.
+
+    A wait that times out before its cap is recorded with the deadline it reached, so
+    the deadline grows back when a page gets slower instead of failing repeatedly.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        window: int = 50,
+        percentile: float = 95,
+        margin: float = 3.0,
+        minimum: float = 2.0,
+        minCapFraction: float = 0.5,
+        minSamples: int = 5,
+        maxKeys: int = 500,
+    ):
+        """
+        Args:
+            window: the number of latencies kept per key.
+            margin: the factor applied to the percentile to get the deadline.
+            minimum: the shortest deadline, in seconds.
+            minCapFraction: the shortest deadline, as a fraction of the cap of the wait,
+            so that a single slow load after fast ones doesn't time out at once.
+            minSamples: the number of latencies needed before adapting the deadline.
+            maxKeys: the number of keys kept, the least recently used are dropped.
+        """
+        self.path = path
+        self.window = window
+        self.percentile = percentile
+        self.margin = margin
+        self.minimum = minimum
+        self.minCapFraction = minCapFraction
+        self.minSamples = minSamples
+        self.maxKeys = maxKeys
+        self._samples: dict[str, deque[float]] | None = None
+        self._changed = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, by: str, selector: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.netloc}{parts.path} {by}={selector}"
+
+    @property
+    def samples(self) -> dict[str, deque[float]]:
+        if self._samples is None:
+            self._samples = {}
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    for key, latencies in json.load(file).items():
+                        self._samples[key] = deque(latencies, maxlen=self.window)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, TypeError, AttributeError):
+                logging.warning(
+                    f"[WAITS] Ignoring unreadable wait statistics '{self.path}'"
+                )
+        return self._samples
+
+    def record(self, key: str, latency: float) -> None:
+        with self._lock:
+            latencies = self.samples.pop(key, None) or deque(maxlen=self.window)
+            latencies.append(round(latency, 3))
+            self.samples[key] = latencies
+            self._changed = True
+
+    def latencyPercentile(self, key: str) -> float | None:
+        """
+        Returns:
+            float | None: the configured percentile of the latencies of the key, None if
+            there are too few of them.
+        """
+        with self._lock:
+            latencies = sorted(self.samples.get(key, ()))
+        if len(latencies) < self.minSamples:
+            return None
+        rank = math.ceil(self.percentile / 100 * len(latencies))
+        return latencies[max(rank, 1) - 1]
+
+    def deadline(self, key: str, cap: float) -> float:
+        """
+        Returns:
+            float: the deadline of a wait on the key, never longer than `cap`.
+        """
+        percentile = self.latencyPercentile(key)
+        if percentile is None:
+            return cap
+        floor = max(self.minimum, cap * self.minCapFraction)
+        return min(cap, max(floor, percentile * self.margin))
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._changed:
+                return
+            samples = list(self.samples.items())[-self.maxKeys :]
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporaryPath = self.path.with_suffix(f".{os.getpid()}.tmp")
+                with open(temporaryPath, "w", encoding="utf-8") as file:
+                    json.dump({key: list(value) for key, value in samples}, file)
+                os.replace(temporaryPath, self.path)
+                self._changed = False
+            except OSError:
+                logging.warning(
+                    f"[WAITS] Could not save the wait statistics to '{self.path}'",
+                    exc_info=True,
+                )
@@ -0,0 +1,203 @@
+import contextlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+import psutil
+
+if TYPE_CHECKING:
+    from src.browser import Browser
+
+
+class PhaseTimeout(Exception):
+    """
+    Raised when a phase passed its deadline and the watchdog killed its browser.
+    """
+
+
+@dataclass
+class WatchedPhase:
+    name: str
+    timeout: float
+    deadline: float
+    """
+    `time.monotonic` time at which the phase expires
+    """
+    browser: "Browser"
+    expired: bool = False
+
+
+def killProcessTree(pids: Iterable[int], timeout: float = 5) -> list[psutil.Process]:
+    """
+    Kills the processes and all their descendants.
+
+    Returns:
+        list[psutil.Process]: the processes that were killed.
+    """
+    processes: list[psutil.Process] = []
+    for pid in pids:
+        with contextlib.suppress(psutil.Error):
+            process = psutil.Process(pid)
+            processes.extend([process, *process.children(recursive=True)])
+    for process in processes:
+        with contextlib.suppress(psutil.Error):
+            process.kill()
+    psutil.wait_procs(processes, timeout=timeout)
+    return processes
+
+
+class Watchdog:
+    """
+    Background thread that kills the browser of a phase that runs past its deadline,
+    after saving what it can of the page to investigate, so that a hung Chrome or
+    chromedriver can't stall the whole run.
+
+    Time spent in `Watchdog.sleep` isn't counted, so the deadlines only bound the time
+    spent actually working, not the cooldowns between searches and activities.
+    """
+
+    def __init__(
+        self,
+        diagnosticsPath: Path,
+        deadlines: dict[str, float],
+        captureTimeout: float = 15,
+    ):
+        """
+        Args:
+            deadlines: the deadline of each phase, in seconds, or of any phase under
+            the "default" key.
+            captureTimeout: how long to wait for the diagnostics of a hung browser.
+        """
+        self.diagnosticsPath = diagnosticsPath
+        self.deadlines = deadlines
+        self.captureTimeout = captureTimeout
+        self._phases: list[WatchedPhase] = []
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def deadlineFor(self, name: str) -> float | None:
+        return self.deadlines.get(name, self.deadlines.get("default"))
+
+    @contextlib.contextmanager
+    def phase(self, name: str, browser: "Browser") -> Iterator[None]:
+        """
+        Watches the block, killing the browser if it doesn't finish in time.
+
+        Raises:
+            PhaseTimeout: if the browser was killed.
+        """
+        timeout = self.deadlineFor(name)
+        if not timeout:
+            yield
+            return
+
+        watched = WatchedPhase(name, timeout, time.monotonic() + timeout, browser)
+        with self._condition:
+            self._phases.append(watched)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._watch, name="watchdog", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        try:
+            yield
+        except Exception as e:
+            if watched.expired:
+                raise PhaseTimeout(f"{name} didn't finish within {timeout}s") from e
+            raise
+        finally:
+            with self._condition:
+                self._phases.remove(watched)
+                self._condition.notify()
+        if watched.expired:
+            raise PhaseTimeout(f"{name} didn't finish within {timeout}s")
+
+    def sleep(
+        self, seconds: float, sleep: Callable[[float], None] = time.sleep
+    ) -> None:
+        """
+        Sleeps without counting the time against the deadlines of the current phases.
+
+        Args:
+            sleep: sleeps for the given seconds, like `IdleTasks.sleep`.
+        """
+        with self._condition:
+            for watched in self._phases:
+                watched.deadline += seconds
+            self._condition.notify()
+        sleep(seconds)
+
+    def _watch(self) -> None:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                pending = [watched for watched in self._phases if not watched.expired]
+                expired = [watched for watched in pending if watched.deadline <= now]
+                if not expired:
+                    nextDeadline = min(
+                        (watched.deadline for watched in pending), default=None
+                    )
+                    self._condition.wait(
+                        None if nextDeadline is None else nextDeadline - now
+                    )
+                    continue
+                for watched in expired:
+                    watched.expired = True
+                # The phase's thread may need the lock to finish while the browser dies
+                self._condition.release()
+                try:
+                    for watched in expired:
+                        self._expire(watched)
+                finally:
+                    self._condition.acquire()
+
+    def _expire(self, watched: WatchedPhase) -> None:
+        if watched.browser.killed:
+            return
+        logging.error(
+            f"[WATCHDOG] {watched.name} didn't finish within {watched.timeout}s,"
+            " killing the browser"
+        )
+        try:
+            directory = self.captureDiagnostics(watched)
+            logging.error(f"[WATCHDOG] Diagnostics saved to '{directory}'")
+        except OSError:
+            logging.warning("[WATCHDOG] Could not save the diagnostics", exc_info=True)
+        watched.browser.kill()
+
+    def captureDiagnostics(self, watched: WatchedPhase) -> Path:
+        """
+        Saves the URL, a screenshot and the WebDriver logs of the browser, giving up on
+        what the hung browser can't provide within `captureTimeout`.
+        """
+        directory = (
+            self.diagnosticsPath / f"{datetime.now():%Y%m%d-%H%M%S}-{watched.name}"
+        )
+        directory.mkdir(parents=True, exist_ok=True)
+        webdriver = watched.browser.webdriver
+
+        def capture() -> None:
+            with contextlib.suppress(Exception):
+                (directory / "url.txt").write_text(
+                    webdriver.current_url, encoding="utf-8"
+                )
+            with contextlib.suppress(Exception):
+                webdriver.save_screenshot(str(directory / "screenshot.png"))
+            for logType in ("driver", "browser"):
+                with contextlib.suppress(Exception):
+                    entries = webdriver.get_log(logType)
+                    with open(
+                        directory / f"webdriver-{logType}.log", "w", encoding="utf-8"
+                    ) as logFile:
+                        logFile.writelines(json.dumps(entry) + "\n" for entry in entries)
+
+        thread = threading.Thread(target=capture, name="watchdog-capture", daemon=True)
+        thread.start()
+        thread.join(self.captureTimeout)
+        return directory
@@ -0,0 +1,115 @@
+"""
+Compares fetching the whole rewards dashboard with fetching the projections the bot
+uses, in bytes and milliseconds per call, on a synthetic dashboard of realistic size
+loaded in headless Chrome.
+
+    python -m test.benchmark_dashboardProjection
+"""
+
+import json
+import statistics
+import time
+
+from selenium import webdriver
+
+from src.dashboard import (
+    PROJECTION_SCRIPT,
+    USER_STATUS_PATHS,
+    Dashboard,
+    activitiesPaths,
+    allPaths,
+    dailySetKey,
+)
+
+
+def promotion(index: int) -> dict:
+    return {
+        "name": f"ENUS_promotion_{index}",
+        "offerId": f"offer_{index}",
+        "title": f"Promotion {index}",
+        "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+        "complete": index % 3 == 0,
+        "pointProgress": 0,
+        "pointProgressMax": 10,
+        "promotionType": "urlreward",
+        "destinationUrl": f"https://www.bing.com/search?q=promotion+{index}",
+        "imageUrl": f"https://rewards.bing.com/images/promotion_{index}.png",
+        "attributes": {
+            **{f"attribute_{key}": f"value {key} of {index}" for key in range(30)},
+            "destination": f"https://www.bing.com/search?q=promotion+{index}",
+            "is_unlocked": "True",
+        },
+    }
+
+
+def syntheticDashboard() -> dict:
+    counter = {"pointProgress": 30, "pointProgressMax": 90, "attributes": {}}
+    return {
+        "userStatus": {
+            "availablePoints": 12345,
+            "lifetimePoints": 123456,
+            "levelInfo": {"activeLevel": "Level2", "progress": 800, "benefits": [{}] * 20},
+            "redeemGoal": {"price": 6500, "title": "Gift card", "description": "x" * 500},
+            "counters": {
+                "pcSearch": [counter],
+                "mobileSearch": [counter],
+                "dailyPoint": [counter] * 10,
+            },
+        },
+        "dailySetPromotions": {
+            dailySetKey(): [promotion(index) for index in range(3)],
+            "01/01/2026": [promotion(index) for index in range(3)],
+        },
+        "morePromotions": [promotion(index) for index in range(40)],
+        "punchCards": [
+            {
+                "parentPromotion": promotion(100 + index),
+                "childPromotions": [promotion(200 + child) for child in range(10)],
+            }
+            for index in range(5)
+        ],
+        "promotionalItem": promotion(300),
+        "catalog": [promotion(1000 + index) for index in range(500)],
+        "streakPromotion": {"activityProgress": [promotion(2000)] * 30},
+    }
+
+
+def measure(driver, calls: int, script: str, *args) -> tuple[int, float]:
+    durations = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        result = driver.execute_script(script, *args)
+        durations.append((time.perf_counter() - start) * 1000)
+    return len(json.dumps(result, separators=(",", ":"))), statistics.median(durations)
+
+
+def main(calls: int = 20) -> None:
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    driver = webdriver.Chrome(options=options)
+    try:
+        driver.execute_script(
+            "window.dashboard = JSON.parse(arguments[0])", json.dumps(syntheticDashboard())
+        )
+        cases = {
+            "full": ("return dashboard",),
+            "user status": (PROJECTION_SCRIPT, list(USER_STATUS_PATHS)),
+            "activities": (PROJECTION_SCRIPT, [*USER_STATUS_PATHS, *activitiesPaths()]),
+            "all used fields": (PROJECTION_SCRIPT, [*USER_STATUS_PATHS, *allPaths()]),
+        }
+        # The projections must parse like the whole dashboard
+        full = Dashboard.fromDict(driver.execute_script("return dashboard"))
+        assert Dashboard.fromDict(driver.execute_script(*cases["all used fields"])) == full
+
+        print(f"{'fetch':<16} {'bytes':>10} {'ms/call':>8}  (median of {calls} calls)")
+        for name, arguments in cases.items():
+            size, milliseconds = measure(driver, calls, *arguments)
+            print(f"{name:<16} {size:>10} {milliseconds:>8.1f}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Compares the page load strategies, in milliseconds per navigation until the page is
+ready for the bot, on local pages standing for the rewards dashboard and Bing, whose
+third-party scripts take `SLOW_RESOURCE_SECONDS` to load, in headless Chrome.
+
+    python -m test.benchmark_navigation
+"""
+
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from selenium import webdriver
+from selenium.webdriver.support.wait import WebDriverWait
+
+from src.navigation import (
+    PAGE_LOAD_STRATEGIES,
+    PERFORMANCE_LOG_PREFS,
+    SEARCH_BOX_READY,
+    SEARCH_RESULTS_READY,
+    dashboardLoaded,
+    enableLifecycleEvents,
+    lifecycleTimings,
+)
+
+SLOW_RESOURCE_SECONDS = 1.5
+
+THIRD_PARTY = '<script async src="/third-party.js"></script>'
+PAGES = {
+    "/rewards": f"""<html><head>{THIRD_PARTY}</head><body>
+        <script>var dashboard = {{"userStatus": {{"availablePoints": 12345}}}};</script>
+        </body></html>""",
+    "/search": f"""<html><head>{THIRD_PARTY}</head><body>
+        <form><input id="sb_form_q" name="q"></form></body></html>""",
+    "/results": f"""<html><head>{THIRD_PARTY}</head><body>
+        <form><input id="sb_form_q" name="q"></form>
+        <ol id="b_results">{"<li>result</li>" * 50}</ol></body></html>""",
+}
+READY = {
+    "/rewards": dashboardLoaded,
+    "/search": SEARCH_BOX_READY,
+    "/results": SEARCH_RESULTS_READY,
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/third-party.js":
+            time.sleep(SLOW_RESOURCE_SECONDS)
+            body, contentType = b"", "text/javascript"
+        else:
+            body, contentType = PAGES[self.path].encode(), "text/html"
+        self.send_response(200)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(driver, url: str, ready, navigations: int) -> tuple[float, dict[str, float]]:
+    durations = []
+    lifecycles = []
+    for _ in range(navigations):
+        start = time.perf_counter()
+        driver.get(url)
+        WebDriverWait(driver, 30, poll_frequency=0.1).until(ready)
+        durations.append((time.perf_counter() - start) * 1000)
+        lifecycles.append(lifecycleTimings(driver))
+    lifecycle = {
+        name: statistics.median(timings[name] * 1000 for timings in lifecycles)
+        for name in ("DOMContentLoaded", "load")
+        if all(name in timings for timings in lifecycles)
+    }
+    return statistics.median(durations), lifecycle
+
+
+def main(navigations: int = 5) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print(
+        f"{'page':<10} {'strategy':<8} {'ready ms':>9} {'DCL ms':>8} {'load ms':>8}"
+        f"  (median of {navigations} navigations)"
+    )
+    try:
+        for strategy in PAGE_LOAD_STRATEGIES:
+            options = webdriver.ChromeOptions()
+            options.add_argument("--headless=new")
+            options.add_argument("--no-sandbox")
+            options.add_argument("--disable-dev-shm-usage")
+            options.page_load_strategy = strategy
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option("perfLoggingPrefs", PERFORMANCE_LOG_PREFS)
+            driver = webdriver.Chrome(options=options)
+            try:
+                enableLifecycleEvents(driver)
+                for path, ready in READY.items():
+                    milliseconds, lifecycle = measure(
+                        driver, base + path, ready, navigations
+                    )
+                    print(
+                        f"{path[1:]:<10} {strategy:<8} {milliseconds:>9.0f}"
+                        f" {lifecycle.get('DOMContentLoaded', float('nan')):>8.0f}"
+                        f" {lifecycle.get('load', float('nan')):>8.0f}"
+                    )
+            finally:
+                driver.quit()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Builders of the dashboard JSON, as the rewards page has it, for the tests.
+"""
+
+
+def promotion(name: str, complete: bool = False, points: int = 10, **fields) -> dict:
+    return {
+        "name": name,
+        "title": name.title(),
+        "complete": complete,
+        "pointProgressMax": points,
+        **fields,
+    }
+
+
+def searchCounter(progress: int, maximum: int) -> dict:
+    return {"pointProgress": progress, "pointProgressMax": maximum}
+
+
+def userStatus(
+    points: int = 1000,
+    pcSearch: tuple[int, int] = (0, 90),
+    mobileSearch: tuple[int, int] = (0, 60),
+    **fields,
+) -> dict:
+    return {
+        "availablePoints": points,
+        "levelInfo": {"activeLevel": "Level2"},
+        "counters": {
+            "pcSearch": [searchCounter(*pcSearch)],
+            "mobileSearch": [searchCounter(*mobileSearch)],
+        },
+        **fields,
+    }
@@ -0,0 +1,86 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.activityCatalog import CatalogError, loadCatalog
+from src.utils import getProjectRoot
+
+CATALOGS_PATH = getProjectRoot() / "localized_activities"
+
+
+class TestActivityCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.catalogPath = Path(self.tempDir.name) / "xx.json"
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def writeCatalog(self, catalog):
+        self.catalogPath.write_text(json.dumps(catalog), encoding="utf-8")
+
+    def test_all_catalogs_share_the_same_keys(self):
+        catalogPaths = sorted(CATALOGS_PATH.glob("*.json"))
+        self.assertIn(CATALOGS_PATH / "en.json", catalogPaths)
+        reference = loadCatalog(CATALOGS_PATH / "en.json")
+
+        for catalogPath in catalogPaths:
+            with self.subTest(catalog=catalogPath.name):
+                catalog = loadCatalog(catalogPath)
+                self.assertEqual(
+                    set(catalog.title_to_query), set(reference.title_to_query)
+                )
+                self.assertEqual(set(catalog.ignore), set(reference.ignore))
+
+    def test_invalid_catalogs_are_rejected(self):
+        for catalog in (
+            [],
+            {"title_to_query": {}},
+            {"title_to_query": {}, "ignore": [], "extra": 1},
+            {"title_to_query": {"Title": []}, "ignore": []},
+            {"title_to_query": {"Title": ["query", ""]}, "ignore": []},
+            {"title_to_query": {}, "ignore": ["Title", "Title"]},
+        ):
+            with self.subTest(catalog=catalog):
+                self.writeCatalog(catalog)
+                with self.assertRaises(CatalogError):
+                    loadCatalog(self.catalogPath)
+
+    def test_compiled_catalog_is_cached_by_content(self):
+        self.writeCatalog({"title_to_query": {"A Title": ["query"]}, "ignore": []})
+
+        catalog = loadCatalog(self.catalogPath)
+        cachePaths = list((self.catalogPath.parent / "__pycache__").glob("xx.*.json"))
+
+        self.assertEqual(catalog.normalized_titles, {"A Title": "a title"})
+        self.assertEqual(len(cachePaths), 1)
+        self.assertEqual(loadCatalog(self.catalogPath), catalog)
+
+        self.writeCatalog({"title_to_query": {"B Title": ["query"]}, "ignore": []})
+
+        self.assertIn("B Title", loadCatalog(self.catalogPath).title_to_query)
+        self.assertNotIn(
+            cachePaths[0], (self.catalogPath.parent / "__pycache__").glob("xx.*.json")
+        )
+
+    def test_compiled_catalog_is_cached_by_normalizer(self):
+        self.writeCatalog({"title_to_query": {"A Title": ["query"]}, "ignore": []})
+        loadCatalog(self.catalogPath)
+        cacheDirectory = self.catalogPath.parent / "__pycache__"
+        cachePaths = list(cacheDirectory.glob("xx.*.json"))
+
+        with patch("src.activityCatalog.NORMALIZER_SOURCE", b"changed normalizer"):
+            loadCatalog(self.catalogPath)
+
+        self.assertEqual(len(cachePaths), 1)
+        self.assertNotIn(cachePaths[0], cacheDirectory.glob("xx.*.json"))
+
+    def test_missing_catalog(self):
+        with self.assertRaises(FileNotFoundError):
+            loadCatalog(self.catalogPath)
+
+
+if __name__ == "__main__":
+    unittest.main()
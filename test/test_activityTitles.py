@@ -0,0 +1,59 @@
+import unittest
+
+from src.activityTitles import ActivityTitleIndex, normalizeTitle
+
+
+class TestActivityTitleIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = ActivityTitleIndex(
+            {
+                "Find places to stay": ["hotels rome italy"],
+                "Who won?": ["braves score"],
+            },
+            {"Bing app search"},
+        )
+
+    def test_normalize_title(self):
+        self.assertEqual(
+            normalizeTitle("\u200bFind\xa0places  to STAY "), "find places to stay"
+        )
+
+    def test_exact_match(self):
+        match = self.index.match("find places\xa0to stay")
+
+        self.assertTrue(match.exact)
+        self.assertEqual(match.key, "Find places to stay")
+        self.assertEqual(match.queries, ["hotels rome italy"])
+        self.assertEqual(self.index.nearMissesReport(), [])
+
+    def test_ignored(self):
+        self.assertTrue(self.index.isIgnored("Bing App Search"))
+        self.assertIsNone(self.index.queriesFor("Bing App Search"))
+
+    def test_prefix_match(self):
+        match = self.index.match("Find places to stay this weekend")
+
+        self.assertEqual(match.key, "Find places to stay")
+        self.assertFalse(match.exact)
+
+    def test_fuzzy_match_is_reported(self):
+        match = self.index.match("Find place to stay")
+
+        self.assertEqual(match.key, "Find places to stay")
+        self.assertEqual(len(self.index.nearMissesReport()), 1)
+
+    def test_no_match(self):
+        match = self.index.match("Completely unrelated activity")
+
+        self.assertIsNone(match.key)
+        self.assertIsNone(match.queries)
+        self.assertFalse(match.ignored)
+
+    def test_match_is_cached(self):
+        self.assertIs(
+            self.index.match("Find place to stay"), self.index.match("Find place to stay")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from src.activityTitles import ActivityTitleIndex
+from src.dailyPlan import READ_TO_EARN_POINTS, planDay
+from src.dashboard import Dashboard
+from src.runCheckpoint import PHASES, RunCheckpoint
+from test.dashboardFixtures import promotion, userStatus
+
+DAY = date(2026, 3, 14)
+TITLES = ActivityTitleIndex({}, ["Ignored"])
+
+
+def dashboard(pcSearch: tuple[int, int] = (0, 90), mobileSearch=(0, 60)) -> Dashboard:
+    return Dashboard.fromDict(
+        {
+            "userStatus": userStatus(pcSearch=pcSearch, mobileSearch=mobileSearch),
+            "dailySetPromotions": {
+                "03/14/2026": [
+                    promotion("quiz", points=30),
+                    promotion("done", complete=True),
+                    promotion("locked", attributes={"is_unlocked": "False"}),
+                ]
+            },
+            "morePromotions": [
+                promotion("poll"),
+                promotion("zero", points=0),
+                promotion("ignored"),
+            ],
+            "punchCards": [
+                {
+                    "parentPromotion": promotion("card", points=100),
+                    "childPromotions": [promotion("step 1", True), promotion("step 2")],
+                },
+                {
+                    "parentPromotion": promotion("finished card", True, 100),
+                    "childPromotions": [promotion("step", True)],
+                },
+            ],
+            "promotionalItem": promotion(
+                "promo", points=100, destinationUrl="https://www.bing.com/search"
+            ),
+        },
+        DAY,
+    )
+
+
+class TestDailyPlan(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = RunCheckpoint(Path(self.directory.name) / "checkpoint.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_plan(self):
+        plan = planDay(dashboard(), self.checkpoint, PHASES, TITLES)
+
+        self.assertEqual(
+            [task.description for task in plan.tasksFor("activities")],
+            ["'Quiz'", "'Poll'"],
+        )
+        self.assertEqual(
+            [task.points for task in plan.tasksFor("punch-cards")], [100, 100]
+        )
+        self.assertIn("(1 step(s) left)", plan.tasksFor("punch-cards")[1].description)
+        self.assertEqual(plan.tasksFor("desktop-searches")[0].describe(), "30 searches")
+        self.assertEqual(plan.tasksFor("mobile-searches")[0].points, 60)
+        self.assertEqual(
+            plan.expectedPoints, 40 + 200 + 90 + READ_TO_EARN_POINTS + 60
+        )
+        self.assertTrue(all(plan.hasWork(phase) for phase in PHASES))
+
+    def test_phases_without_work(self):
+        self.checkpoint.markDone("read-to-earn")
+        plan = planDay(
+            dashboard(pcSearch=(90, 90), mobileSearch=(60, 60)),
+            self.checkpoint,
+            ["activities", "desktop-searches", "read-to-earn", "mobile-searches"],
+            TITLES,
+        )
+
+        self.assertTrue(plan.hasWork("activities"))
+        self.assertFalse(plan.hasWork("desktop-searches"))
+        self.assertFalse(plan.hasWork("mobile-searches"))
+        self.assertNotIn("read-to-earn", plan.phases)
+        # Not planned, so not known to be empty
+        self.assertTrue(plan.hasWork("punch-cards"))
+        self.assertIn("desktop-searches: nothing to do", plan.describe())
+
+    def test_activities_done_earlier_are_left_out(self):
+        self.checkpoint.markActivityDone(dashboard().activities[0])
+
+        plan = planDay(dashboard(), self.checkpoint, ["activities"], TITLES)
+
+        self.assertEqual(
+            [task.description for task in plan.tasksFor("activities")], ["'Poll'"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+import json
+import unittest
+from datetime import date
+
+from selenium import webdriver
+
+from src.dashboard import (
+    PROJECTION_SCRIPT,
+    USER_STATUS_PATHS,
+    Dashboard,
+    DashboardError,
+    Promotion,
+    UserStatus,
+    activitiesPaths,
+    activityProgress,
+    allPaths,
+)
+from src.eligibility import isPromotionalItemDoable
+from test.dashboardFixtures import promotion, searchCounter, userStatus
+
+DAY = date(2026, 3, 14)
+
+
+def dashboardDict() -> dict:
+    status = userStatus(
+        12345,
+        (30, 90),
+        (60, 60),
+        levelInfo={"activeLevel": "Level2", "progress": 800},
+        redeemGoal={"price": 6500, "title": "Gift card"},
+    )
+    status["counters"]["dailyPoint"] = [searchCounter(0, 10)]
+    return {
+        "userStatus": status,
+        "dailySetPromotions": {
+            "03/13/2026": [promotion("yesterday", True)],
+            "03/14/2026": [
+                promotion(
+                    "daily_quiz",
+                    points=30,
+                    title="Daily quiz",
+                    pointProgress=0,
+                    promotionType="quiz",
+                    attributes={"is_unlocked": "False", "destination": "https://x/"},
+                )
+            ],
+        },
+        "morePromotions": [
+            {"offerId": "more_1", "title": "More", "complete": True, "pointProgressMax": 5}
+        ],
+        "punchCards": [
+            {"parentPromotion": None, "childPromotions": []},
+            {
+                "parentPromotion": promotion(
+                    "card", points=100, attributes={"destination": "https://card/"}
+                ),
+                "childPromotions": [promotion("step", promotionType="urlreward")],
+            },
+        ],
+        "promotionalItem": promotion(
+            "promo",
+            points=100,
+            destinationUrl="https://www.bing.com/",
+            attributes={"destination": "https://example.com/elsewhere"},
+        ),
+        "catalog": {"unused": ["x" * 100] * 100},
+    }
+
+
+class TestDashboard(unittest.TestCase):
+    def test_parse(self):
+        dashboard = Dashboard.fromDict(dashboardDict(), DAY)
+
+        self.assertEqual(dashboard.userStatus.availablePoints, 12345)
+        self.assertEqual(dashboard.userStatus.goalPoints, 6500)
+        self.assertEqual(dashboard.userStatus.counters.pcSearch[0].pointProgress, 30)
+        self.assertTrue(dashboard.userStatus.counters.mobileSearch[0].complete)
+        self.assertEqual(
+            [activity.id for activity in dashboard.activities], ["daily_quiz", "more_1"]
+        )
+        quiz = dashboard.dailySetPromotions[0]
+        self.assertFalse(quiz.isUnlocked)
+        self.assertEqual(quiz.destination, "https://x/")
+        self.assertIsNone(dashboard.punchCards[0].parentPromotion)
+        self.assertEqual(dashboard.punchCards[1].parentPromotion.destination, "https://card/")
+        self.assertEqual(dashboard.punchCards[1].childPromotions[0].promotionType, "urlreward")
+        self.assertEqual(dashboard.promotionalItem.destinationUrl, "https://www.bing.com/")
+        # Checked on its destinationUrl, like before both were parsed
+        self.assertTrue(isPromotionalItemDoable(dashboard.promotionalItem))
+
+    def test_models_have_slots(self):
+        dashboard = Dashboard.fromDict(dashboardDict(), DAY)
+
+        with self.assertRaises((AttributeError, TypeError)):
+            dashboard.userStatus.catalog = {}
+        self.assertFalse(hasattr(dashboard.promotionalItem, "__dict__"))
+
+    def test_optional_fields(self):
+        data = dashboardDict()
+        del data["userStatus"]["redeemGoal"]
+        del data["dailySetPromotions"]["03/14/2026"]
+        del data["punchCards"]
+        data["promotionalItem"] = None
+
+        dashboard = Dashboard.fromDict(data, DAY)
+
+        self.assertEqual(dashboard.userStatus.goalPoints, 0)
+        self.assertEqual(dashboard.activities, (dashboard.morePromotions[0],))
+        self.assertEqual(dashboard.punchCards, ())
+        self.assertIsNone(dashboard.promotionalItem)
+
+    def test_invalid_fields_are_named(self):
+        data = dashboardDict()
+        del data["userStatus"]["availablePoints"]
+        with self.assertRaisesRegex(DashboardError, r"dashboard\.userStatus\.availablePoints"):
+            Dashboard.fromDict(data, DAY)
+
+        data = dashboardDict()
+        data["morePromotions"][0]["complete"] = "yes"
+        with self.assertRaisesRegex(DashboardError, r"morePromotions\[0\]\.complete is a str"):
+            Dashboard.fromDict(data, DAY)
+
+        data = dashboardDict()
+        data["userStatus"]["counters"]["pcSearch"] = []
+        with self.assertRaisesRegex(DashboardError, "pcSearch is empty"):
+            Dashboard.fromDict(data, DAY)
+
+    def test_promotion_id(self):
+        self.assertEqual(
+            Promotion.fromDict({"title": "T", "complete": True, "pointProgressMax": 1}, "").id,
+            "T",
+        )
+
+    def test_activity_progress_matches_by_id(self):
+        def activity(name: str, progress: int, complete: bool = False) -> Promotion:
+            return Promotion(name.title(), complete, 10, progress, name=name)
+
+        before = [activity("quiz", 0), activity("poll", 0), activity("gone", 0)]
+        after = [activity("poll", 0), activity("new", 0), activity("quiz", 10, True)]
+
+        progress = activityProgress(before, after)
+
+        self.assertEqual(
+            [(activity.before.id, activity.pointsGained) for activity in progress],
+            [("quiz", 10), ("poll", 0), ("gone", 0)],
+        )
+        self.assertEqual(
+            [activity.incomplete for activity in progress], [False, True, False]
+        )
+        self.assertIsNone(progress[2].after)
+
+    def test_user_status_from_bing_info(self):
+        userStatus = UserStatus.fromBingInfo(
+            {
+                "userInfo": {"balance": 42, "profile": {"attributes": {"level": "Level1"}}},
+                "flyoutResult": {
+                    "userGoal": {"price": 100, "title": "Goal"},
+                    "userStatus": {
+                        "counters": {
+                            "PCSearch": [{"pointProgress": 3, "pointProgressMax": 30}]
+                        }
+                    },
+                },
+            }
+        )
+
+        self.assertEqual(userStatus.availablePoints, 42)
+        self.assertEqual(userStatus.activeLevel, "Level1")
+        self.assertEqual(userStatus.goalTitle, "Goal")
+        self.assertEqual(userStatus.counters.mobileSearch, ())
+
+
+class TestProjectionScript(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        try:
+            cls.webdriver = webdriver.Chrome(options=options)
+        except Exception as e:
+            raise unittest.SkipTest(f"Chrome is not available: {e}")
+        cls.webdriver.execute_script(
+            "window.dashboard = JSON.parse(arguments[0])", json.dumps(dashboardDict())
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.webdriver.quit()
+
+    def project(self, *paths: str) -> dict:
+        return self.webdriver.execute_script(PROJECTION_SCRIPT, list(paths))
+
+    def test_projection_parses_like_the_whole_dashboard(self):
+        projected = self.project(*USER_STATUS_PATHS, *allPaths(DAY))
+
+        self.assertNotIn("catalog", projected)
+        self.assertEqual(
+            Dashboard.fromDict(projected, DAY), Dashboard.fromDict(dashboardDict(), DAY)
+        )
+
+    def test_projection_keeps_only_the_paths(self):
+        projected = self.project(*USER_STATUS_PATHS, *activitiesPaths(DAY))
+
+        self.assertEqual(list(projected["dailySetPromotions"]), ["03/14/2026"])
+        self.assertNotIn("progress", projected["userStatus"]["levelInfo"])
+        self.assertNotIn("dailyPoint", projected["userStatus"]["counters"])
+        self.assertEqual(Dashboard.fromDict(projected, DAY).punchCards, ())
+
+    def test_overlapping_and_missing_paths(self):
+        self.assertEqual(
+            self.project("userStatus.redeemGoal.price", "userStatus.redeemGoal", "nope.x"),
+            {"userStatus": {"redeemGoal": {"price": 6500, "title": "Gift card"}}},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
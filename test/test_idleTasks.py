@@ -0,0 +1,53 @@
+import threading
+import time
+import unittest
+
+from src.idleTasks import IdleTasks
+
+
+class TestIdleTasks(unittest.TestCase):
+    def setUp(self):
+        self.idleTasks = IdleTasks()
+
+    def test_jobs_run_during_the_sleep_only(self):
+        done = threading.Event()
+        self.idleTasks.submit("job", done.set)
+
+        self.assertFalse(done.wait(0.1))
+        self.idleTasks.sleep(0.2)
+
+        self.assertTrue(done.is_set())
+        self.assertEqual(self.idleTasks.pending, [])
+
+    def test_sleep_lasts_as_long_with_slow_jobs(self):
+        self.idleTasks.submit("slow", time.sleep, 0.5)
+
+        start = time.monotonic()
+        self.idleTasks.sleep(0.1)
+
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertTrue(self.idleTasks.wait(2))
+
+    def test_jobs_of_the_same_name_are_queued_once(self):
+        calls = []
+        self.idleTasks.submit("job", calls.append, 1)
+        self.idleTasks.submit("job", calls.append, 2)
+        self.idleTasks.submit("other", calls.append, 3)
+
+        self.idleTasks.sleep(0.2)
+
+        self.assertEqual(calls, [2, 3])
+
+    def test_failing_job_does_not_stop_the_others(self):
+        done = threading.Event()
+        self.idleTasks.submit("failing", lambda: 1 / 0)
+        self.idleTasks.submit("job", done.set)
+
+        with self.assertLogs(level="ERROR"):
+            self.idleTasks.sleep(0.2)
+
+        self.assertTrue(done.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.login import Login
+
+
+class TestVerifiedSession(unittest.TestCase):
+    def login(self, mobile: bool, browserConfig: dict) -> Login:
+        browser = SimpleNamespace(
+            mobile=mobile,
+            browserType="mobile" if mobile else "desktop",
+            browserConfig=browserConfig,
+            userDataDir=Path("unused"),
+            webdriver=None,
+            utils=None,
+        )
+        return Login(browser)
+
+    @patch("src.login.saveBrowserConfig")
+    def test_verified_per_browser_type(self, _):
+        browserConfig = {}
+        self.login(False, browserConfig).saveVerifiedSession()
+
+        self.assertTrue(self.login(False, browserConfig).isSessionRecentlyVerified())
+        # Both share the session, but the mobile searches never load the rewards page
+        self.login(True, browserConfig).saveVerifiedSession()
+        self.assertFalse(self.login(True, browserConfig).isSessionRecentlyVerified())
+        self.assertEqual(set(browserConfig["loginVerifiedAt"]), {"desktop", "mobile"})
+
+    def test_time_saved_by_earlier_versions_is_ignored(self):
+        login = self.login(False, {"loginVerifiedAt": 1e12})
+
+        self.assertFalse(login.isSessionRecentlyVerified())
+
+
+if __name__ == "__main__":
+    unittest.main()
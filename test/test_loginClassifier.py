@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import MagicMock
+
+from selenium.common import TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+
+from src.loginClassifier import (
+    POST_PASSWORD_SCREENS,
+    classifyPage,
+    waitForScreen,
+)
+
+
+class TestLoginClassifier(unittest.TestCase):
+    def test_classify_page_is_a_single_script(self):
+        webdriver = MagicMock()
+        element = MagicMock()
+        webdriver.execute_script.return_value = ["totp", element]
+
+        self.assertEqual(
+            classifyPage(webdriver, POST_PASSWORD_SCREENS), ("totp", element)
+        )
+        webdriver.execute_script.assert_called_once()
+        screens = webdriver.execute_script.call_args.args[1]
+        self.assertEqual(
+            [screen["state"] for screen in screens],
+            ["totp", "other_ways", "post_login", "password_required"],
+        )
+
+    def test_wait_for_screen_polls_until_recognized(self):
+        webdriver = MagicMock()
+        webdriver.execute_script.side_effect = [None, None, ["post_login", None]]
+
+        state, element = waitForScreen(
+            WebDriverWait(webdriver, 5, poll_frequency=0.01), POST_PASSWORD_SCREENS
+        )
+
+        self.assertEqual(state, "post_login")
+        self.assertIsNone(element)
+        self.assertEqual(webdriver.execute_script.call_count, 3)
+
+    def test_wait_for_screen_times_out(self):
+        webdriver = MagicMock()
+        webdriver.execute_script.return_value = None
+
+        with self.assertRaises(TimeoutException):
+            waitForScreen(
+                WebDriverWait(webdriver, 0.05, poll_frequency=0.01),
+                POST_PASSWORD_SCREENS,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,13 @@
+import tempfile
 import unittest
+from concurrent.futures import Future
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import main
-from src.utils import Config, CONFIG, APPRISE
+from src.dailyPlan import DailyPlan, Task
+from src.runCheckpoint import RunCheckpoint
+from src.utils import Config, CONFIG, APPRISE, RUN_REPORT
 
 
 class TestMain(unittest.TestCase):
@@ -35,6 +40,59 @@ class TestMain(unittest.TestCase):
 
         mock_notify.assert_called()
 
+    @patch.object(main, "TASK_TIMINGS")
+    @patch.object(main, "Login")
+    @patch.object(main, "Browser")
+    def test_recycled_browser_keeps_the_background_earning(self, Browser, *_):
+        Browser.side_effect = lambda **_: MagicMock(backgroundEarning=None, killed=False)
+        session = main.BrowserSession(Config(email="recycled@example.com"), mobile=True)
+        reading = Future()
+
+        session.browser.backgroundEarning = reading
+        session.recycle()
+
+        self.assertIs(session.browser.backgroundEarning, reading)
+        session.browser.killed = True
+        self.assertIs(session.browser.backgroundEarning, reading)
+        self.assertEqual(Browser.call_count, 3)
+
+    @patch.object(main, "TASK_TIMINGS")
+    def test_background_phase_is_recorded_once_joined(self, _):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        checkpoint = RunCheckpoint(Path(directory.name) / "checkpoint.json")
+        plan = DailyPlan(
+            ("read-to-earn", "mobile-searches"),
+            [
+                Task("read-to-earn", "read articles in the app", 30),
+                Task("mobile-searches", "searches", 60, count=20),
+            ],
+        )
+        session = MagicMock(account=Config(email="background@example.com"))
+        reading = Future()
+        doneDuringSearches = []
+
+        def searches(_):
+            doneDuringSearches.append(checkpoint.isDone("read-to-earn"))
+            reading.set_result(None)
+
+        main.runPhases(
+            checkpoint,
+            plan,
+            session,
+            {"read-to-earn": lambda _: reading, "mobile-searches": searches},
+        )
+
+        self.assertEqual(doneDuringSearches, [False])
+        self.assertTrue(checkpoint.isDone("read-to-earn"))
+        self.assertEqual(
+            [
+                phase.status
+                for phase in RUN_REPORT.account("background@example.com").phases
+            ],
+            ["done", "done"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
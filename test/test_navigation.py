@@ -0,0 +1,64 @@
+import json
+import logging
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.navigation import lifecycleTimings
+from src.utils import Utils
+
+
+def lifecycleEntry(frameId: str, loaderId: str, name: str, timestamp: float) -> dict:
+    message = {
+        "method": "Page.lifecycleEvent",
+        "params": {
+            "frameId": frameId,
+            "loaderId": loaderId,
+            "name": name,
+            "timestamp": timestamp,
+        },
+    }
+    return {"message": json.dumps({"message": message, "webview": frameId})}
+
+
+class TestNavigation(unittest.TestCase):
+    def test_timings_of_the_last_navigation_of_the_top_frame(self):
+        webdriver = MagicMock()
+        webdriver.execute_cdp_cmd.return_value = {"frameTree": {"frame": {"id": "top"}}}
+        webdriver.get_log.return_value = [
+            lifecycleEntry("top", "previous", "init", 1.0),
+            lifecycleEntry("top", "previous", "load", 3.0),
+            lifecycleEntry("top", "last", "init", 10.0),
+            lifecycleEntry("iframe", "ad", "load", 10.2),
+            lifecycleEntry("top", "last", "DOMContentLoaded", 10.25),
+            {"message": json.dumps({"message": {"method": "Page.frameNavigated"}})},
+            lifecycleEntry("top", "last", "load", 11.5),
+        ]
+
+        self.assertEqual(
+            lifecycleTimings(webdriver),
+            {"init": 0.0, "DOMContentLoaded": 0.25, "load": 1.5},
+        )
+
+    def test_no_timings_without_events(self):
+        webdriver = MagicMock()
+        webdriver.get_log.return_value = []
+
+        self.assertEqual(lifecycleTimings(webdriver), {})
+
+    def test_lifecycle_is_read_only_while_debugging(self):
+        utils = Utils(MagicMock())
+        utils.lifecycleEvents = True
+        logger = logging.getLogger()
+        self.addCleanup(logger.setLevel, logger.level)
+
+        with patch("src.utils.lifecycleTimings") as timings:
+            logger.setLevel(logging.INFO)
+            utils.navigate("https://example.com")
+            timings.assert_not_called()
+            logger.setLevel(logging.DEBUG)
+            utils.navigate("https://example.com")
+            timings.assert_called_once_with(utils.webdriver)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from src.pointsHistory import PointsHistory
+
+
+class TestPointsHistory(unittest.TestCase):
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.logsPath = Path(self.tempDir.name)
+        self.pointsHistory = PointsHistory(self.logsPath / "points_history.db")
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_record_computes_delta_per_account(self):
+        self.assertEqual(self.pointsHistory.record("a@example.com", 1000), 0)
+        self.assertEqual(self.pointsHistory.record("b@example.com", 50), 0)
+        self.assertEqual(self.pointsHistory.record("a@example.com", 1150), 150)
+
+        self.assertEqual(self.pointsHistory.lastBalance("a@example.com"), 1150)
+        self.assertEqual(self.pointsHistory.lastBalance("b@example.com"), 50)
+        self.assertIsNone(self.pointsHistory.lastBalance("c@example.com"))
+        self.assertEqual(
+            self.pointsHistory.accounts(), ["a@example.com", "b@example.com"]
+        )
+
+    def test_daily_deltas_are_summed_per_day(self):
+        self.pointsHistory.record("a@example.com", 1000)
+        self.pointsHistory.record("a@example.com", 1100)
+        self.pointsHistory.record("a@example.com", 1250)
+
+        dailyDeltas = self.pointsHistory.dailyDeltas("a@example.com")
+
+        self.assertEqual(len(dailyDeltas), 1)
+        self.assertEqual(dailyDeltas[0].date, date.today())
+        self.assertEqual(dailyDeltas[0].delta, 250)
+        self.assertEqual(dailyDeltas[0].balance, 1250)
+
+    def test_goal_eta(self):
+        self.pointsHistory.record("a@example.com", 1000, goal=2000)
+        self.pointsHistory.record("a@example.com", 1300, goal=2000)
+
+        goalEta = self.pointsHistory.goalEta("a@example.com")
+
+        self.assertEqual(goalEta.remaining, 700)
+        self.assertEqual(goalEta.days, 3)
+
+    def test_goal_eta_without_progress(self):
+        self.pointsHistory.record("a@example.com", 1000, goal=2000)
+
+        self.assertIsNone(self.pointsHistory.goalEta("a@example.com").days)
+        self.assertIsNone(self.pointsHistory.goalEta("b@example.com"))
+
+    def test_import_previous_points_data(self):
+        previousPointsData = self.logsPath / "previous_points_data.json"
+        previousPointsData.write_text(json.dumps({"a@example.com": 1000}))
+
+        self.pointsHistory.importPreviousPointsData(previousPointsData)
+
+        self.assertFalse(previousPointsData.exists())
+        self.assertEqual(self.pointsHistory.lastBalance("a@example.com"), 1000)
+        self.assertEqual(self.pointsHistory.record("a@example.com", 1200), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from src.reporting import Reporter
+
+
+class TestReporter(unittest.TestCase):
+    def test_notifications_are_sent_as_one_digest(self):
+        apprise = MagicMock()
+        reporter = Reporter(apprise, timeout=5)
+
+        reporter.notify("body 1", "title 1")
+        reporter.notify("body 2", "title 2")
+        apprise.notify.assert_not_called()
+        self.assertTrue(reporter.flush())
+
+        apprise.notify.assert_called_once()
+        body, title = apprise.notify.call_args.args
+        self.assertIn("2 notifications", title)
+        self.assertIn("title 1\nbody 1", body)
+        self.assertIn("title 2\nbody 2", body)
+
+    def test_flush_without_jobs_starts_no_worker(self):
+        reporter = Reporter(MagicMock(), timeout=5)
+
+        self.assertTrue(reporter.flush())
+
+        self.assertIsNone(reporter._worker)
+
+    def test_single_notification_is_sent_as_is(self):
+        apprise = MagicMock()
+        reporter = Reporter(apprise, timeout=5)
+
+        reporter.notify("body", "title")
+        reporter.flush()
+
+        apprise.notify.assert_called_once_with("body", "title")
+
+    def test_jobs_run_in_order_and_errors_do_not_stop_the_queue(self):
+        reporter = Reporter(MagicMock(), timeout=5)
+        done = []
+
+        reporter.submit(done.append, 1)
+        reporter.submit(lambda: 1 / 0)
+        reporter.submit(done.append, 2)
+        reporter.flush()
+
+        self.assertEqual(done, [1, 2])
+
+    def test_slow_notification_does_not_block_flush(self):
+        release = threading.Event()
+        apprise = MagicMock()
+        apprise.notify.side_effect = lambda *_: release.wait(10)
+        reporter = Reporter(apprise, timeout=0.1)
+
+        reporter.notify("body", "title")
+
+        self.assertTrue(reporter.flush())
+        release.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.retryPolicy import (
+    Jitter,
+    RetriesStrategy,
+    RetryPolicy,
+    retryBudget,
+    retryMetricsReport,
+)
+
+
+def makePolicy(name: str, **kwargs) -> RetryPolicy:
+    kwargs = {
+        "maxRetries": 3,
+        "backoffFactor": 10,
+        "jitter": Jitter.NONE,
+        "sleep": MagicMock(),
+    } | kwargs
+    return RetryPolicy(name, **kwargs)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_delays(self):
+        exponential = makePolicy("exponential")
+        constant = makePolicy("constant", strategy=RetriesStrategy.CONSTANT)
+        full = makePolicy("full", jitter=Jitter.FULL)
+
+        self.assertEqual([exponential.delay(retry) for retry in (1, 2, 3)], [10, 20, 40])
+        self.assertEqual([constant.delay(retry) for retry in (1, 2, 3)], [10, 10, 10])
+        self.assertTrue(all(0 <= full.delay(3) <= 40 for _ in range(20)))
+
+    def test_retries_until_success(self):
+        policy = makePolicy("until-success")
+        operation = MagicMock(side_effect=[ValueError("down"), False, True])
+
+        result = policy.run(operation, retryOn=(ValueError,), isSuccess=bool)
+
+        self.assertTrue(result)
+        self.assertEqual(operation.call_count, 3)
+        self.assertEqual([call.args[0] for call in policy.sleep.call_args_list], [10, 20])
+        self.assertEqual(policy.metrics().retries, 2)
+
+    def test_gives_up_after_max_retries(self):
+        policy = makePolicy("gives-up")
+        operation = MagicMock(side_effect=ValueError("down"))
+
+        with self.assertRaises(ValueError):
+            policy.run(operation, retryOn=(ValueError,))
+
+        self.assertEqual(operation.call_count, 4)
+        self.assertEqual(policy.metrics().exhausted, 1)
+        self.assertTrue(any(line.startswith("gives-up:") for line in retryMetricsReport()))
+
+    def test_unexpected_exceptions_are_not_retried(self):
+        policy = makePolicy("unexpected")
+        operation = MagicMock(side_effect=KeyError("bug"))
+
+        with self.assertRaises(KeyError):
+            policy.run(operation, retryOn=(ValueError,))
+
+        operation.assert_called_once()
+
+    def test_deadline_stops_retries(self):
+        policy = makePolicy("deadline", deadline=25)
+        operation = MagicMock(return_value=False)
+
+        self.assertFalse(policy.run(operation, isSuccess=bool))
+        # the sleeps are mocked, so only the 40s delay of the third retry is too long
+        self.assertEqual(operation.call_count, 3)
+
+    def test_budget_stops_retries(self):
+        policy = makePolicy("budget")
+        operation = MagicMock(return_value=False)
+
+        with retryBudget(5):
+            self.assertFalse(policy.run(operation, isSuccess=bool))
+
+        operation.assert_called_once()
+
+    def test_budget_counts_only_the_retry_sleeps(self):
+        policy = makePolicy("sleeps")
+        operation = MagicMock(return_value=False)
+
+        with retryBudget(25), patch("src.retryPolicy.time.monotonic") as monotonic:
+            # Hours of cooldowns went by in the phase before the operation
+            monotonic.return_value = 36000
+            self.assertFalse(policy.run(operation, isSuccess=bool))
+            # 10s then 20s of retry sleeps, the second doesn't fit in the 15s left
+            self.assertEqual(operation.call_count, 2)
+            with retryBudget(None):
+                self.assertFalse(policy.run(operation, isSuccess=bool))
+            self.assertEqual(operation.call_count, 4)
+            # The nested block spent the 10s of its retry
+            self.assertFalse(policy.run(operation, isSuccess=bool))
+        self.assertEqual(operation.call_count, 5)
+
+    def test_nested_policies_do_not_retry(self):
+        inner = makePolicy("inner")
+        innerOperation = MagicMock(side_effect=ValueError("down"))
+        outer = makePolicy("outer")
+
+        def outerOperation(_):
+            return inner.run(innerOperation, retryOn=(ValueError,))
+
+        with self.assertRaises(ValueError):
+            outer.run(outerOperation, retryOn=(ValueError,))
+
+        self.assertEqual(innerOperation.call_count, 4)
+        inner.sleep.assert_not_called()
+        self.assertEqual(outer.sleep.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.dashboard import Dashboard, Promotion
+from src.runCheckpoint import RunCheckpoint
+from test.dashboardFixtures import promotion, userStatus
+
+
+def activity(name: str, complete: bool) -> Promotion:
+    return Promotion.fromDict(promotion(name, complete), "test")
+
+
+class TestRunCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "checkpoints" / "bar@example.com.json"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_progress_is_saved(self):
+        checkpoint = RunCheckpoint(self.path)
+        self.assertFalse(checkpoint.resumed)
+        checkpoint.markDone("activities")
+        checkpoint.markActivityDone(activity("quiz", True))
+
+        resumed = RunCheckpoint(self.path)
+
+        self.assertTrue(resumed.resumed)
+        self.assertTrue(resumed.isDone("activities"))
+        self.assertFalse(resumed.isDone("punch-cards"))
+        self.assertTrue(resumed.isActivityDone(activity("quiz", False)))
+
+    def test_progress_of_another_day_is_ignored(self):
+        RunCheckpoint(self.path, date.today() - timedelta(days=1)).markDone("activities")
+
+        self.assertFalse(RunCheckpoint(self.path).resumed)
+
+    def test_unknown_phase(self):
+        with self.assertRaises(AssertionError):
+            RunCheckpoint(self.path).markDone("versus-game")
+
+    def test_reconcile_with_dashboard(self):
+        checkpoint = RunCheckpoint(self.path)
+        for phase in ("activities", "punch-cards", "desktop-searches", "mobile-searches"):
+            checkpoint.markDone(phase)
+        for name in ("daily", "more", "card"):
+            checkpoint.markActivityDone(activity(name, True))
+        dashboard = Dashboard.fromDict({
+            "dailySetPromotions": {
+                date.today().strftime("%m/%d/%Y"): [promotion("daily", True)]
+            },
+            "morePromotions": [promotion("more", False)],
+            "punchCards": [{"parentPromotion": promotion("card", True)}],
+            "userStatus": userStatus(pcSearch=(90, 90), mobileSearch=(30, 60)),
+        })
+
+        redo = checkpoint.reconcile(dashboard)
+
+        self.assertEqual(redo, ["activities", "mobile-searches"])
+        self.assertFalse(checkpoint.isActivityDone(activity("more", False)))
+        self.assertTrue(checkpoint.isActivityDone(activity("daily", True)))
+        self.assertTrue(RunCheckpoint(self.path).isDone("punch-cards"))
+        self.assertFalse(RunCheckpoint(self.path).isDone("activities"))
+
+
+if __name__ == "__main__":
+    unittest.main()
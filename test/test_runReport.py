@@ -0,0 +1,113 @@
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from dataclasses import fields
+from pathlib import Path
+
+from src.runReport import (
+    AccountReport,
+    MemorySample,
+    MemorySampler,
+    PhaseMemory,
+    PhaseReport,
+    RunReport,
+    SearchReport,
+    processTreeMemory,
+)
+
+
+class TestRunReport(unittest.TestCase):
+    def test_account_report_has_every_field(self):
+        self.assertEqual(
+            set(AccountReport("user@example.com").toDict()),
+            {field.name for field in fields(AccountReport)},
+        )
+
+    def test_no_loads_per_search_without_counted_searches(self):
+        self.assertIsNone(SearchReport("mobile", 0, 0, 1, 3).loadsPerSearch)
+
+    def test_peak_is_the_largest_total(self):
+        memory = PhaseMemory()
+        for sample in (MemorySample(10, 5), MemorySample(12, 20), MemorySample(11, 1)):
+            memory.add(sample)
+
+        self.assertEqual(memory.peak, MemorySample(12, 20))
+        self.assertEqual(memory.end, MemorySample(11, 1))
+
+    def test_process_tree_memory_ignores_missing_processes(self):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            self.assertGreater(processTreeMemory([child.pid, 2**22 + 1]), 0)
+            self.assertEqual(processTreeMemory([2**22 + 1]), 0)  # above the default pid_max
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_disabled_sampler_records_nothing(self):
+        with MemorySampler(False).sample(lambda: []) as memory:
+            pass
+
+        self.assertIsNone(memory.end)
+
+    def test_sampler_records_the_phase(self):
+        with MemorySampler(True, interval=0.01).sample(lambda: []) as memory:
+            pass
+
+        self.assertGreater(memory.end.python, 0)
+        self.assertEqual(memory.end.chrome, 0)
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            report = RunReport(Path(tempDir) / "logs" / "run_report.json")
+            account = report.account("user@example.com")
+            account.phases.append(
+                PhaseReport(
+                    "activities",
+                    "done",
+                    12.34,
+                    PhaseMemory(MemorySample(2**20, 3 * 2**20), MemorySample(0, 2**30)),
+                )
+            )
+            account.phases.append(PhaseReport("desktop-searches", "skipped"))
+            account.searches.append(SearchReport("desktop", 4, 12, 2, 8))
+            report.account("other@example.com").error = "TimeoutException: "
+            report.save()
+
+            saved = json.loads(report.path.read_text())
+
+        first, second = saved["accounts"]
+        self.assertEqual(first["email"], "user@example.com")
+        self.assertEqual(
+            first["phases"][0],
+            {
+                "name": "activities",
+                "status": "done",
+                "seconds": 12.3,
+                "memory": {"python": 1.0, "chrome": 3.0},
+                "peakMemory": {"python": 0.0, "chrome": 1024.0},
+            },
+        )
+        self.assertEqual(
+            first["phases"][1], {"name": "desktop-searches", "status": "skipped", "seconds": 0.0}
+        )
+        self.assertIsNone(first["error"])
+        self.assertEqual(
+            first["searches"],
+            [
+                {
+                    "browserType": "desktop",
+                    "counted": 4,
+                    "points": 12,
+                    "rewardsLoads": 2,
+                    "searchLoads": 8,
+                    "loadsPerSearch": 2.5,
+                }
+            ],
+        )
+        self.assertEqual(second["error"], "TimeoutException: ")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.dailyPlan import DailyPlan, Task
+from src.scheduler import scheduleWithin
+from src.taskTimings import BROWSER_START, TaskTimings
+
+DEFAULTS = {
+    "default": 10,
+    BROWSER_START: 60,
+    "activities": 30,
+    "punch-cards": 100,
+    "desktop-searches": 10,
+    "read-to-earn": 300,
+    "mobile-searches": 10,
+}
+
+
+def plan() -> DailyPlan:
+    return DailyPlan(
+        ("bonus-points", "activities", "punch-cards", "desktop-searches", "read-to-earn"),
+        [
+            Task("bonus-points", "claim the bonus points, if any", 0),
+            Task("activities", "'Quiz'", 30),
+            Task("activities", "'Poll'", 10),
+            Task("punch-cards", "punch card 'Card'", 100),
+            Task("desktop-searches", "searches", 90, count=30),
+            Task("read-to-earn", "read articles in the app", 30),
+        ],
+    )
+
+
+class TestTaskTimings(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "task_timings.json"
+        self.timings = TaskTimings(self.path, DEFAULTS, window=3)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_estimate_defaults(self):
+        self.assertEqual(self.timings.estimate("activities"), 30)
+        self.assertEqual(self.timings.estimate("unknown"), 10)
+
+    def test_estimate_is_the_median_of_the_latest(self):
+        for seconds in (100, 100, 100, 5, 7, 6):
+            self.timings.record("activities", seconds)
+
+        self.assertEqual(self.timings.estimate("activities"), 6)
+
+    def test_save_and_load(self):
+        self.timings.record("desktop-searches", 12.34)
+        self.timings.save()
+
+        self.assertEqual(
+            TaskTimings(self.path, DEFAULTS).estimate("desktop-searches"), 12.3
+        )
+
+    def test_unreadable_file_is_ignored(self):
+        self.path.write_text("not json", encoding="utf-8")
+
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(self.timings.estimate("activities"), 30)
+
+
+class TestScheduleWithin(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.timings = TaskTimings(Path(self.directory.name) / "t.json", DEFAULTS)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_everything_fits(self):
+        scheduled = scheduleWithin(plan(), 3600, self.timings)
+
+        self.assertEqual(scheduled.tasks, plan().tasks)
+        self.assertEqual(scheduled.deferred, [])
+        self.assertEqual(scheduled.estimatedSeconds, 10 + 60 + 100 + 300 + 300)
+
+    def test_keeps_the_most_points_per_second(self):
+        # The poll earns more per second than the searches, the articles the least
+        scheduled = scheduleWithin(plan(), 10 + 30 + 100 + 30 + 55, self.timings)
+
+        self.assertEqual(
+            [task.describe() for task in scheduled.tasks],
+            [
+                "claim the bonus points, if any",
+                "'Quiz'",
+                "'Poll'",
+                "punch card 'Card'",
+                "5 searches",
+            ],
+        )
+        self.assertEqual(scheduled.tasksFor("desktop-searches")[0].points, 15)
+        self.assertEqual(
+            [task.describe() for task in scheduled.deferred],
+            ["25 searches", "read articles in the app"],
+        )
+        self.assertEqual(
+            scheduled.phases,
+            (
+                "bonus-points",
+                "punch-cards",
+                "activities",
+                "desktop-searches",
+                "read-to-earn",
+            ),
+        )
+        self.assertFalse(scheduled.hasWork("read-to-earn"))
+
+    def test_mobile_browser_start_is_counted_once(self):
+        mobilePlan = DailyPlan(
+            ("read-to-earn", "mobile-searches"),
+            [
+                Task("read-to-earn", "read articles in the app", 30),
+                Task("mobile-searches", "searches", 60, count=20),
+            ],
+        )
+
+        scheduled = scheduleWithin(mobilePlan, 60 + 100, self.timings, mobileStart=60)
+
+        self.assertEqual(scheduled.tasksFor("mobile-searches")[0].count, 10)
+        self.assertEqual(scheduled.estimatedSeconds, 160)
+        self.assertFalse(scheduled.hasWork("read-to-earn"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import tempfile
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src import RemainingSearches
+from src.browser import Browser
+from src.dashboard import SearchCounter
+from src.searches import Searches
+from src.utils import WATCHDOG
+
+
+def userStatus(points: int, mobileSearches: int) -> MagicMock:
+    status = MagicMock(availablePoints=points)
+    status.counters.mobileSearch = (SearchCounter(60 - 3 * mobileSearches, 60),)
+    status.remainingSearches.return_value = RemainingSearches(0, mobileSearches)
+    return status
+
+
+@patch.object(WATCHDOG, "sleep")
+@patch("src.searches.cooldown")
+@patch("src.searches.WebDriverWait")
+@patch("src.searches.sleep")
+class TestBingSearch(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.browser = MagicMock(mobile=True, balanceShared=False)
+        with patch("src.searches.getProjectRoot", return_value=Path(directory.name)):
+            self.searches = Searches(self.browser)
+        self.addCleanup(self.searches.__exit__, None, None, None)
+        self.searches.googleTrendsShelf["trend"] = SimpleNamespace(
+            trend_keywords=["first", "second"]
+        )
+        self.searches.points = 100
+        self.searches.remaining = 10
+
+    def test_search_is_checked_with_the_header(self, *_):
+        self.browser.utils.getSearchPagePoints.return_value = 103
+
+        self.assertTrue(self.searches.bingSearch())
+
+        self.assertEqual(self.searches.points, 103)
+        self.browser.utils.getUserStatus.assert_not_called()
+
+    def test_background_points_do_not_count_a_search(self, *_):
+        self.browser.balanceShared = True
+        # Read to Earn credited points, the search wasn't counted
+        self.browser.utils.getUserStatus.side_effect = [
+            userStatus(130, 10),
+            userStatus(133, 9),
+        ]
+
+        self.assertTrue(self.searches.bingSearch())
+
+        self.browser.utils.getSearchPagePoints.assert_not_called()
+        self.assertEqual(self.browser.utils.getUserStatus.call_count, 2)
+        self.assertEqual(self.searches.points, 133)
+        self.assertEqual(self.searches.counterPoints, [30, 33])
+        self.assertTrue(self.searches.trustHeader)
+
+    def test_header_overcount_is_caught_by_the_counters(self, *_):
+        self.searches.remaining = 8
+        self.browser.utils.getSearchPagePoints.return_value = None
+        self.browser.utils.getUserStatus.side_effect = [
+            userStatus(130, 10),
+            userStatus(133, 9),
+        ]
+
+        self.assertTrue(self.searches.bingSearch())
+
+        self.assertFalse(self.searches.trustHeader)
+        self.assertEqual(self.searches.remaining, 10)
+
+
+class TestBalanceShared(unittest.TestCase):
+    def test_shared_while_background_earning_runs(self):
+        browser = SimpleNamespace(backgroundEarning=None)
+        self.assertFalse(Browser.balanceShared.fget(browser))
+        browser.backgroundEarning = Future()
+        self.assertTrue(Browser.balanceShared.fget(browser))
+        browser.backgroundEarning.set_result(None)
+        self.assertFalse(Browser.balanceShared.fget(browser))
+
+
+if __name__ == "__main__":
+    unittest.main()
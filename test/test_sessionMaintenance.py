@@ -0,0 +1,116 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.sessionMaintenance import (
+    checkSession,
+    compactSession,
+    getLockOwnerPid,
+    isSessionLocked,
+    sweepOrphanProcesses,
+)
+
+
+class TestSessionMaintenance(unittest.TestCase):
+    def setUp(self):
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.sessionPath = Path(self.tempDir.name) / "user@example.com"
+        profile = self.sessionPath / "Default"
+        (profile / "Network").mkdir(parents=True)
+        (profile / "Preferences").write_text("{}")
+        (profile / "Network" / "Cookies").write_bytes(b"cookies")
+        for cache in ("Cache/Cache_Data", "Code Cache/js", "GPUCache"):
+            (profile / cache).mkdir(parents=True)
+            (profile / cache / "data").write_bytes(b"x" * 1024)
+        (self.sessionPath / "Crashpad").mkdir()
+        (self.sessionPath / "Crashpad" / "dump").write_bytes(b"x" * 1024)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def lockWithPid(self, pid: int):
+        os.symlink(
+            f"{socket.gethostname()}-{pid}", self.sessionPath / "SingletonLock"
+        )
+
+    def test_compact_keeps_cookies_and_prunes_caches(self):
+        result = compactSession(self.sessionPath)
+
+        self.assertIsNotNone(result)
+        self.assertGreaterEqual(result.reclaimed, 4 * 1024)
+        profile = self.sessionPath / "Default"
+        self.assertTrue((profile / "Network" / "Cookies").exists())
+        self.assertTrue((profile / "Preferences").exists())
+        self.assertFalse((profile / "Cache").exists())
+        self.assertFalse((profile / "GPUCache").exists())
+        self.assertFalse((self.sessionPath / "Crashpad").exists())
+
+    @unittest.skipIf(os.name == "nt", "SingletonLock is a symlink on POSIX only")
+    def test_stale_lock_is_removed(self):
+        self.lockWithPid(2**22 + 1)  # above the default pid_max
+
+        self.assertFalse(isSessionLocked(self.sessionPath))
+        result = compactSession(self.sessionPath)
+
+        self.assertTrue(result.removedLock)
+        self.assertFalse((self.sessionPath / "SingletonLock").is_symlink())
+
+    def test_lock_check_does_not_remove_the_lockfile(self):
+        lockfile = self.sessionPath / "lockfile"
+        lockfile.touch()
+
+        self.assertFalse(isSessionLocked(self.sessionPath))
+        self.assertTrue(lockfile.exists())
+        self.assertIsNotNone(compactSession(self.sessionPath))
+        self.assertFalse(lockfile.exists())
+
+    @unittest.skipIf(os.name == "nt", "SingletonLock is a symlink on POSIX only")
+    def test_live_lock_prevents_compaction(self):
+        self.lockWithPid(os.getpid())
+
+        self.assertEqual(getLockOwnerPid(self.sessionPath), os.getpid())
+        self.assertIsNone(compactSession(self.sessionPath))
+        self.assertTrue((self.sessionPath / "Default" / "Cache").exists())
+
+    def test_check_session_does_not_compact_below_max_size(self):
+        checkSession(self.sessionPath, maxSize=1024 * 1024)
+
+        self.assertTrue((self.sessionPath / "Default" / "Cache").exists())
+
+    def test_check_session_compacts_above_max_size(self):
+        checkSession(self.sessionPath, maxSize=1024)
+
+        self.assertFalse((self.sessionPath / "Default" / "Cache").exists())
+        self.assertTrue((self.sessionPath / "Default" / "Network" / "Cookies").exists())
+
+    def test_sweep_stops_processes_using_the_sessions(self):
+        def startProcess(userDataDir: Path) -> subprocess.Popen:
+            return subprocess.Popen(
+                [
+                    sys.executable,
+                    "-c",
+                    "import time; time.sleep(60)",
+                    f"--user-data-dir={userDataDir}",
+                ]
+            )
+
+        orphan = startProcess(self.sessionPath)
+        other = startProcess(Path(self.tempDir.name).parent / "elsewhere")
+        self.addCleanup(other.kill)
+        time.sleep(0.5)
+
+        result = sweepOrphanProcesses(Path(self.tempDir.name))
+
+        self.assertGreaterEqual(result.stopped, 1)
+        self.assertGreater(result.memory, 0)
+        self.assertIsNotNone(orphan.wait(5))
+        self.assertIsNone(other.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from cryptography.fernet import Fernet
+
+from src.readToEarn import ReadToEarn
+from src.tokenCache import TokenCache, isFresh, loadKey
+from src.utils import RUN_REPORT
+
+EMAIL = "someone@example.com"
+TOKEN = {
+    "access_token": "access",
+    "refresh_token": "refresh",
+    "token_type": "bearer",
+    "expires_in": 3600,
+}
+
+
+class TestTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.cache = TokenCache(self.path, Fernet.generate_key())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load(self):
+        self.assertIsNone(self.cache.load(EMAIL))
+
+        self.cache.save(EMAIL, TOKEN)
+
+        self.assertEqual(self.cache.load(EMAIL), TOKEN)
+        self.assertNotIn(b"refresh", self.cache.path(EMAIL).read_bytes())
+
+    def test_token_of_another_key_is_ignored(self):
+        self.cache.save(EMAIL, TOKEN)
+
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(TokenCache(self.path, Fernet.generate_key()).load(EMAIL))
+
+    def test_key_is_generated_once(self):
+        keyPath = self.path / "token.key"
+
+        key = loadKey(keyPath)
+
+        self.assertEqual(loadKey(keyPath), key)
+        if os.name == "posix":
+            self.assertEqual(stat.S_IMODE(keyPath.stat().st_mode), 0o600)
+
+    def test_fresh_token_is_used_without_refresh(self):
+        token = TOKEN | {"expires_at": time.time() + 3600}
+
+        mobileApp = ReadToEarn.refreshedSession(token)
+
+        self.assertTrue(isFresh(token))
+        self.assertEqual(mobileApp.token["access_token"], "access")
+
+    def test_expired_token_without_refresh_token(self):
+        token = {"access_token": "access", "expires_at": time.time() - 1}
+
+        self.assertFalse(isFresh(token))
+        self.assertIsNone(ReadToEarn.refreshedSession(token))
+
+
+class TestTokenRefreshWhileReading(unittest.TestCase):
+    def setUp(self):
+        self.authorizations = []
+        self.refreshes = 0
+        test = self
+
+        class MobileApp(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                if self.path == "/token":
+                    test.refreshes += 1
+                    reply = TOKEN | {"access_token": f"access {test.refreshes}"}
+                else:
+                    test.authorizations.append(self.headers["Authorization"])
+                    reply = {"response": {"balance": min(len(test.authorizations), 4)}}
+                body = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), MobileApp)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        self.url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_token_expiring_between_articles_is_refreshed_and_saved(self):
+        saved = []
+        with patch.dict(os.environ, {"OAUTHLIB_INSECURE_TRANSPORT": "1"}), patch(
+            "src.readToEarn.token_url", f"{self.url}/token"
+        ), patch("src.readToEarn.ACTIVITIES_URL", f"{self.url}/activities"), patch(
+            "src.readToEarn.time.sleep"
+        ):
+            mobileApp = ReadToEarn.refreshedSession(
+                TOKEN | {"expires_at": time.time() + 3600}, saved.append
+            )
+
+            def expire(_background: bool) -> None:
+                # The cooldown between two articles outlasts the token
+                mobileApp.token = mobileApp.token | {"expires_at": time.time() - 1}
+
+            with patch("src.readToEarn.cooldown", side_effect=expire):
+                readToEarn = ReadToEarn(
+                    SimpleNamespace(
+                        webdriver=None, localeGeo="US", email="reader@example.com"
+                    )
+                )
+                readToEarn.readArticles(mobileApp)
+
+        self.assertEqual(
+            self.authorizations,
+            [
+                "Bearer access",
+                "Bearer access",
+                "Bearer access 1",
+                "Bearer access 2",
+                "Bearer access 3",
+            ],
+        )
+        self.assertEqual(
+            [token["access_token"] for token in saved],
+            ["access 1", "access 2", "access 3"],
+        )
+        # The check-in is left out, the articles earned a point each
+        self.assertEqual(RUN_REPORT.account("reader@example.com").readToEarnPoints, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
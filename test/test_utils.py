@@ -1,9 +1,28 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import requests
 
 # noinspection PyPackageRequirements
 from parameterized import parameterized
+from selenium.common import (
+    ElementClickInterceptedException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
 
-from src.utils import CONFIG, APPRISE, isValidCountryCode, isValidLanguageCode
+from src.utils import (
+    CONFIG,
+    APPRISE,
+    WATCHDOG,
+    Utils,
+    isValidCountryCode,
+    isValidLanguageCode,
+    makeRequestsSession,
+)
 
 
 class TestUtils(TestCase):
@@ -51,3 +70,66 @@ class TestUtils(TestCase):
 
         with self.assertRaises(FileNotFoundError):
             load_localized_activities("foo")
+
+    def test_cachedElement_revalidates_stale_elements(self):
+        utils = Utils(MagicMock())
+        element = MagicMock()
+        utils.waitUntilClickable = MagicMock(return_value=element)
+
+        self.assertIs(utils.cachedElement(By.ID, "sb_form_q"), element)
+        self.assertIs(utils.cachedElement(By.ID, "sb_form_q"), element)
+        element.is_enabled.side_effect = StaleElementReferenceException()
+        self.assertIs(
+            utils.cachedElement(By.ID, "sb_form_q"),
+            utils.webdriver.find_element.return_value,
+        )
+        utils.clearElementCache()
+        utils.cachedElement(By.ID, "sb_form_q")
+
+        self.assertEqual(utils.waitUntilClickable.call_count, 2)
+        self.assertEqual(
+            utils.elementCache, {"misses": 2, "hits": 1, "revalidations": 1}
+        )
+
+    def test_click_waits_then_falls_back_to_javascript(self):
+        utils = Utils(MagicMock())
+        utils.tryDismissAllMessages = MagicMock()
+        element = MagicMock(spec=WebElement)
+        element.is_displayed.return_value = element.is_enabled.return_value = True
+        element.click.side_effect = ElementClickInterceptedException()
+
+        utils.click(element)
+
+        element.is_displayed.assert_called()
+        utils.tryDismissAllMessages.assert_called_once()
+        utils.webdriver.execute_script.assert_called_once_with(
+            "arguments[0].click();", element
+        )
+
+    def test_only_idempotent_requests_are_retried(self):
+        methods = []
+
+        class Unavailable(BaseHTTPRequestHandler):
+            def reply(self):
+                methods.append(self.command)
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            do_GET = do_POST = reply
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Unavailable)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        session = makeRequestsSession(requests.Session())
+
+        with patch.object(WATCHDOG, "sleep"):
+            self.assertEqual(session.post(url).status_code, 503)
+            self.assertEqual(methods, ["POST"])
+            self.assertEqual(session.get(url).status_code, 503)
+
+        self.assertEqual(methods.count("GET"), CONFIG.retries.max + 1)
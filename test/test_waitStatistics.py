@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.waitStatistics import WaitStatistics
+
+KEY = WaitStatistics.key("https://www.bing.com/search?q=test", "id", "sb_form_q")
+
+
+class TestWaitStatistics(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "wait_statistics.json"
+        self.statistics = WaitStatistics(self.path, minSamples=3)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key_ignores_the_query(self):
+        self.assertEqual(KEY, "www.bing.com/search id=sb_form_q")
+
+    def test_deadline_is_the_cap_without_enough_samples(self):
+        self.statistics.record(KEY, 0.2)
+        self.statistics.record(KEY, 0.3)
+
+        self.assertEqual(self.statistics.deadline(KEY, 40), 40)
+
+    def test_deadline_adapts_to_latencies(self):
+        for latency in (0.8, 1.0, 1.2, 1.1, 0.9):
+            self.statistics.record(KEY, latency)
+
+        self.assertAlmostEqual(self.statistics.deadline(KEY, 10), 5)
+        self.assertEqual(self.statistics.deadline(KEY, 3), 3)
+        self.statistics.minCapFraction = 0
+        self.assertAlmostEqual(self.statistics.deadline(KEY, 40), 3.6)
+
+    def test_deadline_has_a_minimum(self):
+        for _ in range(5):
+            self.statistics.record(KEY, 0.1)
+
+        self.assertEqual(self.statistics.deadline(KEY, 40), 20)
+        self.assertEqual(self.statistics.deadline(KEY, 3), 2.0)
+
+    def test_slow_outlier_after_fast_samples_has_time(self):
+        for _ in range(5):
+            self.statistics.record(KEY, 0.3)
+
+        # The search box used to wait up to 40 s, a 15 s load still succeeds
+        self.assertGreater(self.statistics.deadline(KEY, 40), 15)
+
+    def test_timeouts_raise_the_deadline(self):
+        for _ in range(5):
+            self.statistics.record(KEY, 1.0)
+        deadline = self.statistics.deadline(KEY, 40)
+
+        self.statistics.record(KEY, deadline)
+
+        self.assertGreater(self.statistics.deadline(KEY, 40), deadline)
+
+    def test_window_keeps_the_latest_latencies(self):
+        statistics = WaitStatistics(self.path, window=3, minSamples=3)
+        for latency in (10, 10, 10, 1, 1, 1):
+            statistics.record(KEY, latency)
+
+        self.assertEqual(statistics.latencyPercentile(KEY), 1)
+
+    def test_save_and_load(self):
+        for latency in (1, 2, 3):
+            self.statistics.record(KEY, latency)
+        self.statistics.save()
+
+        loaded = WaitStatistics(self.path, minSamples=3)
+
+        self.assertEqual(loaded.latencyPercentile(KEY), 3)
+
+    def test_unreadable_file_is_ignored(self):
+        self.path.write_text("not json", encoding="utf-8")
+
+        self.assertIsNone(self.statistics.latencyPercentile(KEY))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import psutil
+
+from src.watchdog import PhaseTimeout, Watchdog, killProcessTree
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.webdriver = MagicMock()
+        self.webdriver.current_url = "https://rewards.bing.com/"
+        self.webdriver.get_log.return_value = [{"message": "hung"}]
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+
+
+class TestWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_phase_within_deadline(self):
+        watchdog = Watchdog(self.path, {"default": 5})
+        browser = FakeBrowser()
+
+        with watchdog.phase("activities", browser):
+            pass
+
+        self.assertFalse(browser.killed)
+
+    def test_phase_without_deadline_is_not_watched(self):
+        watchdog = Watchdog(self.path, {})
+
+        with watchdog.phase("activities", FakeBrowser()):
+            pass
+
+        self.assertIsNone(watchdog._thread)
+
+    def test_expired_phase_kills_the_browser(self):
+        watchdog = Watchdog(self.path, {"activities": 0.1})
+        browser = FakeBrowser()
+
+        with self.assertRaises(PhaseTimeout):
+            with watchdog.phase("activities", browser):
+                time.sleep(0.5)
+
+        self.assertTrue(browser.killed)
+        (diagnostics,) = self.path.iterdir()
+        self.assertTrue(diagnostics.name.endswith("-activities"))
+        self.assertEqual(
+            (diagnostics / "url.txt").read_text(encoding="utf-8"),
+            "https://rewards.bing.com/",
+        )
+        browser.webdriver.save_screenshot.assert_called_once()
+        self.assertTrue((diagnostics / "webdriver-browser.log").exists())
+
+    def test_sleep_is_not_counted(self):
+        watchdog = Watchdog(self.path, {"default": 0.3})
+        browser = FakeBrowser()
+
+        with watchdog.phase("searches", browser):
+            watchdog.sleep(0.5)
+
+        self.assertFalse(browser.killed)
+
+
+class TestKillProcessTree(unittest.TestCase):
+    def test_kills_children(self):
+        parent = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import subprocess, sys, time;"
+                "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']);"
+                "time.sleep(60)",
+            ]
+        )
+        for _ in range(50):
+            if psutil.Process(parent.pid).children():
+                break
+            time.sleep(0.1)
+        child = psutil.Process(parent.pid).children()[0]
+
+        killed = killProcessTree([parent.pid])
+
+        parent.wait(5)
+        self.assertEqual({process.pid for process in killed}, {parent.pid, child.pid})
+        self.assertFalse(child.is_running() and child.status() != psutil.STATUS_ZOMBIE)
+
+
+if __name__ == "__main__":
+    unittest.main()